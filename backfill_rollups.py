@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Preenchimento das estatísticas diárias dos servidores
+Recalcula denuncias_daily_rollup a partir de todas as denúncias existentes.
+
+Rode uma vez depois de aplicar database/migrate_denuncias_rollup.sql; a partir
+daí o trigger mantém a tabela. Pode ser repetido a qualquer momento para
+corrigir divergências (escritas em denuncias esperam o fim da reconstrução).
+
+Execute com: python backfill_rollups.py
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database.connection import db_manager
+from utils.report_rollups import report_rollups
+
+
+async def main_async() -> bool:
+    await db_manager.initialize_pool(min_connections=1, max_connections=2)
+    try:
+        return await report_rollups.rebuild()
+    finally:
+        await db_manager.close_pool()
+
+
+def main():
+    """Função principal"""
+    print("=" * 60)
+    print("📊 ESTATÍSTICAS DIÁRIAS - SISTEMA GUARDIÃO BETA")
+    print("=" * 60)
+    print(f"⏰ Iniciado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    try:
+        ok = asyncio.run(main_async())
+    except Exception as e:
+        print(f"❌ Erro durante o preenchimento: {e}")
+        return 1
+
+    if not ok:
+        print("❌ Falha ao reconstruir - a migração database/migrate_denuncias_rollup.sql foi aplicada?")
+        return 1
+    print("✅ Estatísticas diárias preenchidas")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
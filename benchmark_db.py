@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark das chamadas síncronas ao banco de dados
+Compara o modelo antigo (conexão isolada por query) com a ponte síncrona
+baseada em pool do DatabaseManager.
+
+Execute com: python benchmark_db.py [quantidade_queries] [threads]
+"""
+
+import asyncio
+import asyncpg
+import concurrent.futures
+import os
+import sys
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database.connection import db_manager
+
+BENCH_QUERY = "SELECT COUNT(*) FROM usuarios WHERE em_servico = $1"
+
+
+def legacy_scalar_sync(query: str, *args):
+    """Reproduz o modelo antigo: executor + loop + conexão novos a cada query"""
+    def run_query():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        async def execute():
+            conn = await asyncpg.connect(
+                host=os.getenv('POSTGRES_HOST'),
+                port=int(os.getenv('POSTGRES_PORT', 5432)),
+                user=os.getenv('POSTGRES_USER'),
+                password=os.getenv('POSTGRES_PASSWORD'),
+                database=os.getenv('POSTGRES_DB')
+            )
+            try:
+                return await conn.fetchval(query, *args)
+            finally:
+                await conn.close()
+
+        try:
+            return loop.run_until_complete(execute())
+        finally:
+            loop.close()
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        return executor.submit(run_query).result(timeout=30)
+
+
+def pooled_scalar_sync(query: str, *args):
+    """Modelo novo: ponte síncrona sobre pool compartilhado"""
+    return db_manager.execute_scalar_sync(query, *args)
+
+
+def run_benchmark(name: str, func, total: int, threads: int) -> float:
+    """Executa `total` queries distribuídas em `threads` threads e retorna queries/s"""
+    # Aquecimento (cria pool / valida credenciais)
+    func(BENCH_QUERY, True)
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(func, BENCH_QUERY, True) for _ in range(total)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    qps = total / elapsed if elapsed > 0 else 0
+    print(f"📊 {name:<28} {total} queries em {elapsed:.2f}s → {qps:,.1f} queries/s "
+          f"({elapsed / total * 1000:.2f} ms/query)")
+    return qps
+
+
+def main():
+    """Função principal"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    print("=" * 60)
+    print("🛡️  BENCHMARK BANCO DE DADOS - SISTEMA GUARDIÃO BETA")
+    print(f"   {total} queries | {threads} threads")
+    print("=" * 60)
+    print(f"⏰ Iniciado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    try:
+        before_serial = run_benchmark("Antes (serial)", legacy_scalar_sync, total, 1)
+        after_serial = run_benchmark("Depois (serial)", pooled_scalar_sync, total, 1)
+        before_parallel = run_benchmark(f"Antes ({threads} threads)", legacy_scalar_sync, total, threads)
+        after_parallel = run_benchmark(f"Depois ({threads} threads)", pooled_scalar_sync, total, threads)
+    except Exception as e:
+        print(f"❌ Erro durante o benchmark: {e}")
+        return 1
+    finally:
+        db_manager.close_sync_bridge()
+
+    print()
+    print(f"🚀 Ganho serial:    {after_serial / before_serial:.1f}x")
+    print(f"🚀 Ganho paralelo:  {after_parallel / before_parallel:.1f}x")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark do caminho de voto
+Compara o fluxo antigo (uma query por etapa, soma de votos a cada clique) com a
+transação única de VoteView._record_vote contra um PostgreSQL local.
+
+Cria usuários e denúncias de teste (hash 'bench-*') e os remove ao final.
+Execute com: python benchmark_votes.py [quantidade_denuncias] [concorrencia]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database.connection import db_manager
+from cogs.moderacao import VoteView
+from config import REQUIRED_VOTES_FOR_DECISION
+from utils.experience_system import calculate_experience_reward
+
+BENCH_USER_BASE = 990_000_000_000_000_000
+BENCH_DENUNCIADO = BENCH_USER_BASE - 1
+VOTE_OPTIONS = ["OK!", "Intimidou", "Grave"]
+
+
+async def legacy_vote(hash_denuncia: str, guardiao_id: int, voto: str) -> bool:
+    """Reproduz o fluxo antigo; retorna True se este voto finalizou a denúncia"""
+    existing_vote = await db_manager.execute_scalar("""
+        SELECT id FROM votos_guardioes
+        WHERE id_guardiao = $1 AND id_denuncia = (SELECT id FROM denuncias WHERE hash_denuncia = $2)
+    """, guardiao_id, hash_denuncia)
+    if existing_vote:
+        return False
+
+    await db_manager.execute_command("""
+        INSERT INTO votos_guardioes (id_denuncia, id_guardiao, voto)
+        SELECT id, $1, $2 FROM denuncias WHERE hash_denuncia = $3
+    """, guardiao_id, voto, hash_denuncia)
+
+    await db_manager.execute_scalar("SELECT id FROM denuncias WHERE hash_denuncia = $1", hash_denuncia)
+
+    total_weighted_votes = await db_manager.execute_scalar("""
+        SELECT SUM(CASE WHEN u.categoria = 'Moderador' THEN 5 ELSE 1 END) as peso_total
+        FROM votos_guardioes vg
+        JOIN usuarios u ON vg.id_guardiao = u.id_discord
+        WHERE vg.id_denuncia = (SELECT id FROM denuncias WHERE hash_denuncia = $1)
+    """, hash_denuncia) or 0
+    if total_weighted_votes < REQUIRED_VOTES_FOR_DECISION:
+        return False
+
+    await db_manager.execute_query("""
+        SELECT vg.voto, u.categoria
+        FROM votos_guardioes vg
+        JOIN usuarios u ON vg.id_guardiao = u.id_discord
+        WHERE vg.id_denuncia = (SELECT id FROM denuncias WHERE hash_denuncia = $1)
+    """, hash_denuncia)
+    await db_manager.execute_command(
+        "UPDATE denuncias SET status = 'Finalizada', resultado_final = $1 WHERE hash_denuncia = $2",
+        "Improcedente", hash_denuncia
+    )
+
+    guardians = await db_manager.execute_query("""
+        SELECT id_guardiao, voto FROM votos_guardioes
+        WHERE id_denuncia = (SELECT id FROM denuncias WHERE hash_denuncia = $1)
+    """, hash_denuncia)
+    for guardian in guardians:
+        await db_manager.execute_command(
+            "UPDATE usuarios SET experiencia = experiencia + $1 WHERE id_discord = $2",
+            calculate_experience_reward(guardian['voto']), guardian['id_guardiao']
+        )
+    return True
+
+
+async def transactional_vote(hash_denuncia: str, guardiao_id: int, voto: str) -> bool:
+    """Fluxo novo; retorna True se este voto finalizou a denúncia"""
+    view = VoteView(hash_denuncia, guardiao_id)
+    outcome = await view._record_vote(voto)
+    if outcome.get('result'):
+        await view._distribute_experience(outcome['votes'])
+        return True
+    return False
+
+
+async def setup_data(prefix: str, total: int):
+    """Cria os usuários e denúncias de teste"""
+    users = [(BENCH_DENUNCIADO, 'Usuário')] + [
+        (BENCH_USER_BASE + i, 'Guardião') for i in range(REQUIRED_VOTES_FOR_DECISION)
+    ]
+    for user_id, categoria in users:
+        await db_manager.execute_command("""
+            INSERT INTO usuarios (id_discord, username, display_name, nome_completo, idade, email, telefone, categoria)
+            VALUES ($1, $2, $2, $2, 18, $3, '0', $4)
+            ON CONFLICT (id_discord) DO NOTHING
+        """, user_id, f"bench{user_id}", f"bench{user_id}@bench.local", categoria)
+
+    hashes = [f"{prefix}-{i}" for i in range(total)]
+    await db_manager.execute_command("""
+        INSERT INTO denuncias (hash_denuncia, id_servidor, id_canal, id_denunciante, id_denunciado, motivo)
+        SELECT h, 0, 0, $2, $2, 'benchmark' FROM unnest($1::text[]) AS h
+    """, hashes, BENCH_DENUNCIADO)
+    return hashes
+
+
+async def cleanup_data():
+    """Remove os dados de teste"""
+    await db_manager.execute_command("DELETE FROM denuncias WHERE hash_denuncia LIKE 'bench-%'")
+    await db_manager.execute_command(
+        "DELETE FROM usuarios WHERE id_discord >= $1 OR id_discord = $2", BENCH_USER_BASE, BENCH_DENUNCIADO
+    )
+
+
+async def run_benchmark(name: str, vote_func, prefix: str, total: int, concurrency: int) -> float:
+    """Vota REQUIRED_VOTES_FOR_DECISION vezes em cada denúncia e retorna votos/s"""
+    hashes = await setup_data(prefix, total)
+    votes = [
+        (hash_denuncia, BENCH_USER_BASE + i, random.choice(VOTE_OPTIONS))
+        for hash_denuncia in hashes
+        for i in range(REQUIRED_VOTES_FOR_DECISION)
+    ]
+    # Embaralha para que votos da mesma denúncia concorram entre si
+    random.shuffle(votes)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def vote(args):
+        async with semaphore:
+            return await vote_func(*args)
+
+    start = time.perf_counter()
+    finalized = await asyncio.gather(*(vote(args) for args in votes))
+    elapsed = time.perf_counter() - start
+
+    decisions = sum(1 for item in finalized if item)
+    vps = len(votes) / elapsed if elapsed > 0 else 0
+    print(f"📊 {name:<14} {len(votes)} votos em {elapsed:.2f}s → {vps:,.1f} votos/s "
+          f"({elapsed / len(votes) * 1000:.2f} ms/voto) | decisões: {decisions}/{total}")
+    return vps
+
+
+async def main_async(total: int, concurrency: int) -> int:
+    """Executa os dois cenários"""
+    await db_manager.initialize_pool(max_connections=max(concurrency, 5))
+    try:
+        await cleanup_data()
+        before = await run_benchmark("Antes", legacy_vote, "bench-antes", total, concurrency)
+        after = await run_benchmark("Depois", transactional_vote, "bench-depois", total, concurrency)
+    except Exception as e:
+        print(f"❌ Erro durante o benchmark: {e}")
+        return 1
+    finally:
+        await cleanup_data()
+        await db_manager.close_pool()
+
+    print()
+    print(f"🚀 Ganho: {after / before:.1f}x")
+    print("   (decisões acima do total no cenário antigo são finalizações duplicadas)")
+    return 0
+
+
+def main():
+    """Função principal"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print("=" * 60)
+    print("🛡️  BENCHMARK DE VOTOS - SISTEMA GUARDIÃO BETA")
+    print(f"   {total} denúncias | {REQUIRED_VOTES_FOR_DECISION} votos cada | concorrência {concurrency}")
+    print("=" * 60)
+    print(f"⏰ Iniciado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    return asyncio.run(main_async(total, concurrency))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Verificação dos índices de busca do painel
+Executa EXPLAIN dos filtros montados por web/search.py e confere se cada um
+usa o índice esperado (database/migrate_search_indexes.sql).
+
+Em tabelas pequenas o planner prefere ler a tabela inteira; por isso o
+EXPLAIN roda com enable_seqscan desligado, o que mostra se o índice PODE ser
+usado pelo filtro (não se ele compensa com os dados atuais).
+
+Execute com: python check_search_indexes.py
+"""
+
+import asyncio
+import json
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database.connection import db_manager
+from web.search import ReportSearchQuery
+
+# (descrição, filtro aplicado, índices aceitos)
+CHECKS = [
+    ("Hash (prefixo hex)", lambda s: s.hash('a1b2c3'), {'idx_denuncias_hash_prefix', 'idx_denuncias_hash_trgm'}),
+    ("Hash (trecho)", lambda s: s.hash('xyz-123'), {'idx_denuncias_hash_trgm'}),
+    ("Denunciado (ID)", lambda s: s.user('d.id_denunciado', '123456789012345678'), {'idx_denuncias_denunciado'}),
+    ("Denunciado (nome)", lambda s: s.user('d.id_denunciado', 'fulano'),
+     {'idx_usuarios_username_trgm', 'idx_usuarios_display_name_trgm'}),
+    ("Denunciante (nome)", lambda s: s.user('d.id_denunciante', 'ciclano'),
+     {'idx_usuarios_username_trgm', 'idx_usuarios_display_name_trgm'}),
+    ("Guardião (ID)", lambda s: s.guardian('123456789012345678'), {'idx_votos_guardiao'}),
+    ("Guardião (nome)", lambda s: s.guardian('beltrano'),
+     {'idx_usuarios_username_trgm', 'idx_usuarios_display_name_trgm'}),
+    ("Motivo (palavras)", lambda s: s.motivo('ofensa grave'), {'idx_denuncias_motivo_fts', 'idx_denuncias_motivo_trgm'}),
+]
+
+
+def plan_indexes(node) -> set:
+    """Nomes de todos os índices citados no plano (JSON) do EXPLAIN"""
+    found = set()
+    if isinstance(node, dict):
+        if 'Index Name' in node:
+            found.add(node['Index Name'])
+        for value in node.values():
+            found |= plan_indexes(value)
+    elif isinstance(node, list):
+        for item in node:
+            found |= plan_indexes(item)
+    return found
+
+
+async def explain(search: ReportSearchQuery) -> set:
+    """Índices usados pela query de listagem com os filtros da busca"""
+    query = f"""
+        EXPLAIN (FORMAT JSON)
+        SELECT d.id FROM denuncias d
+        WHERE {' AND '.join(search.conditions)}
+    """
+    async with db_manager.get_connection() as conn:
+        async with conn.transaction():
+            await conn.execute("SET LOCAL enable_seqscan = off")
+            plan = await conn.fetchval(query, *search.params)
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan_indexes(plan)
+
+
+async def run_checks() -> int:
+    """Executa todas as verificações e retorna a quantidade de falhas"""
+    failures = 0
+    for description, apply_filter, expected in CHECKS:
+        search = ReportSearchQuery()
+        apply_filter(search)
+        used = await explain(search)
+        if used & expected:
+            print(f"✅ {description:<22} {', '.join(sorted(used & expected))}")
+        else:
+            failures += 1
+            print(f"❌ {description:<22} esperado um de {sorted(expected)}, plano usou {sorted(used) or 'nenhum índice'}")
+    return failures
+
+
+async def main_async() -> int:
+    await db_manager.initialize_pool(min_connections=1, max_connections=2)
+    try:
+        return await run_checks()
+    finally:
+        await db_manager.close_pool()
+
+
+def main():
+    """Função principal"""
+    print("=" * 60)
+    print("🔍 ÍNDICES DE BUSCA - SISTEMA GUARDIÃO BETA")
+    print("=" * 60)
+    print(f"⏰ Iniciado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    try:
+        failures = asyncio.run(main_async())
+    except Exception as e:
+        print(f"❌ Erro durante a verificação: {e}")
+        return 1
+
+    print()
+    if failures:
+        print(f"❌ {failures} filtro(s) sem índice - aplique database/migrate_search_indexes.sql")
+        return 1
+    print("✅ Todos os filtros usam índices")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
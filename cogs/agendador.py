@@ -0,0 +1,61 @@
+"""
+Cog do Agendador de Jobs - Sistema Guardião BETA
+Controla o ciclo de vida do agendador de jobs persistentes e da retenção de denúncias
+"""
+
+import asyncio
+import logging
+from discord.ext import commands, tasks
+from database.connection import db_manager
+from utils.jobs import job_scheduler
+from utils.report_retention import report_retention
+from config import REPORT_RETENTION_INTERVAL_HOURS
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+
+class AgendadorCog(commands.Cog):
+    """Cog que executa os jobs da tabela jobs_agendados"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._start_task = None
+
+    async def cog_load(self):
+        """Inicia o agendador quando o bot e o banco estiverem prontos"""
+        self._start_task = asyncio.create_task(self._start_when_ready())
+
+    async def cog_unload(self):
+        """Para o agendador ao descarregar o cog"""
+        if self._start_task:
+            self._start_task.cancel()
+        job_scheduler.stop()
+        self.report_retention_loop.cancel()
+
+    async def _start_when_ready(self):
+        """Aguarda o bot e o pool do banco antes de executar jobs"""
+        await self.bot.wait_until_ready()
+        while not db_manager.pool:
+            await asyncio.sleep(1)
+
+        job_scheduler.start()
+        logger.info("⏰ Agendador de jobs persistentes iniciado")
+
+        if report_retention.enabled:
+            self.report_retention_loop.start()
+            logger.info(
+                f"🗄️ Retenção ativa: denúncias finalizadas e punições inativas há mais de {report_retention.days} dias "
+                f"({report_retention.mode})"
+            )
+
+    # ==================== RETENÇÃO ====================
+    @tasks.loop(hours=REPORT_RETENTION_INTERVAL_HOURS)
+    async def report_retention_loop(self):
+        """Arquiva ou exclui as denúncias finalizadas antigas (várias instâncias pegam lotes diferentes)"""
+        await report_retention.run()
+
+
+async def setup(bot):
+    """Função para carregar o cog"""
+    await bot.add_cog(AgendadorCog(bot))
@@ -13,6 +13,8 @@ import string
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional
 from database.connection import db_manager
+from utils.availability import availability_index
+from utils.jobs import job_scheduler
 from config import TURN_POINTS_PER_HOUR
 
 # Configuração de logging
@@ -150,6 +152,14 @@ class CaptchaSystemCog(commands.Cog):
         self.bot = bot
         self.captcha_check_loop.start()
         self.captcha_timeout_loop.start()
+        # Expiração de cada captcha como job persistente; o loop de timeout fica como varredura
+        job_scheduler.register('captcha_expirado', self._run_captcha_expiry_job)
+    
+    async def cog_unload(self):
+        """Para os loops ao descarregar o cog"""
+        self.captcha_check_loop.cancel()
+        self.captcha_timeout_loop.cancel()
+        job_scheduler.unregister('captcha_expirado')
     
     def generate_captcha(self) -> tuple[str, str, str]:
         """Gera um captcha matemático simples"""
@@ -234,6 +244,11 @@ class CaptchaSystemCog(commands.Cog):
                 insert_query, guardian_id, code, question, answer, expiration, channel_id
             )
             
+            await job_scheduler.enqueue(
+                'captcha_expirado', {'captcha_id': captcha_id}, expiration,
+                chave_unica=f"captcha:{captcha_id}"
+            )
+            
             # Busca dados do guardião
             guardian_data = await db_manager.execute_one(
                 "SELECT username, display_name FROM usuarios WHERE id_discord = $1",
@@ -364,67 +379,60 @@ class CaptchaSystemCog(commands.Cog):
         except Exception as e:
             logger.error(f"Erro no loop de timeout de captcha: {e}")
     
+    async def _run_captcha_expiry_job(self, payload: dict):
+        """Job 'captcha_expirado': prazo de resposta de um captcha (erros geram nova tentativa)"""
+        query = """
+            SELECT c.*, u.username, u.pontos, u.ultimo_turno_inicio
+            FROM captchas_guardioes c
+            JOIN usuarios u ON c.id_guardiao = u.id_discord
+            WHERE c.id = $1 AND c.status = 'Pendente'
+        """
+        captcha = await db_manager.execute_one(query, payload['captcha_id'])
+        if captcha:
+            await self._handle_expired_captcha(captcha)
+    
     async def _handle_expired_captcha(self, captcha_data: dict):
-        """Processa captcha expirado"""
+        """
+        Processa captcha expirado
+        
+        O captcha é reivindicado ('Pendente' → 'Expirado') e a penalidade é
+        gravada na mesma transação: o job agendado e a varredura nunca penalizam
+        duas vezes, e uma falha mantém o captcha 'Pendente' para nova tentativa.
+        Erros de banco são propagados para que o agendador de jobs tente de novo.
+        """
+        guardian_id = captcha_data['id_guardiao']
+        
+        # Calcula pontos perdidos (50% do que ganharia em 3 horas)
+        points_lost = int((CAPTCHA_SERVICE_HOURS * TURN_POINTS_PER_HOUR) * (CAPTCHA_PENALTY_PERCENTAGE / 100))
+        
+        captcha_update_query = """
+            UPDATE captchas_guardioes 
+            SET status = 'Expirado', pontos_penalizados = $1
+            WHERE id = $2 AND status = 'Pendente'
+            RETURNING id
+        """
+        # Remove do serviço e aplica penalidade
+        update_query = """
+            UPDATE usuarios 
+            SET em_servico = FALSE, ultimo_turno_inicio = NULL, pontos = GREATEST(0, pontos - $1)
+            WHERE id_discord = $2
+        """
+        
+        async with db_manager.get_connection() as conn:
+            async with conn.transaction():
+                claimed = await conn.fetch(captcha_update_query, points_lost, captcha_data['id'])
+                if not claimed:
+                    return
+                await conn.execute(update_query, points_lost, guardian_id)
+        
+        availability_index.set_off_duty(guardian_id)
+        
+        # Tenta editar a mensagem original
         try:
-            guardian_id = captcha_data['id_guardiao']
-            current_points = captcha_data['pontos']
-            
-            # Calcula pontos perdidos (50% do que ganharia em 3 horas)
-            points_lost = int((CAPTCHA_SERVICE_HOURS * TURN_POINTS_PER_HOUR) * (CAPTCHA_PENALTY_PERCENTAGE / 100))
-            new_points = max(0, current_points - points_lost)
-            
-            # Remove do serviço e aplica penalidade
-            update_query = """
-                UPDATE usuarios 
-                SET em_servico = FALSE, ultimo_turno_inicio = NULL, pontos = $1
-                WHERE id_discord = $2
-            """
-            await db_manager.execute_command(update_query, new_points, guardian_id)
-            
-            # Atualiza status do captcha
-            captcha_update_query = """
-                UPDATE captchas_guardioes 
-                SET status = 'Expirado', pontos_penalizados = $1
-                WHERE id = $2
-            """
-            await db_manager.execute_command(captcha_update_query, points_lost, captcha_data['id'])
-            
-            # Tenta editar a mensagem original
-            try:
-                channel = self.bot.get_channel(captcha_data['canal_id'])
-                if channel and captcha_data['mensagem_id']:
-                    message = await channel.fetch_message(captcha_data['mensagem_id'])
-                    if message:
-                        embed = discord.Embed(
-                            title="⏰ Captcha Expirado",
-                            description="Você não respondeu ao captcha a tempo e foi removido do serviço.",
-                            color=0xff0000
-                        )
-                        embed.add_field(
-                            name="Penalidade Aplicada",
-                            value=f"❌ Removido do serviço\n💰 {points_lost} pontos perdidos",
-                            inline=False
-                        )
-                        embed.add_field(
-                            name="Motivo",
-                            value="Não respondeu ao captcha em 15 minutos",
-                            inline=False
-                        )
-                        
-                        await message.edit(
-                            content="⏰ **Captcha expirado!**",
-                            embed=embed,
-                            view=None
-                        )
-            except Exception as e:
-                logger.warning(f"Não foi possível editar mensagem do captcha expirado: {e}")
-            
-            # Envia DM de notificação
-            try:
-                user = self.bot.get_user(guardian_id)
-                if user:
-                    dm_channel = await user.create_dm()
+            channel = self.bot.get_channel(captcha_data['canal_id'])
+            if channel and captcha_data['mensagem_id']:
+                message = await channel.fetch_message(captcha_data['mensagem_id'])
+                if message:
                     embed = discord.Embed(
                         title="⏰ Captcha Expirado",
                         description="Você não respondeu ao captcha a tempo e foi removido do serviço.",
@@ -436,19 +444,45 @@ class CaptchaSystemCog(commands.Cog):
                         inline=False
                     )
                     embed.add_field(
-                        name="Próximos Passos",
-                        value="Use `/turno` para entrar em serviço novamente",
+                        name="Motivo",
+                        value="Não respondeu ao captcha em 15 minutos",
                         inline=False
                     )
                     
-                    await dm_channel.send(embed=embed)
-            except Exception as e:
-                logger.warning(f"Não foi possível enviar DM de notificação: {e}")
-            
-            logger.info(f"Captcha expirado processado para guardião {guardian_id} - {points_lost} pontos perdidos")
-            
+                    await message.edit(
+                        content="⏰ **Captcha expirado!**",
+                        embed=embed,
+                        view=None
+                    )
         except Exception as e:
-            logger.error(f"Erro ao processar captcha expirado: {e}")
+            logger.warning(f"Não foi possível editar mensagem do captcha expirado: {e}")
+        
+        # Envia DM de notificação
+        try:
+            user = self.bot.get_user(guardian_id)
+            if user:
+                dm_channel = await user.create_dm()
+                embed = discord.Embed(
+                    title="⏰ Captcha Expirado",
+                    description="Você não respondeu ao captcha a tempo e foi removido do serviço.",
+                    color=0xff0000
+                )
+                embed.add_field(
+                    name="Penalidade Aplicada",
+                    value=f"❌ Removido do serviço\n💰 {points_lost} pontos perdidos",
+                    inline=False
+                )
+                embed.add_field(
+                    name="Próximos Passos",
+                    value="Use `/turno` para entrar em serviço novamente",
+                    inline=False
+                )
+                
+                await dm_channel.send(embed=embed)
+        except Exception as e:
+            logger.warning(f"Não foi possível enviar DM de notificação: {e}")
+        
+        logger.info(f"Captcha expirado processado para guardião {guardian_id} - {points_lost} pontos perdidos")
     
     @captcha_check_loop.before_loop
     async def before_captcha_check_loop(self):
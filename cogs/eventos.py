@@ -0,0 +1,114 @@
+"""
+Cog de Eventos - Sistema Guardião BETA
+Consome no event loop do bot os eventos publicados pelo painel web
+(broadcasts, banimentos, logs de servidor e ativações de premium)
+"""
+
+import logging
+from datetime import datetime
+from discord.ext import commands, tasks
+from utils.availability import availability_index
+from utils.discord_rest import discord_rest
+from utils.guild_settings import guild_settings
+from utils.broadcasts import broadcast_runner
+from utils.event_bus import (
+    event_bus, Event, BROADCAST_SOLICITADO, USUARIO_BANIDO, LOG_SERVIDOR, PREMIUM_ATIVADO, RECONECTADO
+)
+from config import BROADCAST_RESUME_MINUTES
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+
+class EventosCog(commands.Cog):
+    """Cog que reage aos eventos do barramento"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._subscriptions = (
+            (BROADCAST_SOLICITADO, self._on_broadcast),
+            (USUARIO_BANIDO, self._on_user_banned),
+            (LOG_SERVIDOR, self._on_server_log),
+            (PREMIUM_ATIVADO, self._on_premium_activated),
+            (RECONECTADO, self._on_reconnected),
+        )
+
+    async def cog_load(self):
+        """Registra os handlers no barramento"""
+        for tipo, handler in self._subscriptions:
+            event_bus.subscribe(tipo, handler)
+        self.resume_broadcasts.start()
+
+    async def cog_unload(self):
+        """Remove os handlers do barramento"""
+        for tipo, handler in self._subscriptions:
+            event_bus.unsubscribe(tipo, handler)
+        self.resume_broadcasts.cancel()
+
+    # ==================== BROADCAST ====================
+    def _on_broadcast(self, event: Event):
+        """Inicia o envio do broadcast criado pelo painel"""
+        broadcast_runner.start(int(event['id_broadcast']))
+
+    async def _on_reconnected(self, event: Event):
+        """Eventos podem ter se perdido durante a queda: retoma os pendentes"""
+        await self._resume_broadcasts()
+
+    async def _resume_broadcasts(self):
+        """Retoma broadcasts pendentes ou abandonados por outro processo"""
+        try:
+            resumed = await broadcast_runner.resume_pending()
+            if resumed:
+                logger.info(f"📢 {resumed} broadcast(s) retomado(s)")
+        except Exception as e:
+            logger.error(f"Erro ao retomar broadcasts: {e}")
+
+    @tasks.loop(minutes=BROADCAST_RESUME_MINUTES)
+    async def resume_broadcasts(self):
+        """Varredura periódica dos broadcasts com lease vencido"""
+        await self._resume_broadcasts()
+
+    @resume_broadcasts.before_loop
+    async def before_resume_broadcasts(self):
+        await self.bot.wait_until_ready()
+
+    # ==================== BANIMENTOS ====================
+    def _on_user_banned(self, event: Event):
+        """Tira o usuário banido de serviço imediatamente"""
+        availability_index.set_off_duty(int(event['id_usuario']))
+        logger.info(f"🔨 Usuário {event['id_usuario']} banido por {event['aplicado_por']}: {event['motivo']}")
+
+    # ==================== LOGS DE SERVIDOR ====================
+    async def _on_server_log(self, event: Event):
+        """Envia o log para o canal configurado do servidor"""
+        server_id = int(event['id_servidor'])
+        config = await guild_settings.get(server_id)
+        if not config.canal_log:
+            logger.info(f"📝 Servidor {server_id} não tem canal de log configurado")
+            return
+
+        embed = {
+            'title': event['titulo'],
+            'description': event['descricao'],
+            'color': event.get('cor', 0x00ff00),
+            'timestamp': datetime.utcnow().isoformat(),
+            'footer': {'text': f"Sistema Guardião BETA - {event['tipo_log']}"}
+        }
+        if event.get('campos'):
+            embed['fields'] = event['campos']
+
+        response = await discord_rest.send_message(int(config.canal_log), {'embeds': [embed]})
+        if response.ok:
+            logger.info(f"✅ Log enviado para canal {config.canal_log} do servidor {server_id}")
+        else:
+            logger.error(f"❌ Erro ao enviar log: {response.status_code} - {response.text}")
+
+    # ==================== PREMIUM ====================
+    def _on_premium_activated(self, event: Event):
+        """Registra a ativação (o cache de configurações já foi invalidado)"""
+        logger.info(f"⭐ Premium ativado para servidor {event['id_servidor']} até {event['data_fim']}")
+
+
+async def setup(bot):
+    """Função para carregar o cog"""
+    await bot.add_cog(EventosCog(bot))
@@ -9,7 +9,8 @@ from discord import ui, app_commands
 import logging
 import asyncio
 from datetime import datetime, timedelta, timezone
-from database.connection import db_manager, get_user_by_discord_id_sync
+from database.connection import db_manager, get_user_by_discord_id
+from utils.availability import availability_index
 from config import GUARDIAO_MIN_ACCOUNT_AGE_MONTHS, TURN_POINTS_PER_HOUR, PROVA_COOLDOWN_HOURS
 
 # Configuração de logging
@@ -491,7 +492,7 @@ class GuardiaoCog(commands.Cog):
         try:
             # Verifica se o banco de dados está disponível
             if not db_manager.pool:
-                db_manager.initialize_pool()
+                await db_manager.initialize_pool()
             
             # Verifica a idade da conta (mínimo 3 meses)
             # Converte created_at para timezone-naive para compatibilidade
@@ -514,7 +515,7 @@ class GuardiaoCog(commands.Cog):
                 return
             
             # Verifica se o usuário está cadastrado
-            user_data = get_user_by_discord_id_sync(interaction.user.id)
+            user_data = await get_user_by_discord_id(interaction.user.id)
             if not user_data:
                 embed = discord.Embed(
                     title="❌ Usuário Não Cadastrado",
@@ -621,10 +622,10 @@ class GuardiaoCog(commands.Cog):
         try:
             # Verifica se o banco de dados está disponível
             if not db_manager.pool:
-                db_manager.initialize_pool()
+                await db_manager.initialize_pool()
             
             # Busca os dados do usuário
-            user_data = get_user_by_discord_id_sync(interaction.user.id)
+            user_data = await get_user_by_discord_id(interaction.user.id)
             if not user_data:
                 embed = discord.Embed(
                     title="❌ Usuário Não Cadastrado",
@@ -694,6 +695,16 @@ class GuardiaoCog(commands.Cog):
             """
             await db_manager.execute_command(query, now, user_data['id_discord'])
             
+            availability_index.set_on_duty(
+                user_data['id_discord'], user_data['categoria'],
+                user_data.get('cooldown_dispensa'), user_data.get('cooldown_inativo')
+            )
+            
+            # Denúncias aguardando Guardiões podem ser entregues imediatamente
+            moderacao_cog = self.bot.get_cog('ModeracaoCog')
+            if moderacao_cog:
+                moderacao_cog.request_distribution("turno")
+            
             embed = discord.Embed(
                 title="🟢 Você Entrou em Serviço!",
                 description="Agora você está disponível para receber denúncias.",
@@ -764,6 +775,8 @@ class GuardiaoCog(commands.Cog):
                     color=0xff6600
                 )
             
+            availability_index.set_off_duty(user_data['id_discord'])
+            
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
         except Exception as e:
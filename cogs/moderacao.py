@@ -9,15 +9,28 @@ from discord import ui, app_commands
 import logging
 import asyncio
 import hashlib
-import re
+import json
+import random
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple
 from database.connection import db_manager, get_user_by_discord_id
 from utils.experience_system import calculate_experience_reward
+from utils.availability import availability_index
+from utils.deadline_scheduler import DeadlineScheduler
+from utils.jobs import job_scheduler
+from utils.discord_rest import discord_rest
+from utils.message_buffer import message_buffer, BufferedMessage
+from utils.evidence_cache import evidence_cache, render_evidence
+from utils.guild_settings import guild_settings
+from utils.event_bus import event_bus, DENUNCIA_CRIADA
 from config import (
     MAX_GUARDIANS_PER_REPORT, REQUIRED_VOTES_FOR_DECISION, 
     VOTE_TIMEOUT_MINUTES, DISPENSE_COOLDOWN_MINUTES, 
-    INACTIVE_PENALTY_HOURS, PUNISHMENT_RULES
+    INACTIVE_PENALTY_HOURS, PUNISHMENT_RULES,
+    DISTRIBUTION_SWEEP_SECONDS, DISTRIBUTION_BATCH_SIZE, AVAILABILITY_RECONCILE_SECONDS,
+    DM_FANOUT_CONCURRENCY, TIMEOUT_SWEEP_MINUTES, MESSAGE_BUFFER_ENABLED
 )
 
 # Configuração de logging
@@ -52,7 +65,7 @@ class ReportView(ui.View):
                     AND table_name = 'mensagens_guardioes'
                 )
             """
-            table_exists = db_manager.execute_scalar_sync(table_exists_query)
+            table_exists = await db_manager.execute_scalar(table_exists_query)
             
             if table_exists:
                 update_msg_query = """
@@ -61,12 +74,22 @@ class ReportView(ui.View):
                     WHERE id_guardiao = $1 AND id_denuncia = (
                         SELECT id FROM denuncias WHERE hash_denuncia = $2
                     ) AND status = 'Enviada'
+                    RETURNING id_denuncia
                 """
-                db_manager.execute_command_sync(update_msg_query, interaction.user.id, self.hash_denuncia)
+                attended_id = await db_manager.execute_scalar(update_msg_query, interaction.user.id, self.hash_denuncia)
+                
+                # Agenda a penalidade de inatividade caso o voto não chegue a tempo
+                if attended_id:
+                    await job_scheduler.enqueue(
+                        'penalidade_inatividade',
+                        {'id_guardiao': interaction.user.id, 'id_denuncia': attended_id},
+                        datetime.utcnow() + timedelta(minutes=VOTE_TIMEOUT_MINUTES),
+                        chave_unica=f"inatividade:{attended_id}:{interaction.user.id}"
+                    )
             else:
                 # Remove do cache temporário quando atende
                 denuncia_id_query = "SELECT id FROM denuncias WHERE hash_denuncia = $1"
-                denuncia_id = db_manager.execute_scalar_sync(denuncia_id_query, self.hash_denuncia)
+                denuncia_id = await db_manager.execute_scalar(denuncia_id_query, self.hash_denuncia)
                 
                 # Acessa o cog para limpar o cache
                 from main import bot
@@ -78,14 +101,9 @@ class ReportView(ui.View):
                         if not moderacao_cog.temp_message_tracking[denuncia_id]:
                             moderacao_cog.temp_message_tracking.pop(denuncia_id, None)
             
-            # Verifica se ainda há vagas para esta denúncia (considerando peso dos moderadores)
-            weighted_count_query = """
-                SELECT COALESCE(SUM(CASE WHEN u.categoria = 'Moderador' THEN 5 ELSE 1 END), 0) as peso_total
-                FROM votos_guardioes vg
-                JOIN usuarios u ON vg.id_guardiao = u.id_discord
-                WHERE vg.id_denuncia = (SELECT id FROM denuncias WHERE hash_denuncia = $1)
-            """
-            weighted_count = db_manager.execute_scalar_sync(weighted_count_query, self.hash_denuncia)
+            # Verifica se ainda há vagas para esta denúncia (placar com peso dos moderadores)
+            weighted_count_query = "SELECT votos_peso FROM denuncias WHERE hash_denuncia = $1"
+            weighted_count = await db_manager.execute_scalar(weighted_count_query, self.hash_denuncia) or 0
             logger.info(f"Peso total de votos para denúncia {self.hash_denuncia}: {weighted_count}")
             
             if weighted_count >= REQUIRED_VOTES_FOR_DECISION:
@@ -105,12 +123,12 @@ class ReportView(ui.View):
                 JOIN usuarios u2 ON d.id_denunciado = u2.id_discord
                 WHERE d.hash_denuncia = $1
             """
-            denuncia = db_manager.execute_one_sync(denuncia_query, self.hash_denuncia)
+            denuncia = await db_manager.execute_one(denuncia_query, self.hash_denuncia)
             
             if not denuncia:
                 # Fallback: busca sem JOINs
                 simple_query = "SELECT * FROM denuncias WHERE hash_denuncia = $1"
-                simple_denuncia = db_manager.execute_one_sync(simple_query, self.hash_denuncia)
+                simple_denuncia = await db_manager.execute_one(simple_query, self.hash_denuncia)
                 
                 if simple_denuncia:
                     denuncia = simple_denuncia.copy()
@@ -120,13 +138,19 @@ class ReportView(ui.View):
                     await interaction.response.send_message("Denúncia não encontrada.", ephemeral=True)
                     return
             
-            # Busca as mensagens capturadas
-            mensagens_query = """
-                SELECT * FROM mensagens_capturadas 
-                WHERE id_denuncia = $1 
-                ORDER BY timestamp_mensagem DESC
-            """
-            mensagens = db_manager.execute_query_sync(mensagens_query, denuncia['id'])
+            availability_index.message_closed(denuncia['id'], interaction.user.id)
+            
+            # Campos de evidência renderizados na captura (ou renderiza e guarda)
+            evidence_fields = evidence_cache.get(self.hash_denuncia)
+            if evidence_fields is None:
+                mensagens_query = """
+                    SELECT id_autor, conteudo, timestamp_mensagem FROM mensagens_capturadas 
+                    WHERE id_denuncia = $1 
+                    ORDER BY timestamp_mensagem DESC
+                """
+                mensagens = await db_manager.execute_query(mensagens_query, denuncia['id'])
+                evidence_fields = render_evidence(mensagens, denuncia['id_denunciado'])
+                evidence_cache.put(self.hash_denuncia, evidence_fields)
             
             # Cria o embed com os detalhes da denúncia
             embed = discord.Embed(
@@ -146,13 +170,8 @@ class ReportView(ui.View):
             )
             
             # Adiciona as mensagens capturadas (anonimizadas)
-            if mensagens:
-                mensagens_anonimizadas = self._anonymize_messages(mensagens, denuncia['id_denunciado'])
-                
-                # Divide em chunks para não exceder limite do Discord
-                chunks = self._split_into_chunks(mensagens_anonimizadas, 1000)
-                
-                for i, chunk in enumerate(chunks):
+            if evidence_fields:
+                for i, chunk in enumerate(evidence_fields):
                     field_name = f"💬 Mensagens Capturadas" if i == 0 else f"💬 Mensagens (cont. {i+1})"
                     embed.add_field(name=field_name, value=chunk, inline=False)
             else:
@@ -191,7 +210,7 @@ class ReportView(ui.View):
                     AND table_name = 'mensagens_guardioes'
                 )
             """
-            table_exists = db_manager.execute_scalar_sync(table_exists_query)
+            table_exists = await db_manager.execute_scalar(table_exists_query)
             
             if table_exists:
                 update_msg_query = """
@@ -200,12 +219,13 @@ class ReportView(ui.View):
                     WHERE id_guardiao = $1 AND id_denuncia = (
                         SELECT id FROM denuncias WHERE hash_denuncia = $2
                     ) AND status = 'Enviada'
+                    RETURNING id_denuncia
                 """
-                db_manager.execute_command_sync(update_msg_query, interaction.user.id, self.hash_denuncia)
+                denuncia_id = await db_manager.execute_scalar(update_msg_query, interaction.user.id, self.hash_denuncia)
             else:
                 # Remove do cache temporário quando dispensa
                 denuncia_id_query = "SELECT id FROM denuncias WHERE hash_denuncia = $1"
-                denuncia_id = db_manager.execute_scalar_sync(denuncia_id_query, self.hash_denuncia)
+                denuncia_id = await db_manager.execute_scalar(denuncia_id_query, self.hash_denuncia)
                 
                 # Acessa o cog para limpar o cache
                 from main import bot
@@ -220,7 +240,16 @@ class ReportView(ui.View):
             # Define o cooldown de dispensa
             cooldown_time = datetime.utcnow() + timedelta(minutes=DISPENSE_COOLDOWN_MINUTES)
             query = "UPDATE usuarios SET cooldown_dispensa = $1 WHERE id_discord = $2"
-            db_manager.execute_command_sync(query, cooldown_time, interaction.user.id)
+            await db_manager.execute_command(query, cooldown_time, interaction.user.id)
+            
+            availability_index.set_dispense_cooldown(interaction.user.id, cooldown_time)
+            if denuncia_id:
+                availability_index.message_closed(denuncia_id, interaction.user.id)
+            
+            # A vaga liberada pode ser oferecida a outro Guardião imediatamente
+            moderacao_cog = interaction.client.get_cog('ModeracaoCog')
+            if moderacao_cog:
+                moderacao_cog.request_distribution("dispensa")
             
             embed = discord.Embed(
                 title="❌ Ocorrência Dispensada",
@@ -238,76 +267,14 @@ class ReportView(ui.View):
         except Exception as e:
             logger.error(f"Erro ao dispensar denúncia: {e}")
             await interaction.response.send_message("Erro ao dispensar ocorrência.", ephemeral=True)
-    
-    def _anonymize_messages(self, mensagens: List[Dict], id_denunciado: int) -> str:
-        """Anonimiza as mensagens para proteção da privacidade"""
-        try:
-            if not mensagens:
-                return "Nenhuma mensagem encontrada."
-            
-            # Mapeia usuários únicos para nomes anônimos
-            usuarios_unicos = {}
-            contador_usuario = 1
-            
-            for msg in mensagens:
-                if msg['id_autor'] not in usuarios_unicos:
-                    if msg['id_autor'] == id_denunciado:
-                        usuarios_unicos[msg['id_autor']] = "**🔴 Denunciado**"
-                    else:
-                        usuarios_unicos[msg['id_autor']] = f"**Usuário {contador_usuario}**"
-                        contador_usuario += 1
-            
-            result = []
-            for msg in mensagens[:15]:  # Limita a 15 mensagens
-                # Converte para horário de Brasília
-                timestamp_brasilia = msg['timestamp_mensagem'] - timedelta(hours=3)
-                timestamp_formatado = timestamp_brasilia.strftime('%H:%M')
-                
-                autor = usuarios_unicos[msg['id_autor']]
-                conteudo = msg['conteudo'][:150] + "..." if len(msg['conteudo']) > 150 else msg['conteudo']
-                
-                # Remove menções para anonimização
-                conteudo = re.sub(r'<@!?\d+>', '[Usuário]', conteudo)
-                
-                if msg['id_autor'] == id_denunciado:
-                    linha = f"🔴 **{autor}** ({timestamp_formatado}): **{conteudo}**"
-                else:
-                    linha = f"{autor} ({timestamp_formatado}): {conteudo}"
-                
-                result.append(linha)
-            
-            return "\n\n".join(result)
-                
-        except Exception as e:
-            logger.error(f"Erro ao anonimizar mensagens: {e}")
-            return "Erro ao processar mensagens."
-    
-    def _split_into_chunks(self, text: str, max_length: int) -> List[str]:
-        """Divide o texto em chunks para não exceder o limite do Discord"""
-        if len(text) <= max_length:
-            return [text]
-        
-        chunks = []
-        lines = text.split('\n\n')
-        current_chunk = ""
-        
-        for line in lines:
-            if len(current_chunk + line + "\n\n") > max_length:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = line + "\n\n"
-            else:
-                current_chunk += line + "\n\n"
-        
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
-        
-        return chunks
 
 
 class VoteView(ui.View):
     """View para votação em denúncias"""
     
+    # Pesos possíveis de um voto: guardião = 1, moderador = 5
+    VOTE_WEIGHTS = (1, 5)
+    
     def __init__(self, hash_denuncia: str, guardiao_id: int, timeout: float = 300):
         super().__init__(timeout=timeout)
         self.hash_denuncia = hash_denuncia
@@ -328,29 +295,29 @@ class VoteView(ui.View):
     async def _process_vote(self, interaction: discord.Interaction, voto: str):
         """Processa o voto do guardião"""
         try:
-            # Verifica se o usuário já votou nesta denúncia
-            check_query = """
-                SELECT id FROM votos_guardioes 
-                WHERE id_guardiao = $1 AND id_denuncia = (SELECT id FROM denuncias WHERE hash_denuncia = $2)
-            """
-            existing_vote = db_manager.execute_scalar_sync(check_query, self.guardiao_id, self.hash_denuncia)
+            outcome = await self._record_vote(voto)
             
-            if existing_vote:
+            if outcome['status'] == 'nao_encontrada':
+                await interaction.response.send_message("Denúncia não encontrada.", ephemeral=True)
+                return
+            
+            if outcome['status'] == 'duplicado':
                 await interaction.response.send_message("Você já votou nesta denúncia!", ephemeral=True)
                 return
             
-            # Registra o voto
-            vote_query = """
-                INSERT INTO votos_guardioes (id_denuncia, id_guardiao, voto)
-                SELECT id, $1, $2 FROM denuncias WHERE hash_denuncia = $3
-            """
-            db_manager.execute_command_sync(vote_query, self.guardiao_id, voto, self.hash_denuncia)
+            if outcome['status'] == 'encerrada':
+                embed = discord.Embed(
+                    title="❌ Denúncia Encerrada",
+                    description="Esta denúncia já foi finalizada pelos outros Guardiões.",
+                    color=0xff0000
+                )
+                await interaction.response.edit_message(embed=embed, view=None)
+                return
             
-            # Remove do cache temporário se existir
-            denuncia_id_query = "SELECT id FROM denuncias WHERE hash_denuncia = $1"
-            denuncia_id = db_manager.execute_scalar_sync(denuncia_id_query, self.hash_denuncia)
+            denuncia_id = outcome['id_denuncia']
+            availability_index.vote_recorded(denuncia_id, self.guardiao_id)
             
-            # Acessa o cog para limpar o cache
+            # Remove do cache temporário se existir
             from main import bot
             moderacao_cog = bot.get_cog('ModeracaoCog')
             if moderacao_cog and denuncia_id in moderacao_cog.temp_message_cache:
@@ -366,68 +333,172 @@ class VoteView(ui.View):
             )
             await interaction.response.edit_message(embed=embed, view=None)
             
-            # Verifica se a denúncia atingiu 5 votos
-            await self._check_denuncia_completion()
+            # A decisão já foi tomada na transação do voto; aplica os efeitos no Discord
+            if outcome['result']:
+                await self._finalize_denuncia(outcome)
             
         except Exception as e:
             logger.error(f"Erro ao processar voto: {e}")
             await interaction.response.send_message("Erro ao processar voto.", ephemeral=True)
     
-    async def _check_denuncia_completion(self):
-        """Verifica se a denúncia atingiu 5 votos e processa o resultado"""
-        try:
-            # Conta os votos com peso (moderador = 5, guardião = 1)
-            weighted_votes_query = """
-                SELECT SUM(CASE WHEN u.categoria = 'Moderador' THEN 5 ELSE 1 END) as peso_total
-                FROM votos_guardioes vg
-                JOIN usuarios u ON vg.id_guardiao = u.id_discord
-                WHERE vg.id_denuncia = (SELECT id FROM denuncias WHERE hash_denuncia = $1)
-            """
-            total_weighted_votes = db_manager.execute_scalar_sync(weighted_votes_query, self.hash_denuncia) or 0
-            
-            if total_weighted_votes >= REQUIRED_VOTES_FOR_DECISION:
-                await self._finalize_denuncia()
+    async def _record_vote(self, voto: str) -> Dict:
+        """
+        Registra o voto, atualiza o placar e decide a denúncia em uma única transação
+        
+        A linha da denúncia fica bloqueada (FOR UPDATE) durante a transação, de modo
+        que dois votos simultâneos nunca finalizem a mesma denúncia duas vezes.
+        
+        Returns:
+            Dicionário com status ('registrado', 'duplicado', 'encerrada' ou
+            'nao_encontrada'), id_denuncia, votos_peso, o resultado (quando a
+            denúncia foi decidida por este voto) e os votos usados na decisão
+        """
+        async with db_manager.get_connection() as conn:
+            async with conn.transaction():
+                denuncia = await conn.fetchrow(
+                    "SELECT id, status FROM denuncias WHERE hash_denuncia = $1 FOR UPDATE",
+                    self.hash_denuncia
+                )
+                if not denuncia:
+                    return {'status': 'nao_encontrada'}
                 
-        except Exception as e:
-            logger.error(f"Erro ao verificar conclusão da denúncia: {e}")
+                outcome = {
+                    'status': 'registrado',
+                    'id_denuncia': denuncia['id'],
+                    'votos_peso': None,
+                    'result': None,
+                    'votes': []
+                }
+                
+                if denuncia['status'] == 'Finalizada':
+                    outcome['status'] = 'encerrada'
+                    return outcome
+                
+                # Insere o voto e soma o peso do votante (moderador = 5, guardião = 1)
+                tally_query = """
+                    WITH novo AS (
+                        INSERT INTO votos_guardioes (id_denuncia, id_guardiao, voto)
+                        VALUES ($1, $2, $3)
+                        ON CONFLICT (id_denuncia, id_guardiao) DO NOTHING
+                        RETURNING id_denuncia, id_guardiao
+                    ), peso AS (
+                        SELECT n.id_denuncia, CASE WHEN u.categoria = 'Moderador' THEN 5 ELSE 1 END AS peso
+                        FROM novo n
+                        LEFT JOIN usuarios u ON u.id_discord = n.id_guardiao
+                    )
+                    UPDATE denuncias d
+                    SET votos_peso = d.votos_peso + p.peso, votos_count = d.votos_count + 1
+                    FROM peso p
+                    WHERE d.id = p.id_denuncia
+                    RETURNING d.votos_peso, p.peso
+                """
+                tally = await conn.fetchrow(tally_query, denuncia['id'], self.guardiao_id, voto)
+                if not tally:
+                    outcome['status'] = 'duplicado'
+                    return outcome
+                
+                outcome['votos_peso'] = tally['votos_peso']
+                if tally['peso'] > 1:
+                    logger.info(f"Voto de moderador aplicado com peso {tally['peso']}: {voto}")
+                
+                # Busca os votos com categoria do votante para decidir
+                votes_query = """
+                    SELECT vg.id_guardiao, vg.voto, u.categoria 
+                    FROM votos_guardioes vg
+                    JOIN usuarios u ON vg.id_guardiao = u.id_discord
+                    WHERE vg.id_denuncia = $1
+                """
+                votes = [dict(row) for row in await conn.fetch(votes_query, denuncia['id'])]
+                
+                # Conta os votos com peso especial para moderadores
+                vote_counts = {"OK!": 0, "Intimidou": 0, "Grave": 0}
+                for vote in votes:
+                    vote_counts[vote['voto']] += 5 if vote['categoria'] == 'Moderador' else 1
+                
+                if tally['votos_peso'] >= REQUIRED_VOTES_FOR_DECISION:
+                    result = self._determine_punishment(vote_counts)
+                else:
+                    # Decisão antecipada: nenhum voto restante pode mudar o resultado
+                    result = self._early_decision(vote_counts)
+                    if not result:
+                        return outcome
+                    logger.info(
+                        f"⚡ Denúncia {self.hash_denuncia} decidida antecipadamente com peso "
+                        f"{tally['votos_peso']}/{REQUIRED_VOTES_FOR_DECISION}: {result['type']}"
+                    )
+                
+                await conn.execute(
+                    "UPDATE denuncias SET status = 'Finalizada', resultado_final = $2 WHERE id = $1",
+                    denuncia['id'], result['type']
+                )
+                
+                outcome['result'] = result
+                outcome['votes'] = votes
+                return outcome
     
-    async def _finalize_denuncia(self):
-        """Finaliza a denúncia e aplica a punição"""
-        try:
-            # Busca todos os votos com categoria do votante
-            votes_query = """
-                SELECT vg.voto, u.categoria 
-                FROM votos_guardioes vg
-                JOIN usuarios u ON vg.id_guardiao = u.id_discord
-                WHERE vg.id_denuncia = (SELECT id FROM denuncias WHERE hash_denuncia = $1)
-            """
-            votes = db_manager.execute_query_sync(votes_query, self.hash_denuncia)
+    def _early_decision(self, vote_counts: Dict[str, int]) -> Optional[Dict]:
+        """
+        Retorna o resultado se os votos atuais já o tornam definitivo
+        
+        Explora todas as sequências de votos restantes (qualquer opção, com peso
+        de guardião ou de moderador) até o peso atingir REQUIRED_VOTES_FOR_DECISION.
+        Se todas levam ao mesmo resultado, nenhum voto futuro pode mudá-lo.
+        
+        Args:
+            vote_counts: Votos com peso por opção ("OK!", "Intimidou", "Grave")
             
-            # Conta os votos com peso especial para moderadores
-            vote_counts = {"OK!": 0, "Intimidou": 0, "Grave": 0}
-            for vote in votes:
-                peso = 5 if vote['categoria'] == 'Moderador' else 1
-                vote_counts[vote['voto']] += peso
-                if peso > 1:
-                    logger.info(f"Voto de moderador aplicado com peso {peso}: {vote['voto']}")
+        Returns:
+            Resultado de _determine_punishment ou None se ainda está em aberto
+        """
+        outcomes = self._possible_outcomes(
+            vote_counts["OK!"], vote_counts["Intimidou"], vote_counts["Grave"], {}
+        )
+        if len(outcomes) == 1:
+            return next(iter(outcomes.values()))
+        return None
+    
+    def _possible_outcomes(self, ok: int, intimidou: int, grave: int, memo: Dict) -> Dict[tuple, Dict]:
+        """Resultados alcançáveis a partir do placar informado (para na 2ª possibilidade)"""
+        state = (ok, intimidou, grave)
+        if state in memo:
+            return memo[state]
+        
+        outcomes = {}
+        if ok + intimidou + grave >= REQUIRED_VOTES_FOR_DECISION:
+            result = self._determine_punishment({"OK!": ok, "Intimidou": intimidou, "Grave": grave})
+            outcomes[tuple(sorted(result.items()))] = result
+        else:
+            for peso in self.VOTE_WEIGHTS:
+                for next_state in ((ok + peso, intimidou, grave),
+                                   (ok, intimidou + peso, grave),
+                                   (ok, intimidou, grave + peso)):
+                    outcomes.update(self._possible_outcomes(*next_state, memo))
+                    if len(outcomes) > 1:
+                        break
+                if len(outcomes) > 1:
+                    break
+        
+        memo[state] = outcomes
+        return outcomes
+    
+    async def _finalize_denuncia(self, outcome: Dict):
+        """Aplica os efeitos de uma denúncia já decidida (punição, experiência e apelação)"""
+        try:
+            result = outcome['result']
+            availability_index.drop_report(outcome['id_denuncia'])
             
-            # Determina o resultado
-            result = self._determine_punishment(vote_counts)
+            # Libera os Guardiões que ainda tinham a denúncia na DM
+            from main import bot
+            moderacao_cog = bot.get_cog('ModeracaoCog')
+            if moderacao_cog:
+                await moderacao_cog.cancel_report_messages(outcome['id_denuncia'])
             
             # Aplica a punição se necessário
             if result['punishment']:
                 await self._apply_punishment(result)
             
-            # Atualiza a denúncia
-            update_query = """
-                UPDATE denuncias 
-                SET status = 'Finalizada', resultado_final = $1 
-                WHERE hash_denuncia = $2
-            """
-            db_manager.execute_command_sync(update_query, result['type'], self.hash_denuncia)
-            
             # Distribui experiência para os guardiões
-            await self._distribute_experience()
+            await self._distribute_experience(outcome['votes'])
             
             # Envia DM para o denunciado com botão de apelação
             if result['punishment']:
@@ -490,7 +561,7 @@ class VoteView(ui.View):
                 SELECT id_servidor, id_denunciado FROM denuncias 
                 WHERE hash_denuncia = $1
             """
-            denuncia = db_manager.execute_one_sync(denuncia_query, self.hash_denuncia)
+            denuncia = await db_manager.execute_one(denuncia_query, self.hash_denuncia)
             
             if not denuncia:
                 return
@@ -498,26 +569,15 @@ class VoteView(ui.View):
             server_id = int(denuncia['id_servidor'])
             member_id = int(denuncia['id_denunciado'])
             
-            # SOLUÇÃO DEFINITIVA: Usa requests para aplicar punição via API do Discord diretamente
-            # Não depende do loop do bot
-            import requests
-            import os
-            
-            # Pega o token do bot
-            bot_token = os.getenv('DISCORD_TOKEN')
-            if not bot_token:
+            # Aplica a punição pela API REST do Discord (cliente compartilhado com rate limit)
+            if not discord_rest.has_token:
                 logger.error("DISCORD_TOKEN não configurado")
                 return
             
             # Calcula a data de fim do timeout
             duration_delta = timedelta(seconds=result['duration'])
             timeout_until = datetime.utcnow() + duration_delta
-            
-            # Headers para API do Discord
-            headers = {
-                'Authorization': f'Bot {bot_token}',
-                'Content-Type': 'application/json'
-            }
+            punishment_reason = f"Punição automática - {result['type']}"
             
             # Dados para aplicar timeout
             timeout_data = {
@@ -525,11 +585,7 @@ class VoteView(ui.View):
             }
             
             # Aplica timeout via API do Discord
-            response = requests.patch(
-                f'https://discord.com/api/v10/guilds/{server_id}/members/{member_id}',
-                headers=headers, 
-                json=timeout_data
-            )
+            response = await discord_rest.edit_member(server_id, member_id, timeout_data, reason=punishment_reason)
             
             if response.status_code == 200:
                 logger.info(f"✅ Punição aplicada via API para {member_id} por {result['duration']} segundos")
@@ -540,11 +596,10 @@ class VoteView(ui.View):
                     logger.info(f"📝 Enviando log de sucesso via API direta do Discord...")
                     
                     # Busca configuração do canal de log
-                    config_query = "SELECT canal_log FROM configuracoes_servidor WHERE id_servidor = $1"
-                    config = db_manager.execute_one_sync(config_query, server_id)
+                    config = await guild_settings.get(server_id)
                     
-                    if config and config['canal_log']:
-                        log_channel_id = int(config['canal_log'])
+                    if config.canal_log:
+                        log_channel_id = int(config.canal_log)
                         logger.info(f"📝 Canal de log: {log_channel_id}")
                         
                         # Cria embed de log de sucesso
@@ -563,16 +618,8 @@ class VoteView(ui.View):
                         }
                         
                         # Envia via API direta
-                        headers = {
-                            'Authorization': f'Bot {bot_token}',
-                            'Content-Type': 'application/json'
-                        }
-                        
                         message_data = {"embeds": [embed_data]}
-                        response_log = requests.post(
-                            f'https://discord.com/api/v10/channels/{log_channel_id}/messages',
-                            headers=headers, json=message_data, timeout=10
-                        )
+                        response_log = await discord_rest.send_message(log_channel_id, message_data)
                         
                         if response_log.status_code == 200:
                             logger.info(f"✅ Log de sucesso enviado com sucesso via API direta!")
@@ -588,15 +635,7 @@ class VoteView(ui.View):
                     logger.info(f"📝 Salvando log de punição no banco de dados...")
                     
                     # Busca informações do usuário via API do Discord
-                    user_headers = {
-                        'Authorization': f'Bot {bot_token}',
-                        'Content-Type': 'application/json'
-                    }
-                    
-                    user_response = requests.get(
-                        f'https://discord.com/api/v10/users/{member_id}',
-                        headers=user_headers, timeout=10
-                    )
+                    user_response = await discord_rest.get_user(member_id)
                     
                     if user_response.status_code == 200:
                         user_data = user_response.json()
@@ -629,7 +668,7 @@ class VoteView(ui.View):
                         ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
                     """
                     
-                    db_manager.execute_query_sync(
+                    await db_manager.execute_command(
                         insert_log,
                         member_id,
                         username,
@@ -681,56 +720,17 @@ class VoteView(ui.View):
                 except Exception as bot_error:
                     logger.warning(f"⚠️ Erro ao aplicar punição via bot: {bot_error}")
                 
-                # Abordagem 2: Tenta API com headers diferentes
-                try:
-                    logger.info("🔄 Tentando API com headers alternativos...")
-                    alt_headers = {
-                        'Authorization': f'Bot {bot_token}',
-                        'Content-Type': 'application/json',
-                        'User-Agent': 'DiscordBot (https://github.com/discord/discord-api-docs, 1.0)'
-                    }
-                    
-                    alt_response = requests.patch(
-                        f'https://discord.com/api/v10/guilds/{server_id}/members/{member_id}',
-                        headers=alt_headers, 
-                        json=timeout_data,
-                        timeout=10
-                    )
-                    
-                    if alt_response.status_code == 200:
-                        logger.info(f"✅ Punição aplicada via API alternativa para {member_id}")
-                        return True
-                    else:
-                        logger.warning(f"⚠️ API alternativa também falhou: {alt_response.status_code}")
-                        
-                except Exception as alt_error:
-                    logger.warning(f"⚠️ Erro na API alternativa: {alt_error}")
-                
-                # Abordagem 3: Tenta ban temporário APENAS se for banimento
+                # Abordagem 2: Tenta ban temporário APENAS se for banimento
                 if result.get('is_ban', False):
                     try:
                         logger.info("🔄 Tentando ban temporário (apenas para banimentos)...")
-                        ban_data = {
-                            'delete_message_days': 0,
-                            'reason': f"Punição automática - {result['type']}"
-                        }
-                        
-                        ban_response = requests.put(
-                            f'https://discord.com/api/v10/guilds/{server_id}/bans/{member_id}',
-                            headers=headers,
-                            json=ban_data,
-                            timeout=10
-                        )
+                        ban_response = await discord_rest.ban(server_id, member_id, reason=punishment_reason)
                         
                         if ban_response.status_code in [200, 204]:
                             logger.info(f"✅ Ban temporário aplicado para {member_id}")
                             
-                            # Agenda unban automático
-                            try:
-                                import asyncio
-                                asyncio.create_task(self._schedule_unban(server_id, member_id, result['duration']))
-                            except Exception as schedule_error:
-                                logger.warning(f"⚠️ Não foi possível agendar unban automático: {schedule_error}")
+                            # Agenda unban automático (job persistente)
+                            await self._schedule_unban(server_id, member_id, result['duration'])
                             
                             return True
                         else:
@@ -767,14 +767,13 @@ class VoteView(ui.View):
                         logger.info(f"📝 Enviando log via API direta do Discord...")
                         
                         # Busca configuração do canal de log
-                        config_query = "SELECT canal_log FROM configuracoes_servidor WHERE id_servidor = $1"
-                        config = db_manager.execute_one_sync(config_query, server_id)
+                        config = await guild_settings.get(server_id)
                         
-                        if not config or not config['canal_log']:
+                        if not config.canal_log:
                             logger.warning(f"📝 Nenhum canal de log configurado para servidor {server_id}")
                             return
                         
-                        log_channel_id = int(config['canal_log'])
+                        log_channel_id = int(config.canal_log)
                         logger.info(f"📝 Canal de log: {log_channel_id}")
                         
                         # Cria embed de log
@@ -793,16 +792,8 @@ class VoteView(ui.View):
                         }
                         
                         # Envia via API direta
-                        headers = {
-                            'Authorization': f'Bot {bot_token}',
-                            'Content-Type': 'application/json'
-                        }
-                        
                         message_data = {"embeds": [embed_data]}
-                        response = requests.post(
-                            f'https://discord.com/api/v10/channels/{log_channel_id}/messages',
-                            headers=headers, json=message_data, timeout=10
-                        )
+                        response = await discord_rest.send_message(log_channel_id, message_data)
                         
                         if response.status_code == 200:
                             logger.info(f"✅ Log de falha enviado com sucesso via API direta!")
@@ -823,11 +814,10 @@ class VoteView(ui.View):
                 logger.info(f"📝 Enviando log de erro API via API direta do Discord...")
                 
                 # Busca configuração do canal de log
-                config_query = "SELECT canal_log FROM configuracoes_servidor WHERE id_servidor = $1"
-                config = db_manager.execute_one_sync(config_query, server_id)
+                config = await guild_settings.get(server_id)
                 
-                if config and config['canal_log']:
-                    log_channel_id = int(config['canal_log'])
+                if config.canal_log:
+                    log_channel_id = int(config.canal_log)
                     
                     # Cria embed de log
                     embed_data = {
@@ -845,16 +835,8 @@ class VoteView(ui.View):
                     }
                     
                     # Envia via API direta
-                    headers = {
-                        'Authorization': f'Bot {bot_token}',
-                        'Content-Type': 'application/json'
-                    }
-                    
                     message_data = {"embeds": [embed_data]}
-                    response_log = requests.post(
-                        f'https://discord.com/api/v10/channels/{log_channel_id}/messages',
-                        headers=headers, json=message_data, timeout=10
-                    )
+                    response_log = await discord_rest.send_message(log_channel_id, message_data)
                     
                     if response_log.status_code == 200:
                         logger.info(f"✅ Log de erro API enviado com sucesso!")
@@ -875,11 +857,10 @@ class VoteView(ui.View):
                 logger.info(f"📝 Enviando log de erro geral via API direta do Discord...")
                 
                 # Busca configuração do canal de log
-                config_query = "SELECT canal_log FROM configuracoes_servidor WHERE id_servidor = $1"
-                config = db_manager.execute_one_sync(config_query, server_id)
+                config = await guild_settings.get(server_id)
                 
-                if config and config['canal_log']:
-                    log_channel_id = int(config['canal_log'])
+                if config.canal_log:
+                    log_channel_id = int(config.canal_log)
                     
                     # Cria embed de log
                     embed_data = {
@@ -897,16 +878,8 @@ class VoteView(ui.View):
                     }
                     
                     # Envia via API direta
-                    headers = {
-                        'Authorization': f'Bot {bot_token}',
-                        'Content-Type': 'application/json'
-                    }
-                    
                     message_data = {"embeds": [embed_data]}
-                    response_log = requests.post(
-                        f'https://discord.com/api/v10/channels/{log_channel_id}/messages',
-                        headers=headers, json=message_data, timeout=10
-                    )
+                    response_log = await discord_rest.send_message(log_channel_id, message_data)
                     
                     if response_log.status_code == 200:
                         logger.info(f"✅ Log de erro geral enviado com sucesso!")
@@ -920,43 +893,19 @@ class VoteView(ui.View):
             return False
     
     async def _schedule_unban(self, server_id: int, member_id: int, duration_seconds: int):
-        """Agenda unban automático após o tempo especificado"""
-        try:
-            import asyncio
-            from datetime import datetime, timedelta
-            
-            logger.info(f"⏰ Agendando unban automático para {member_id} em {duration_seconds} segundos")
-            
-            # Aguarda o tempo especificado
-            await asyncio.sleep(duration_seconds)
-            
-            # Executa o unban
-            import requests
-            import os
-            
-            bot_token = os.getenv('DISCORD_TOKEN')
-            if not bot_token:
-                logger.error("DISCORD_TOKEN não configurado para unban")
-                return
-            
-            headers = {
-                'Authorization': f'Bot {bot_token}',
-                'Content-Type': 'application/json'
-            }
-            
-            # Remove o ban
-            unban_response = requests.delete(
-                f'https://discord.com/api/v10/guilds/{server_id}/bans/{member_id}',
-                headers=headers
-            )
-            
-            if unban_response.status_code == 204:
-                logger.info(f"✅ Unban automático executado para {member_id}")
-            else:
-                logger.warning(f"⚠️ Erro no unban automático: {unban_response.status_code}")
-                
-        except Exception as e:
-            logger.error(f"❌ Erro no unban automático: {e}")
+        """Agenda unban automático como job persistente (sobrevive a reinícios do bot)"""
+        executar_em = datetime.utcnow() + timedelta(seconds=duration_seconds)
+        job_id = await job_scheduler.enqueue(
+            'unban',
+            {'server_id': server_id, 'member_id': member_id},
+            executar_em,
+            chave_unica=f"unban:{server_id}:{member_id}"
+        )
+        
+        if job_id:
+            logger.info(f"⏰ Unban automático de {member_id} agendado para {executar_em:%d/%m/%Y %H:%M} UTC (job {job_id})")
+        else:
+            logger.warning(f"⚠️ Não foi possível agendar unban automático para {member_id}")
     
     async def _send_punishment_log(self, guild: discord.Guild, member: discord.Member, result: Dict, action: str):
         """Envia log da punição para o canal configurado"""
@@ -964,20 +913,16 @@ class VoteView(ui.View):
             logger.info(f"📝 Iniciando envio de log para servidor {guild.id} - Ação: {action}")
             
             # Buscar canal de log configurado
-            config_query = """
-                SELECT canal_log FROM configuracoes_servidor 
-                WHERE id_servidor = $1
-            """
-            config = db_manager.execute_one_sync(config_query, guild.id)
+            config = await guild_settings.get(guild.id)
             
-            if not config or not config['canal_log']:
+            if not config.canal_log:
                 logger.warning(f"📝 Nenhum canal de log configurado para servidor {guild.id}")
                 return
             
-            logger.info(f"📝 Canal de log encontrado: {config['canal_log']}")
+            logger.info(f"📝 Canal de log encontrado: {config.canal_log}")
             
             # Buscar o canal
-            log_channel_id = int(config['canal_log'])
+            log_channel_id = int(config.canal_log)
             log_channel = guild.get_channel(log_channel_id)
             
             if not log_channel:
@@ -1023,28 +968,24 @@ class VoteView(ui.View):
             import traceback
             logger.error(f"❌ Traceback: {traceback.format_exc()}")
     
-    async def _distribute_experience(self):
-        """Distribui experiência para os guardiões que votaram"""
+    async def _distribute_experience(self, votes: List[Dict]):
+        """Distribui experiência para os guardiões que votaram (uma única query)"""
         try:
-            # Busca os guardiões que votaram
-            guardians_query = """
-                SELECT id_guardiao, voto FROM votos_guardioes 
-                WHERE id_denuncia = (SELECT id FROM denuncias WHERE hash_denuncia = $1)
-            """
-            guardians = db_manager.execute_query_sync(guardians_query, self.hash_denuncia)
+            if not votes:
+                return
             
-            for guardian in guardians:
-                xp_reward = calculate_experience_reward(guardian['voto'])
-                
-                # Adiciona experiência
-                update_query = """
-                    UPDATE usuarios 
-                    SET experiencia = experiencia + $1 
-                    WHERE id_discord = $2
-                """
-                db_manager.execute_command_sync(update_query, xp_reward, guardian['id_guardiao'])
+            guardian_ids = [vote['id_guardiao'] for vote in votes]
+            xp_rewards = [calculate_experience_reward(vote['voto']) for vote in votes]
             
-            logger.info(f"Experiência distribuída para {len(guardians)} guardiões")
+            update_query = """
+                UPDATE usuarios u
+                SET experiencia = u.experiencia + x.xp
+                FROM unnest($1::bigint[], $2::int[]) AS x(id_discord, xp)
+                WHERE u.id_discord = x.id_discord
+            """
+            await db_manager.execute_command(update_query, guardian_ids, xp_rewards)
+            
+            logger.info(f"Experiência distribuída para {len(votes)} guardiões")
             
         except Exception as e:
             logger.error(f"Erro ao distribuir experiência: {e}")
@@ -1057,7 +998,7 @@ class VoteView(ui.View):
                 SELECT id_denunciado FROM denuncias 
                 WHERE hash_denuncia = $1
             """
-            denuncia = db_manager.execute_one_sync(denuncia_query, self.hash_denuncia)
+            denuncia = await db_manager.execute_one(denuncia_query, self.hash_denuncia)
             
             if not denuncia:
                 return
@@ -1104,7 +1045,11 @@ class AppealView(ui.View):
         try:
             # Altera o status da denúncia para "Apelada"
             query = "UPDATE denuncias SET status = 'Apelada' WHERE hash_denuncia = $1"
-            db_manager.execute_command_sync(query, self.hash_denuncia)
+            await db_manager.execute_command(query, self.hash_denuncia)
+            
+            moderacao_cog = interaction.client.get_cog('ModeracaoCog')
+            if moderacao_cog:
+                moderacao_cog.request_distribution("apelação")
             
             embed = discord.Embed(
                 title="⚖️ Apelação Registrada",
@@ -1135,12 +1080,93 @@ class ModeracaoCog(commands.Cog):
         self.temp_message_cache = {}  # {denuncia_id: {guardiao_id: timestamp}}
         # Cache para rastrear mensagens enviadas e seus IDs para timeout
         self.temp_message_tracking = {}  # {denuncia_id: {guardiao_id: {'message_id': int, 'timestamp': datetime, 'user_id': int}}}
+        # Fila de eventos que acordam o distribuidor (report, apelação, expiração)
+        self.distribution_queue = asyncio.Queue(maxsize=1000)
+        self._distribution_lock = asyncio.Lock()
+        self._distribution_task = None
+        # Prazos das mensagens enviadas aos Guardiões (id da linha ou chave do cache temporário)
+        self.message_deadlines = DeadlineScheduler("mensagens_guardioes", self._expire_guardian_messages)
+        # Jobs persistentes executados pelo agendador (cogs/agendador.py)
+        job_scheduler.register('unban', self._run_unban_job)
+        job_scheduler.register('penalidade_inatividade', self._run_inactivity_job)
+        # Denúncias criadas por outras instâncias também acordam o distribuidor
+        event_bus.subscribe(DENUNCIA_CRIADA, self._on_report_created)
         self.distribution_loop.start()
+        self.availability_reconcile.start()
         self.timeout_check.start()
         self.inactivity_check.start()
     
-    async def _should_include_moderators(self, denuncia: dict) -> dict:
-        """Verifica se deve incluir moderadores na distribuição"""
+    async def cog_load(self):
+        """Inicia o distribuidor orientado a eventos e o agendador de prazos"""
+        self._distribution_task = asyncio.create_task(self._distribution_worker())
+        self.message_deadlines.start()
+        # Cog recarregado com o bot já conectado: o buffer começa a valer agora
+        if MESSAGE_BUFFER_ENABLED and self.bot.is_ready():
+            message_buffer.start_listening()
+    
+    async def cog_unload(self):
+        """Para os loops e o distribuidor ao descarregar o cog"""
+        self.distribution_loop.cancel()
+        self.availability_reconcile.cancel()
+        self.timeout_check.cancel()
+        self.inactivity_check.cancel()
+        if self._distribution_task:
+            self._distribution_task.cancel()
+        self.message_deadlines.stop()
+        job_scheduler.unregister('unban')
+        job_scheduler.unregister('penalidade_inatividade')
+        event_bus.unsubscribe(DENUNCIA_CRIADA, self._on_report_created)
+    
+    def _on_report_created(self, event):
+        """Evento de denúncia criada em outro processo"""
+        if not event.local:
+            self.request_distribution("evento")
+    
+    # ==================== BUFFER DE MENSAGENS ====================
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Nova sessão do gateway: mensagens anteriores podem ter sido perdidas"""
+        if MESSAGE_BUFFER_ENABLED:
+            message_buffer.start_listening()
+    
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Guarda as mensagens de servidor no buffer usado pela captura de evidências"""
+        if MESSAGE_BUFFER_ENABLED and message.guild is not None:
+            message_buffer.record(message.channel.id, BufferedMessage.from_message(message))
+    
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        """Mantém o conteúdo das mensagens editadas atualizado no buffer"""
+        if MESSAGE_BUFFER_ENABLED and 'content' in payload.data:
+            message_buffer.record_edit(payload.channel_id, payload.message_id, payload.data['content'])
+    
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        """Remove do buffer as mensagens apagadas"""
+        if MESSAGE_BUFFER_ENABLED:
+            message_buffer.record_delete(payload.channel_id, payload.message_id)
+    
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        """Remove do buffer as mensagens apagadas em massa"""
+        if MESSAGE_BUFFER_ENABLED:
+            for message_id in payload.message_ids:
+                message_buffer.record_delete(payload.channel_id, message_id)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        """Descarta o buffer de canais apagados"""
+        message_buffer.drop_channel(channel.id)
+    
+    async def _should_include_moderators(self, denuncia: dict, guardians_count: Optional[int] = None) -> dict:
+        """
+        Verifica se deve incluir moderadores na distribuição
+        
+        Args:
+            denuncia: Dados da denúncia
+            guardians_count: Guardiões em serviço, se já conhecido (evita nova query)
+        """
         try:
             # Verifica se a denúncia está pendente há mais de 15 minutos
             current_time = datetime.utcnow()
@@ -1161,9 +1187,10 @@ class ModeracaoCog(commands.Cog):
             
             # Denúncia premium sem guardiões suficientes
             if denuncia.get('e_premium', False):
-                guardians_count = db_manager.execute_scalar_sync(
-                    "SELECT COUNT(*) FROM usuarios WHERE em_servico = TRUE AND categoria = 'Guardião'"
-                )
+                if guardians_count is None:
+                    guardians_count = await db_manager.execute_scalar(
+                        "SELECT COUNT(*) FROM usuarios WHERE em_servico = TRUE AND categoria = 'Guardião'"
+                    )
                 if guardians_count < 2:  # Menos de 2 guardiões disponíveis
                     return {
                         'include': True,
@@ -1176,34 +1203,6 @@ class ModeracaoCog(commands.Cog):
             logger.error(f"Erro ao verificar se deve incluir moderadores: {e}")
             return {'include': False, 'reason': 'Erro na verificação'}
     
-    async def _get_available_moderators(self, denuncia_id: int, limit: int) -> list:
-        """Busca moderadores disponíveis para a denúncia"""
-        try:
-            moderators_query = """
-                SELECT id_discord, categoria FROM usuarios 
-                WHERE em_servico = TRUE 
-                AND categoria = 'Moderador'
-                AND (cooldown_dispensa IS NULL OR cooldown_dispensa <= NOW())
-                AND (cooldown_inativo IS NULL OR cooldown_inativo <= NOW())
-                AND id_discord NOT IN (
-                    SELECT id_guardiao FROM votos_guardioes 
-                    WHERE id_denuncia = $1
-                )
-                AND id_discord NOT IN (
-                    SELECT id_guardiao FROM mensagens_guardioes 
-                    WHERE id_denuncia = $1 AND status = 'Enviada' AND timeout_expira > NOW()
-                )
-                ORDER BY RANDOM()
-                LIMIT $2
-            """
-            moderators = db_manager.execute_query_sync(moderators_query, denuncia_id, limit)
-            logger.info(f"Encontrados {len(moderators)} moderadores disponíveis para denúncia {denuncia_id}")
-            return moderators
-            
-        except Exception as e:
-            logger.error(f"Erro ao buscar moderadores disponíveis: {e}")
-            return []
-
     async def _check_denuncias_limits(self, server_id: int, is_premium: bool) -> dict:
         """Verifica se o servidor pode criar mais denúncias baseado nos limites do plano"""
         try:
@@ -1223,7 +1222,7 @@ class ModeracaoCog(commands.Cog):
                 FROM denuncias 
                 WHERE id_servidor = $1 AND status IN ('Pendente', 'Em Análise')
             """
-            counts = db_manager.execute_one_sync(count_query, server_id)
+            counts = await db_manager.execute_one(count_query, server_id)
             
             if not counts:
                 return {'allowed': True, 'message': ''}
@@ -1270,7 +1269,7 @@ class ModeracaoCog(commands.Cog):
         try:
             # Verifica se o banco de dados está disponível
             if not db_manager.pool:
-                db_manager.initialize_pool()
+                await db_manager.initialize_pool()
             
             # Verifica se o usuário está cadastrado
             user_data = await get_user_by_discord_id(interaction.user.id)
@@ -1298,11 +1297,7 @@ class ModeracaoCog(commands.Cog):
             hash_denuncia = hashlib.sha256(hash_input.encode()).hexdigest()[:16]
             
             # Verifica se o servidor é premium
-            premium_query = """
-                SELECT id_servidor FROM servidores_premium 
-                WHERE id_servidor = $1 AND data_fim > NOW()
-            """
-            is_premium = db_manager.execute_scalar_sync(premium_query, interaction.guild.id) is not None
+            is_premium = (await guild_settings.get(interaction.guild.id)).is_premium
             
             # Verifica limites de denúncias baseado no plano
             limits_check = await self._check_denuncias_limits(interaction.guild.id, is_premium)
@@ -1332,7 +1327,7 @@ class ModeracaoCog(commands.Cog):
                 ) VALUES ($1, $2, $3, $4, $5, $6, $7)
                 RETURNING id
             """
-            denuncia_id = db_manager.execute_scalar_sync(
+            denuncia_id = await db_manager.execute_scalar(
                 denuncia_query, hash_denuncia, interaction.guild.id, interaction.channel.id,
                 interaction.user.id, usuario.id, motivo, is_premium
             )
@@ -1346,14 +1341,24 @@ class ModeracaoCog(commands.Cog):
             await interaction.response.send_message(embed=embed_loading, ephemeral=True)
             
             # Captura mensagens do histórico
-            await self._capture_messages(interaction, usuario, denuncia_id)
+            await self._capture_messages(interaction, usuario, denuncia_id, hash_denuncia)
+            
+            # Acorda o distribuidor sem esperar a varredura periódica
+            self.request_distribution("report")
+            await event_bus.publish(
+                DENUNCIA_CRIADA, id_denuncia=denuncia_id, hash_denuncia=hash_denuncia,
+                id_servidor=interaction.guild.id
+            )
             
             # Conta guardiões em serviço
             guardians_query = """
                 SELECT COUNT(*) FROM usuarios 
                 WHERE em_servico = TRUE AND categoria = 'Guardião'
             """
-            guardians_count = db_manager.execute_scalar_sync(guardians_query)
+            if availability_index.loaded:
+                guardians_count = availability_index.count_on_duty('Guardião')
+            else:
+                guardians_count = await db_manager.execute_scalar(guardians_query)
             
             # Resposta de confirmação final
             embed = discord.Embed(
@@ -1402,282 +1407,427 @@ class ModeracaoCog(commands.Cog):
             except:
                 await interaction.followup.send(embed=embed, ephemeral=True)
     
-    async def _capture_messages(self, interaction: discord.Interaction, target_user: discord.Member, denuncia_id: int):
-        """Captura mensagens do histórico do canal"""
+    async def _capture_messages(self, interaction: discord.Interaction, target_user: discord.Member,
+                                denuncia_id: int, hash_denuncia: str):
+        """
+        Captura mensagens do histórico do canal
+        
+        As mensagens vêm do buffer em memória do canal (on_message); a API de
+        histórico só é consultada quando o buffer não cobre a janela de 24h.
+        Todos os registros são gravados com um único COPY e os campos
+        anonimizados do embed de análise já ficam no cache de evidências.
+        """
         try:
-            messages_captured = 0
-            
             # Busca mensagens das últimas 24 horas
             now_utc = datetime.now(timezone.utc)
             cutoff_time = now_utc - timedelta(hours=24)
             
-            # Coleta mensagens
-            messages = []
-            async for message in interaction.channel.history(limit=100, after=cutoff_time):
-                messages.append(message)
+            messages = None
+            if MESSAGE_BUFFER_ENABLED:
+                messages = message_buffer.snapshot(interaction.channel.id, cutoff_time, 100)
+            source = "buffer"
+            if messages is None:
+                source = "histórico"
+                messages = [
+                    BufferedMessage.from_message(message)
+                    async for message in interaction.channel.history(limit=100, after=cutoff_time)
+                ]
+            
+            records = [
+                (
+                    denuncia_id,
+                    message.author_id,
+                    message.content,
+                    ",".join(anexo['url'] for anexo in message.attachments),
+                    json.dumps(list(message.attachments)),
+                    message.created_at.replace(tzinfo=None)
+                )
+                for message in messages
+            ]
             
             # Ordena do mais recente ao mais antigo
-            messages.reverse()
+            records.reverse()
             
-            # Processa as mensagens encontradas
-            for message in messages:
-                # Prepara URLs dos anexos
-                attachment_urls = [attachment.url for attachment in message.attachments]
-                
-                # Insere a mensagem no banco
-                mensagem_query = """
-                    INSERT INTO mensagens_capturadas (
-                        id_denuncia, id_autor, conteudo, anexos_urls, timestamp_mensagem
-                    ) VALUES ($1, $2, $3, $4, $5)
-                """
-                db_manager.execute_command_sync(
-                    mensagem_query, denuncia_id, message.author.id, 
-                    message.content, ",".join(attachment_urls), message.created_at.replace(tzinfo=None)
+            started = time.perf_counter()
+            try:
+                captured = await db_manager.copy_records(
+                    'mensagens_capturadas',
+                    ['id_denuncia', 'id_autor', 'conteudo', 'anexos_urls', 'anexos', 'timestamp_mensagem'],
+                    records
                 )
-                
-                messages_captured += 1
+            except Exception as e:
+                # Banco sem a coluna anexos: grava só as URLs
+                logger.warning(f"COPY com anexos estruturados falhou ({e}). Execute a migração: database/migrate_anexos_estruturados.sql")
+                captured = await db_manager.copy_records(
+                    'mensagens_capturadas',
+                    ['id_denuncia', 'id_autor', 'conteudo', 'anexos_urls', 'timestamp_mensagem'],
+                    [record[:4] + record[5:] for record in records]
+                )
+            db_ms = (time.perf_counter() - started) * 1000
             
-            logger.info(f"Capturadas {messages_captured} mensagens para denúncia {denuncia_id}")
+            # Renderiza uma vez as evidências que cada Guardião verá ao atender
+            evidence_cache.put(hash_denuncia, render_evidence(
+                [
+                    {'id_autor': record[1], 'conteudo': record[2], 'timestamp_mensagem': record[5]}
+                    for record in records
+                ],
+                target_user.id
+            ))
+            
+            logger.info(f"Capturadas {captured} mensagens para denúncia {denuncia_id} via {source} ({db_ms:.1f} ms de banco)")
             
         except Exception as e:
             logger.error(f"Erro ao capturar mensagens: {e}")
     
-    @tasks.loop(seconds=30)
-    async def distribution_loop(self):
-        """Loop que distribui denúncias para Guardiões em serviço"""
+    def request_distribution(self, reason: str):
+        """
+        Acorda o distribuidor imediatamente
+        
+        Chamado por /report, apelações, dispensas e expiração de mensagens para
+        que a denúncia chegue aos Guardiões sem esperar a varredura periódica.
+        """
         try:
-            if not db_manager.pool:
-                return
+            self.distribution_queue.put_nowait((reason, time.monotonic()))
+        except asyncio.QueueFull:
+            pass  # Já há pedidos pendentes; a próxima rodada drena todo o backlog
+    
+    async def _distribution_worker(self):
+        """Consome a fila de distribuição e dispara uma rodada por lote de pedidos"""
+        await self.bot.wait_until_ready()
+        
+        while True:
+            reason, requested_at = await self.distribution_queue.get()
             
-            # Verifica quantos guardiões estão em serviço
-            guardians_count_query = "SELECT COUNT(*) FROM usuarios WHERE em_servico = TRUE AND categoria = 'Guardião'"
-            total_guardians = db_manager.execute_scalar_sync(guardians_count_query)
-            logger.debug(f"Total de guardiões em serviço: {total_guardians}")
+            # Agrupa pedidos que chegaram juntos em uma única rodada
+            reasons = {reason}
+            while not self.distribution_queue.empty():
+                reasons.add(self.distribution_queue.get_nowait()[0])
             
-            if total_guardians == 0:
-                logger.warning("Nenhum guardião está em serviço!")
-                # Se não há guardiões, verifica se há moderadores em serviço
-                moderators_count_query = "SELECT COUNT(*) FROM usuarios WHERE em_servico = TRUE AND categoria = 'Moderador'"
-                total_moderators = db_manager.execute_scalar_sync(moderators_count_query)
-                logger.info(f"Total de moderadores em serviço: {total_moderators}")
-                
-                if total_moderators == 0:
-                    logger.warning("Nenhum guardião ou moderador está em serviço!")
-                    return
-                else:
-                    logger.info("Nenhum guardião em serviço, mas há moderadores disponíveis. Continuando distribuição...")
+            try:
+                distributed = await self._run_distribution()
+                elapsed_ms = (time.monotonic() - requested_at) * 1000
+                if distributed:
+                    logger.info(f"⚡ Distribuição imediata ({', '.join(sorted(reasons))}): "
+                               f"{distributed} denúncia(s) em {elapsed_ms:.0f} ms")
+            except Exception as e:
+                logger.error(f"Erro no distribuidor de denúncias: {e}")
+    
+    async def _run_distribution(self) -> int:
+        """
+        Executa uma rodada de distribuição em lote
+        
+        Returns:
+            Quantidade de denúncias enviadas para ao menos um Guardião
+        """
+        async with self._distribution_lock:
+            return await self._distribute_batch()
+    
+    @tasks.loop(seconds=DISTRIBUTION_SWEEP_SECONDS)
+    async def distribution_loop(self):
+        """Varredura periódica de segurança (a distribuição normal é disparada por eventos)"""
+        await self._run_distribution()
+    
+    async def _distribute_batch(self) -> int:
+        """
+        Distribui todo o backlog distribuível em uma única rodada
+        
+        Carrega denúncias, Guardiões/Moderadores em serviço e os pares já
+        atendidos em poucas queries, calcula a atribuição em memória e grava
+        todas as mensagens enviadas em um único INSERT.
+        
+        Returns:
+            Quantidade de denúncias enviadas para ao menos um Guardião
+        """
+        try:
+            if not db_manager.pool:
+                return 0
             
-            # Verifica se a tabela mensagens_guardioes existe
-            table_exists_query = """
+            table_exists = await db_manager.execute_scalar("""
                 SELECT EXISTS (
                     SELECT FROM information_schema.tables 
                     WHERE table_schema = 'public' 
                     AND table_name = 'mensagens_guardioes'
                 )
-            """
-            table_exists = db_manager.execute_scalar_sync(table_exists_query)
-            
-            if table_exists:
-                # Versão completa com rastreamento de mensagens
-                denuncias_query = """
-                    SELECT d.*, 
-                           COALESCE(v.votos_count, 0) as votos_atuais,
-                           COALESCE(m.mensagens_ativas, 0) as mensagens_ativas
-                    FROM denuncias d
-                    LEFT JOIN (
-                        SELECT id_denuncia, COUNT(*) as votos_count 
-                        FROM votos_guardioes 
-                        GROUP BY id_denuncia
-                    ) v ON d.id = v.id_denuncia
-                    LEFT JOIN (
-                        SELECT id_denuncia, COUNT(*) as mensagens_ativas 
-                        FROM mensagens_guardioes 
-                        WHERE status = 'Enviada' AND timeout_expira > NOW()
-                        GROUP BY id_denuncia
-                    ) m ON d.id = m.id_denuncia
-                    WHERE d.status IN ('Pendente', 'Em Análise', 'Apelada')
-                      AND COALESCE(v.votos_count, 0) < $1
-                      AND COALESCE(m.mensagens_ativas, 0) < $2
-                    ORDER BY d.e_premium DESC, d.data_criacao ASC
-                    LIMIT 1
-                """
-                denuncia = db_manager.execute_one_sync(
-                    denuncias_query, REQUIRED_VOTES_FOR_DECISION, MAX_GUARDIANS_PER_REPORT
-                )
-            else:
-                # Versão simplificada sem rastreamento de mensagens
+            """)
+            if not table_exists:
                 logger.warning("Tabela mensagens_guardioes não existe. Execute a migração: database/migrate_add_mensagens_guardioes.sql")
-                denuncias_query = """
-                    SELECT d.*, COALESCE(v.votos_count, 0) as votos_atuais
-                    FROM denuncias d
-                    LEFT JOIN (
-                        SELECT id_denuncia, COUNT(*) as votos_count 
-                        FROM votos_guardioes 
-                        GROUP BY id_denuncia
-                    ) v ON d.id = v.id_denuncia
-                    WHERE d.status IN ('Pendente', 'Em Análise', 'Apelada')
-                      AND COALESCE(v.votos_count, 0) < $1
-                    ORDER BY d.e_premium DESC, d.data_criacao ASC
-                    LIMIT 1
-                """
-                denuncia = db_manager.execute_one_sync(denuncias_query, REQUIRED_VOTES_FOR_DECISION)
-                if denuncia:
-                    denuncia['mensagens_ativas'] = 0  # Assume 0 mensagens ativas
             
-            if not denuncia:
+            denuncias = await self._load_distributable_reports(table_exists)
+            if not denuncias:
                 logger.debug("Nenhuma denúncia encontrada para distribuição")
-                return
+                return 0
             
-            # Calcula quantos guardiões ainda precisamos
-            votos_necessarios = REQUIRED_VOTES_FOR_DECISION - denuncia['votos_atuais']
-            mensagens_necessarias = min(votos_necessarios, MAX_GUARDIANS_PER_REPORT - denuncia['mensagens_ativas'])
+            # Quem está em serviço vem do índice em memória (reconciliado periodicamente)
+            if not availability_index.loaded:
+                await availability_index.reconcile()
             
-            logger.info(f"Denúncia {denuncia['hash_denuncia']}: {denuncia['votos_atuais']}/{REQUIRED_VOTES_FOR_DECISION} votos, "
-                       f"{denuncia['mensagens_ativas']} mensagens ativas, precisa de {mensagens_necessarias} guardiões")
+            total_guardians = availability_index.count_on_duty('Guardião')
+            if total_guardians == 0 and availability_index.count_on_duty('Moderador') == 0:
+                logger.warning("Nenhum guardião ou moderador está em serviço!")
+                return 0
             
-            if mensagens_necessarias <= 0:
-                logger.debug(f"Denúncia {denuncia['hash_denuncia']} não precisa de mais guardiões")
-                return
+            guardians = availability_index.available('Guardião')
+            moderators = availability_index.available('Moderador')
             
-            # Busca guardiões disponíveis (prioridade para guardiões)
-            if table_exists:
-                guardians_query = """
-                    SELECT id_discord, categoria FROM usuarios 
-                    WHERE em_servico = TRUE 
-                    AND categoria = 'Guardião'
-                    AND (cooldown_dispensa IS NULL OR cooldown_dispensa <= NOW())
-                    AND (cooldown_inativo IS NULL OR cooldown_inativo <= NOW())
-                    AND id_discord NOT IN (
-                        SELECT id_guardiao FROM votos_guardioes 
-                        WHERE id_denuncia = $1
-                    )
-                    AND id_discord NOT IN (
-                        SELECT id_guardiao FROM mensagens_guardioes 
-                        WHERE id_denuncia = $1 AND status = 'Enviada' AND timeout_expira > NOW()
-                    )
-                    ORDER BY RANDOM()
-                    LIMIT $2
-                """
-                guardians = db_manager.execute_query_sync(guardians_query, denuncia['id'], mensagens_necessarias)
-                
-                # Se não há guardiões suficientes, verifica se deve incluir moderadores
-                if len(guardians) < mensagens_necessarias:
-                    should_include_moderators = await self._should_include_moderators(denuncia)
-                    if should_include_moderators['include']:
-                        logger.info(f"Incluindo moderadores para denúncia {denuncia['hash_denuncia']} - {should_include_moderators['reason']}")
-                        moderators = await self._get_available_moderators(denuncia['id'], mensagens_necessarias - len(guardians))
-                        guardians.extend(moderators)
-                
-                # NOVA FUNCIONALIDADE: Se não há guardiões em serviço, busca apenas moderadores
-                if total_guardians == 0 and len(guardians) == 0:
-                    logger.info("Nenhum guardião em serviço, buscando apenas moderadores...")
-                    moderators_query = """
-                        SELECT id_discord, categoria FROM usuarios 
-                        WHERE em_servico = TRUE 
-                        AND categoria = 'Moderador'
-                        AND (cooldown_dispensa IS NULL OR cooldown_dispensa <= NOW())
-                        AND (cooldown_inativo IS NULL OR cooldown_inativo <= NOW())
-                        AND id_discord NOT IN (
-                            SELECT id_guardiao FROM votos_guardioes 
-                            WHERE id_denuncia = $1
-                        )
-                        AND id_discord NOT IN (
-                            SELECT id_guardiao FROM mensagens_guardioes 
-                            WHERE id_denuncia = $1 AND status = 'Enviada' AND timeout_expira > NOW()
-                        )
-                        ORDER BY RANDOM()
-                        LIMIT $2
-                    """
-                    guardians = db_manager.execute_query_sync(moderators_query, denuncia['id'], mensagens_necessarias)
-                    logger.info(f"Encontrados {len(guardians)} moderadores para denúncia {denuncia['hash_denuncia']}")
-            else:
-                # Versão simplificada usando cache temporário para evitar spam
-                if total_guardians == 0:
-                    # Se não há guardiões, busca apenas moderadores
-                    logger.info("Nenhum guardião em serviço, buscando apenas moderadores (versão simplificada)...")
-                    guardians_query = """
-                    SELECT id_discord FROM usuarios 
-                    WHERE em_servico = TRUE 
-                    AND categoria = 'Moderador'
-                    AND (cooldown_dispensa IS NULL OR cooldown_dispensa <= NOW())
-                    AND (cooldown_inativo IS NULL OR cooldown_inativo <= NOW())
-                    AND id_discord NOT IN (
-                        SELECT id_guardiao FROM votos_guardioes 
-                        WHERE id_denuncia = $1
-                    )
-                    ORDER BY RANDOM()
-                    LIMIT $2
-                """
-                else:
-                    # Busca guardiões normalmente
-                    guardians_query = """
-                    SELECT id_discord FROM usuarios 
-                    WHERE em_servico = TRUE 
-                    AND categoria = 'Guardião'
-                    AND (cooldown_dispensa IS NULL OR cooldown_dispensa <= NOW())
-                    AND (cooldown_inativo IS NULL OR cooldown_inativo <= NOW())
-                    AND id_discord NOT IN (
-                        SELECT id_guardiao FROM votos_guardioes 
-                        WHERE id_denuncia = $1
-                    )
-                    ORDER BY RANDOM()
-                    LIMIT $2
-                """
-                all_guardians = db_manager.execute_query_sync(guardians_query, denuncia['id'], MAX_GUARDIANS_PER_REPORT)
-                
-                # Filtra guardiões que NÃO têm mensagens ativas (não reenvia para o mesmo guardião)
-                guardians = []
-                current_time = datetime.utcnow()
-                denuncia_tracking = self.temp_message_tracking.get(denuncia['id'], {})
-                
-                for guardian_data in all_guardians:
-                    guardian_id = guardian_data['id_discord']
-                    
-                    # Verifica se o guardião tem mensagem ativa (não expirada)
-                    has_active_message = False
-                    if guardian_id in denuncia_tracking:
-                        msg_data = denuncia_tracking[guardian_id]
-                        time_diff = (current_time - msg_data['timestamp']).total_seconds()
-                        if time_diff <= 300:  # Mensagem ainda ativa (menos de 5 minutos)
-                            has_active_message = True
-                    
-                    # Só adiciona se NÃO tem mensagem ativa
-                    if not has_active_message:
-                        guardians.append(guardian_data)
-                        logger.debug(f"Guardião {guardian_id} disponível para denúncia {denuncia['hash_denuncia']}")
-                    else:
-                        logger.debug(f"Guardião {guardian_id} já tem mensagem ativa para denúncia {denuncia['hash_denuncia']}")
-                    
-                    if len(guardians) >= mensagens_necessarias:
-                        break
+            if total_guardians == 0:
+                logger.info("Nenhum guardião em serviço, mas há moderadores disponíveis. Continuando distribuição...")
+            
+            excluded = {denuncia['id']: availability_index.excluded_for(denuncia['id']) for denuncia in denuncias}
+            assignments = await self._compute_assignments(
+                denuncias, guardians, moderators, total_guardians, excluded
+            )
             
-            logger.info(f"Encontrados {len(guardians) if guardians else 0} guardiões disponíveis para denúncia {denuncia['hash_denuncia']}")
+            if not assignments:
+                logger.debug(f"Nenhum guardião disponível para {len(denuncias)} denúncias pendentes")
+                return 0
             
-            if not guardians:
-                logger.warning(f"Nenhum guardião disponível para denúncia {denuncia['hash_denuncia']}")
-                return
+            # Muda o status para "Em Análise" de todas as denúncias pendentes atribuídas
+            pendentes = [denuncia['id'] for denuncia, _ in assignments if denuncia['status'] == 'Pendente']
+            if pendentes:
+                await db_manager.execute_command(
+                    "UPDATE denuncias SET status = 'Em Análise' WHERE id = ANY($1::int[]) AND status = 'Pendente'",
+                    pendentes
+                )
             
-            # Muda o status para "Em Análise" se ainda estiver pendente
-            if denuncia['status'] == 'Pendente':
-                update_query = "UPDATE denuncias SET status = 'Em Análise' WHERE id = $1"
-                db_manager.execute_command_sync(update_query, denuncia['id'])
-                logger.info(f"Status da denúncia {denuncia['hash_denuncia']} alterado para 'Em Análise'")
+            # Envia as DMs em paralelo e registra todas as mensagens de uma vez
+            deliveries = [
+                (denuncia, guardian_id)
+                for denuncia, guardian_ids in assignments
+                for guardian_id in guardian_ids
+            ]
+            sent = await self._fan_out(deliveries)
             
-            # Envia para cada guardião
-            for guardian_data in guardians:
-                await self._send_to_guardian(guardian_data['id_discord'], denuncia)
+            await self._record_sent_messages(sent, table_exists)
             
-            logger.info(f"Denúncia {denuncia['hash_denuncia']} enviada para {len(guardians)} guardiões adicionais")
+            logger.info(f"Distribuição em lote: {len(assignments)} denúncias, {len(sent)} mensagens enviadas")
+            return len(assignments)
             
         except Exception as e:
             logger.error(f"Erro no loop de distribuição: {e}")
+            return 0
+    
+    async def _load_distributable_reports(self, table_exists: bool) -> List[Dict]:
+        """Carrega todas as denúncias que ainda precisam de Guardiões (premium primeiro)"""
+        if table_exists:
+            denuncias_query = """
+                SELECT d.*, 
+                       d.votos_count as votos_atuais,
+                       COALESCE(m.mensagens_ativas, 0) as mensagens_ativas
+                FROM denuncias d
+                LEFT JOIN (
+                    SELECT id_denuncia, COUNT(*) as mensagens_ativas 
+                    FROM mensagens_guardioes 
+                    WHERE status = 'Enviada' AND timeout_expira > NOW()
+                    GROUP BY id_denuncia
+                ) m ON d.id = m.id_denuncia
+                WHERE d.status IN ('Pendente', 'Em Análise', 'Apelada')
+                  AND d.votos_count < $1
+                  AND COALESCE(m.mensagens_ativas, 0) < $2
+                ORDER BY d.e_premium DESC, d.data_criacao ASC
+                LIMIT $3
+            """
+            return await db_manager.execute_query(
+                denuncias_query, REQUIRED_VOTES_FOR_DECISION, MAX_GUARDIANS_PER_REPORT, DISTRIBUTION_BATCH_SIZE
+            )
+        
+        # Versão simplificada: mensagens ativas vêm do cache temporário
+        denuncias_query = """
+            SELECT d.*, d.votos_count as votos_atuais
+            FROM denuncias d
+            WHERE d.status IN ('Pendente', 'Em Análise', 'Apelada')
+              AND d.votos_count < $1
+            ORDER BY d.e_premium DESC, d.data_criacao ASC
+            LIMIT $2
+        """
+        denuncias = await db_manager.execute_query(
+            denuncias_query, REQUIRED_VOTES_FOR_DECISION, DISTRIBUTION_BATCH_SIZE
+        )
+        for denuncia in denuncias:
+            denuncia['mensagens_ativas'] = len(self._active_temp_messages(denuncia['id']))
+        return denuncias
     
-    async def _send_to_guardian(self, guardian_id: int, denuncia: Dict):
-        """Envia denúncia para um guardião específico"""
+    def _active_temp_messages(self, denuncia_id: int) -> set:
+        """Guardiões com mensagem ativa (menos de 5 minutos) no cache temporário"""
+        current_time = datetime.utcnow()
+        return {
+            guardian_id
+            for guardian_id, msg_data in self.temp_message_tracking.get(denuncia_id, {}).items()
+            if (current_time - msg_data['timestamp']).total_seconds() <= 300
+        }
+    
+    async def _compute_assignments(self, denuncias: List[Dict], guardians: List[int], moderators: List[int],
+                                   total_guardians: int, excluded: Dict[int, set]) -> List[Tuple[Dict, List[int]]]:
+        """
+        Calcula em memória quem recebe cada denúncia
+        
+        Respeita a ordem premium/antiguidade das denúncias, o limite de
+        MAX_GUARDIANS_PER_REPORT, nunca reenvia para quem já votou ou tem
+        mensagem ativa e só inclui Moderadores nas condições de
+        _should_include_moderators (ou quando não há Guardiões em serviço).
+        A carga é espalhada: quem recebeu menos denúncias nesta rodada é escolhido primeiro.
+        
+        Returns:
+            Lista de tuplas (denúncia, [ids dos destinatários])
+        """
+        assigned_load = defaultdict(int)
+        assignments = []
+        
+        for denuncia in denuncias:
+            votos_necessarios = REQUIRED_VOTES_FOR_DECISION - denuncia['votos_atuais']
+            mensagens_necessarias = min(votos_necessarios, MAX_GUARDIANS_PER_REPORT - denuncia['mensagens_ativas'])
+            
+            if mensagens_necessarias <= 0:
+                continue
+            
+            blocked = excluded.get(denuncia['id'], set())
+            chosen = self._pick_least_loaded(guardians, blocked, mensagens_necessarias, assigned_load)
+            
+            if len(chosen) < mensagens_necessarias and moderators:
+                if total_guardians == 0:
+                    include_moderators = True
+                else:
+                    should_include_moderators = await self._should_include_moderators(denuncia, total_guardians)
+                    include_moderators = should_include_moderators['include']
+                    if include_moderators:
+                        logger.info(f"Incluindo moderadores para denúncia {denuncia['hash_denuncia']} - {should_include_moderators['reason']}")
+                
+                if include_moderators:
+                    chosen += self._pick_least_loaded(
+                        moderators, blocked, mensagens_necessarias - len(chosen), assigned_load
+                    )
+            
+            if not chosen:
+                logger.debug(f"Nenhum guardião disponível para denúncia {denuncia['hash_denuncia']}")
+                continue
+            
+            for member_id in chosen:
+                assigned_load[member_id] += 1
+            assignments.append((denuncia, chosen))
+        
+        return assignments
+    
+    @staticmethod
+    def _pick_least_loaded(candidates: List[int], blocked: set, count: int, load: Dict[int, int]) -> List[int]:
+        """Sorteia `count` candidatos não bloqueados, priorizando os com menor carga na rodada"""
+        available = [member_id for member_id in candidates if member_id not in blocked]
+        random.shuffle(available)
+        available.sort(key=lambda member_id: load[member_id])  # sort estável mantém o sorteio entre empates
+        return available[:count]
+    
+    async def _record_sent_messages(self, sent: List[Tuple[int, int, int]], table_exists: bool):
+        """
+        Registra as mensagens enviadas aos Guardiões
+        
+        Args:
+            sent: Lista de tuplas (id_denuncia, id_guardiao, id_mensagem)
+            table_exists: Se a tabela mensagens_guardioes existe
+        """
+        if not sent:
+            return
+        
+        timeout_time = datetime.utcnow() + timedelta(minutes=VOTE_TIMEOUT_MINUTES)
+        for denuncia_id, guardian_id, _ in sent:
+            availability_index.message_sent(denuncia_id, guardian_id, timeout_time)
+        
+        if table_exists:
+            insert_query = """
+                INSERT INTO mensagens_guardioes (id_denuncia, id_guardiao, id_mensagem, timeout_expira)
+                SELECT id_denuncia, id_guardiao, id_mensagem, $4
+                FROM unnest($1::int[], $2::bigint[], $3::bigint[]) AS t(id_denuncia, id_guardiao, id_mensagem)
+                RETURNING id
+            """
+            rows = await db_manager.execute_query(
+                insert_query,
+                [denuncia_id for denuncia_id, _, _ in sent],
+                [guardian_id for _, guardian_id, _ in sent],
+                [message_id for _, _, message_id in sent],
+                timeout_time
+            )
+            for row in rows:
+                self.message_deadlines.schedule(row['id'], timeout_time)
+            return
+        
+        # Registra no cache temporário para evitar spam e poder deletar depois (timeout de 5 minutos)
+        current_time = datetime.utcnow()
+        for denuncia_id, guardian_id, message_id in sent:
+            self.temp_message_cache.setdefault(denuncia_id, {})[guardian_id] = current_time
+            self.temp_message_tracking.setdefault(denuncia_id, {})[guardian_id] = {
+                'message_id': message_id,
+                'timestamp': current_time,
+                'user_id': guardian_id
+            }
+            self.message_deadlines.schedule(
+                ('temp', denuncia_id, guardian_id), timeout_time, {'message_id': message_id}
+            )
+    
+    async def _fan_out(self, deliveries: List[Tuple[Dict, int]]) -> List[Tuple[int, int, int]]:
+        """
+        Envia as denúncias aos Guardiões concorrentemente
+        
+        A concorrência é limitada por DM_FANOUT_CONCURRENCY; os limites por rota
+        do Discord são respeitados pelo cliente HTTP do discord.py, que enfileira
+        os envios do mesmo bucket.
+        
+        Args:
+            deliveries: Lista de tuplas (denúncia, id_guardiao)
+            
+        Returns:
+            Lista de tuplas (id_denuncia, id_guardiao, id_mensagem) enviadas com sucesso
+        """
+        if not deliveries:
+            return []
+        
+        semaphore = asyncio.Semaphore(DM_FANOUT_CONCURRENCY)
+        
+        async def deliver(denuncia: Dict, guardian_id: int):
+            async with semaphore:
+                started = time.perf_counter()
+                message, error = await self._send_to_guardian(guardian_id, denuncia)
+                latency_ms = (time.perf_counter() - started) * 1000
+                logger.debug(f"DM para guardião {guardian_id} ({denuncia['hash_denuncia']}): "
+                            f"{'ok' if message else error} em {latency_ms:.0f} ms")
+                return denuncia, guardian_id, message, error, latency_ms
+        
+        started = time.perf_counter()
+        results = await asyncio.gather(*(deliver(denuncia, guardian_id) for denuncia, guardian_id in deliveries))
+        total_ms = (time.perf_counter() - started) * 1000
+        
+        sent = []
+        failures = defaultdict(int)
+        latencies = []
+        for denuncia, guardian_id, message, error, latency_ms in results:
+            latencies.append(latency_ms)
+            if message:
+                sent.append((denuncia['id'], guardian_id, message.id))
+                continue
+            
+            failures[error] += 1
+            if error == 'dm_fechada':
+                # Evita reenviar a cada rodada para quem não aceita DMs (só em memória; a reconciliação limpa)
+                availability_index.set_dispense_cooldown(
+                    guardian_id, datetime.utcnow() + timedelta(minutes=DISPENSE_COOLDOWN_MINUTES)
+                )
+        
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        failures_text = ", ".join(f"{reason}: {count}" for reason, count in failures.items()) or "nenhuma"
+        logger.info(f"📨 Fan-out: {len(sent)}/{len(deliveries)} DMs enviadas em {total_ms:.0f} ms | "
+                   f"latência média {sum(latencies) / len(latencies):.0f} ms, p95 {p95:.0f} ms, "
+                   f"máx {latencies[-1]:.0f} ms | falhas: {failures_text}")
+        
+        return sent
+    
+    async def _send_to_guardian(self, guardian_id: int, denuncia: Dict) -> Tuple[Optional[discord.Message], Optional[str]]:
+        """
+        Envia denúncia para um guardião específico
+        
+        Returns:
+            Tupla (mensagem enviada, motivo da falha); o registro é feito em lote por _record_sent_messages
+        """
         try:
             user = self.bot.get_user(guardian_id)
             if not user:
-                return
+                return None, 'usuario_nao_encontrado'
             
             embed = discord.Embed(
                 title="🚨 NOVA OCORRÊNCIA!",
@@ -1703,46 +1853,17 @@ class ModeracaoCog(commands.Cog):
             )
             
             view = ReportView(denuncia['hash_denuncia'])
-            message = await user.send(embed=embed, view=view)
-            
-            # Registra a mensagem enviada (se a tabela existir)
-            table_exists_query = """
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = 'mensagens_guardioes'
-                )
-            """
-            table_exists = db_manager.execute_scalar_sync(table_exists_query)
-            
-            if table_exists:
-                timeout_time = datetime.utcnow() + timedelta(minutes=VOTE_TIMEOUT_MINUTES)
-                insert_query = """
-                    INSERT INTO mensagens_guardioes (
-                        id_denuncia, id_guardiao, id_mensagem, timeout_expira
-                    ) VALUES ($1, $2, $3, $4)
-                """
-                db_manager.execute_command_sync(
-                    insert_query, denuncia['id'], guardian_id, message.id, timeout_time
-                )
-            else:
-                # Registra no cache temporário para evitar spam
-                current_time = datetime.utcnow()
-                if denuncia['id'] not in self.temp_message_cache:
-                    self.temp_message_cache[denuncia['id']] = {}
-                self.temp_message_cache[denuncia['id']][guardian_id] = current_time
-                
-                # Registra também no tracking para poder deletar depois (timeout de 5 minutos)
-                if denuncia['id'] not in self.temp_message_tracking:
-                    self.temp_message_tracking[denuncia['id']] = {}
-                self.temp_message_tracking[denuncia['id']][guardian_id] = {
-                    'message_id': message.id,
-                    'timestamp': current_time,
-                    'user_id': guardian_id
-                }
-            
+            return await user.send(embed=embed, view=view), None
+            
+        except discord.Forbidden:
+            logger.warning(f"Guardião {guardian_id} não aceita DMs")
+            return None, 'dm_fechada'
+        except discord.HTTPException as e:
+            logger.error(f"Erro HTTP ao enviar denúncia para guardião {guardian_id}: {e}")
+            return None, f'http_{e.status}'
         except Exception as e:
             logger.error(f"Erro ao enviar denúncia para guardião {guardian_id}: {e}")
+            return None, 'erro'
     
     async def _process_temp_timeout_messages(self):
         """Processa mensagens que expiraram usando o cache temporário"""
@@ -1772,21 +1893,7 @@ class ModeracaoCog(commands.Cog):
             for msg_data in expired_messages:
                 try:
                     # Tenta deletar a mensagem
-                    user = self.bot.get_user(msg_data['user_id'])
-                    if user:
-                        try:
-                            channel = user.dm_channel
-                            if not channel:
-                                channel = await user.create_dm()
-                            
-                            message = await channel.fetch_message(msg_data['message_id'])
-                            await message.delete()
-                            logger.info(f"Mensagem {msg_data['message_id']} deletada por timeout (guardião {msg_data['guardian_id']})")
-                            
-                        except discord.NotFound:
-                            pass  # Mensagem já foi deletada
-                        except Exception as e:
-                            logger.warning(f"Erro ao deletar mensagem {msg_data['message_id']}: {e}")
+                    await self._delete_guardian_message(msg_data['user_id'], msg_data['message_id'])
                     
                 except Exception as e:
                     logger.error(f"Erro ao processar mensagem expirada: {e}")
@@ -1824,88 +1931,165 @@ class ModeracaoCog(commands.Cog):
                 # para que denúncias sejam redistribuídas imediatamente
                 unique_denuncias = set(msg['denuncia_id'] for msg in expired_messages)
                 logger.info(f"Forçando redistribuição para {len(unique_denuncias)} denúncias após timeout")
+                self.request_distribution("expiração")
                 
         except Exception as e:
             logger.error(f"Erro ao processar timeout de mensagens temporárias: {e}")
     
-    @tasks.loop(minutes=1)
+    async def _delete_guardian_message(self, user_id: int, message_id: int):
+        """Apaga a DM enviada ao Guardião sem buscá-la (mensagem parcial)"""
+        user = self.bot.get_user(user_id)
+        if not user:
+            return
+        
+        try:
+            channel = user.dm_channel or await user.create_dm()
+            await channel.get_partial_message(message_id).delete()
+        except discord.NotFound:
+            pass  # Mensagem já foi deletada
+        except Exception as e:
+            logger.warning(f"Erro ao deletar mensagem {message_id}: {e}")
+    
+    async def _expire_guardian_messages(self, due: List[Tuple]):
+        """
+        Expira as mensagens cujo prazo venceu (chamado pelo agendador no instante exato)
+        
+        Args:
+            due: Lista de (chave, payload); a chave é o id em mensagens_guardioes
+                 ou ('temp', id_denuncia, id_guardiao) para o cache temporário
+        """
+        expired = []
+        
+        row_ids = [key for key, _ in due if isinstance(key, int)]
+        if row_ids:
+            # Só expira o que ainda está 'Enviada' (atendidas/dispensadas/votadas são ignoradas)
+            expire_query = """
+                UPDATE mensagens_guardioes 
+                SET status = 'Expirada' 
+                WHERE id = ANY($1::int[]) AND status = 'Enviada'
+                RETURNING id_denuncia, id_guardiao, id_mensagem
+            """
+            expired.extend(await db_manager.execute_query(expire_query, row_ids))
+        
+        for key, payload in due:
+            if isinstance(key, int):
+                continue
+            _, denuncia_id, guardian_id = key
+            tracking = self.temp_message_tracking.get(denuncia_id, {})
+            msg_data = tracking.get(guardian_id)
+            if not msg_data or msg_data['message_id'] != payload['message_id']:
+                continue  # Já atendida, dispensada ou reenviada
+            tracking.pop(guardian_id, None)
+            if not tracking:
+                self.temp_message_tracking.pop(denuncia_id, None)
+            expired.append({'id_denuncia': denuncia_id, 'id_guardiao': guardian_id, 'id_mensagem': msg_data['message_id']})
+        
+        if not expired:
+            return
+        
+        await asyncio.gather(*(
+            self._delete_guardian_message(row['id_guardiao'], row['id_mensagem']) for row in expired
+        ))
+        
+        for row in expired:
+            availability_index.message_closed(row['id_denuncia'], row['id_guardiao'])
+        
+        logger.info(f"Processadas {len(expired)} mensagens expiradas")
+        self.request_distribution("expiração")
+    
+    async def cancel_report_messages(self, denuncia_id: int) -> int:
+        """
+        Cancela as DMs ainda abertas de uma denúncia já decidida
+        
+        Mensagens 'Enviada' são apagadas; as 'Atendida' (Guardião analisando)
+        ficam na DM, mas deixam de contar para a penalidade de inatividade.
+        
+        Args:
+            denuncia_id: ID da denúncia
+            
+        Returns:
+            Quantidade de mensagens canceladas
+        """
+        try:
+            cancelled = []
+            
+            table_exists = await db_manager.execute_scalar(
+                "SELECT to_regclass('public.mensagens_guardioes') IS NOT NULL"
+            )
+            if table_exists:
+                cancel_query = """
+                    UPDATE mensagens_guardioes mg
+                    SET status = 'Cancelada'
+                    FROM (
+                        SELECT id, status FROM mensagens_guardioes
+                        WHERE id_denuncia = $1 AND status IN ('Enviada', 'Atendida')
+                        FOR UPDATE
+                    ) anterior
+                    WHERE mg.id = anterior.id
+                    RETURNING mg.id, mg.id_guardiao, mg.id_mensagem, anterior.status AS status_anterior
+                """
+                for row in await db_manager.execute_query(cancel_query, denuncia_id):
+                    self.message_deadlines.cancel(row['id'])
+                    cancelled.append(row)
+            
+            # Cache temporário (sem a tabela mensagens_guardioes)
+            self.temp_message_cache.pop(denuncia_id, None)
+            for guardian_id, msg_data in self.temp_message_tracking.pop(denuncia_id, {}).items():
+                self.message_deadlines.cancel(('temp', denuncia_id, guardian_id))
+                cancelled.append({
+                    'id_guardiao': guardian_id,
+                    'id_mensagem': msg_data['message_id'],
+                    'status_anterior': 'Enviada'
+                })
+            
+            if not cancelled:
+                return 0
+            
+            await asyncio.gather(*(
+                self._delete_guardian_message(row['id_guardiao'], row['id_mensagem'])
+                for row in cancelled if row['status_anterior'] == 'Enviada'
+            ))
+            
+            logger.info(f"🧹 {len(cancelled)} mensagens canceladas da denúncia {denuncia_id} (decisão tomada)")
+            return len(cancelled)
+            
+        except Exception as e:
+            logger.error(f"Erro ao cancelar mensagens da denúncia {denuncia_id}: {e}")
+            return 0
+    
+    @tasks.loop(minutes=TIMEOUT_SWEEP_MINUTES)
     async def timeout_check(self):
-        """Verifica mensagens que expiraram e as remove"""
+        """
+        Varredura de segurança dos prazos de mensagens
+        
+        A expiração normal é feita pelo agendador de prazos; aqui apenas
+        (re)carregamos as mensagens 'Enviada' do banco (ex.: após reinício)
+        e limpamos o cache temporário.
+        """
         try:
             if not db_manager.pool:
                 return
             
-            # Verifica se a tabela mensagens_guardioes existe
-            table_exists_query = """
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = 'mensagens_guardioes'
-                )
-            """
-            table_exists = db_manager.execute_scalar_sync(table_exists_query)
+            table_exists = await db_manager.execute_scalar(
+                "SELECT to_regclass('public.mensagens_guardioes') IS NOT NULL"
+            )
             
             if not table_exists:
                 # Processa mensagens expiradas do cache temporário
                 await self._process_temp_timeout_messages()
                 return
             
-            # Busca mensagens expiradas
-            expired_query = """
-                SELECT * FROM mensagens_guardioes 
-                WHERE status = 'Enviada' AND timeout_expira <= NOW()
+            pending_query = """
+                SELECT id, timeout_expira FROM mensagens_guardioes 
+                WHERE status = 'Enviada'
             """
-            expired_messages = db_manager.execute_query_sync(expired_query)
+            pending_messages = await db_manager.execute_query(pending_query)
             
-            for msg_data in expired_messages:
-                try:
-                    # Busca o usuário e a mensagem
-                    user = self.bot.get_user(msg_data['id_guardiao'])
-                    if user:
-                        try:
-                            # Tenta buscar e deletar a mensagem
-                            channel = user.dm_channel
-                            if not channel:
-                                channel = await user.create_dm()
-                            
-                            message = await channel.fetch_message(msg_data['id_mensagem'])
-                            await message.delete()
-                            
-                        except discord.NotFound:
-                            pass  # Mensagem já foi deletada
-                        except Exception as e:
-                            logger.warning(f"Erro ao deletar mensagem {msg_data['id_mensagem']}: {e}")
-                    
-                    # Atualiza o status da mensagem
-                    update_query = """
-                        UPDATE mensagens_guardioes 
-                        SET status = 'Expirada' 
-                        WHERE id = $1
-                    """
-                    db_manager.execute_command_sync(update_query, msg_data['id'])
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao processar mensagem expirada {msg_data['id']}: {e}")
-            
-            if expired_messages:
-                logger.info(f"Processadas {len(expired_messages)} mensagens expiradas")
+            # Reagendar é idempotente; prazos já vencidos disparam imediatamente
+            for msg_data in pending_messages:
+                self.message_deadlines.schedule(msg_data['id'], msg_data['timeout_expira'])
             
-            # Limpa cache temporário se tabela não existir
-            if not table_exists and self.temp_message_cache:
-                current_time = datetime.utcnow()
-                cleaned_cache = {}
-                
-                for denuncia_id, guardians in self.temp_message_cache.items():
-                    cleaned_guardians = {}
-                    for guardian_id, timestamp in guardians.items():
-                        # Mantém apenas mensagens dos últimos 10 minutos
-                        if (current_time - timestamp).total_seconds() < 600:  # 10 minutos
-                            cleaned_guardians[guardian_id] = timestamp
-                    
-                    if cleaned_guardians:
-                        cleaned_cache[denuncia_id] = cleaned_guardians
-                
-                self.temp_message_cache = cleaned_cache
+            logger.debug(f"{len(pending_messages)} mensagens pendentes no agendador de prazos")
                 
         except Exception as e:
             logger.error(f"Erro na verificação de timeout: {e}")
@@ -1925,7 +2109,7 @@ class ModeracaoCog(commands.Cog):
                     AND table_name = 'mensagens_guardioes'
                 )
             """
-            table_exists = db_manager.execute_scalar_sync(table_exists_query)
+            table_exists = await db_manager.execute_scalar(table_exists_query)
             
             if not table_exists:
                 return  # Não faz nada se a tabela não existir
@@ -1943,47 +2127,105 @@ class ModeracaoCog(commands.Cog):
                         AND vg.id_denuncia = mg.id_denuncia
                   )
             """
-            inactive_guardians = db_manager.execute_query_sync(inactivity_query)
+            inactive_guardians = await db_manager.execute_query(inactivity_query)
             
             for guardian_data in inactive_guardians:
                 try:
-                    # Aplica penalidade de inatividade
-                    penalty_time = datetime.utcnow() + timedelta(hours=INACTIVE_PENALTY_HOURS)
-                    # Remove pontos e XP correspondente (5 pontos = 10 XP)
-                    penalty_query = """
-                        UPDATE usuarios 
-                        SET pontos = pontos - 5, experiencia = experiencia - 10, cooldown_inativo = $1 
-                        WHERE id_discord = $2
-                    """
-                    db_manager.execute_command_sync(penalty_query, penalty_time, guardian_data['id_guardiao'])
-                    
-                    # Atualiza status da mensagem
-                    update_msg_query = """
-                        UPDATE mensagens_guardioes 
-                        SET status = 'Inativo' 
-                        WHERE id_guardiao = $1 AND id_denuncia = $2 AND status = 'Atendida'
-                    """
-                    db_manager.execute_command_sync(
-                        update_msg_query, guardian_data['id_guardiao'], guardian_data['id_denuncia']
-                    )
-                    
-                    logger.info(f"Penalidade de inatividade aplicada ao guardião {guardian_data['id_guardiao']}")
-                    
+                    await self._apply_inactivity_penalty(guardian_data['id_guardiao'], guardian_data['id_denuncia'])
                 except Exception as e:
-                    logger.error(f"Erro ao aplicar penalidade de inatividade: {e}")
+                    # A transação foi desfeita: a próxima varredura tenta de novo
+                    logger.error(f"Erro ao aplicar penalidade de inatividade ao guardião {guardian_data['id_guardiao']}: {e}")
             
         except Exception as e:
             logger.error(f"Erro na verificação de inatividade: {e}")
     
+    async def _apply_inactivity_penalty(self, id_guardiao: int, id_denuncia: int) -> bool:
+        """
+        Aplica a penalidade de inatividade a quem atendeu e não votou
+        
+        A mensagem é reivindicada ('Atendida' → 'Inativo') e a penalidade é
+        gravada na mesma transação: o job agendado e a varredura nunca penalizam
+        duas vezes, e uma falha não deixa o guardião 'Inativo' sem penalidade.
+        Erros são propagados para que o agendador de jobs tente de novo.
+        
+        Returns:
+            True se a penalidade foi aplicada
+        """
+        claim_query = """
+            UPDATE mensagens_guardioes mg
+            SET status = 'Inativo'
+            WHERE mg.id_guardiao = $1 AND mg.id_denuncia = $2 AND mg.status = 'Atendida'
+              AND NOT EXISTS (
+                  SELECT 1 FROM votos_guardioes vg 
+                  WHERE vg.id_guardiao = mg.id_guardiao 
+                    AND vg.id_denuncia = mg.id_denuncia
+              )
+            RETURNING mg.id
+        """
+        # Remove pontos e XP correspondente (5 pontos = 10 XP)
+        penalty_query = """
+            UPDATE usuarios 
+            SET pontos = pontos - 5, experiencia = experiencia - 10, cooldown_inativo = $1 
+            WHERE id_discord = $2
+        """
+        penalty_time = datetime.utcnow() + timedelta(hours=INACTIVE_PENALTY_HOURS)
+        
+        async with db_manager.get_connection() as conn:
+            async with conn.transaction():
+                claimed = await conn.fetch(claim_query, id_guardiao, id_denuncia)
+                if not claimed:
+                    return False
+                await conn.execute(penalty_query, penalty_time, id_guardiao)
+        
+        availability_index.set_inactive_cooldown(id_guardiao, penalty_time)
+        logger.info(f"Penalidade de inatividade aplicada ao guardião {id_guardiao}")
+        return True
+    
+    async def _run_inactivity_job(self, payload: Dict):
+        """Job 'penalidade_inatividade': prazo de voto de quem atendeu a denúncia (erros geram nova tentativa)"""
+        await self._apply_inactivity_penalty(payload['id_guardiao'], payload['id_denuncia'])
+    
+    async def _run_unban_job(self, payload: Dict):
+        """Job 'unban': fim de um banimento temporário"""
+        response = await discord_rest.unban(
+            payload['server_id'], payload['member_id'], reason="Fim do banimento temporário"
+        )
+        
+        if response.ok:
+            logger.info(f"✅ Unban automático executado para {payload['member_id']}")
+        elif response.status_code == 404:
+            # Ban já removido manualmente (ou servidor inexistente): nada a fazer
+            logger.info(f"Unban automático ignorado para {payload['member_id']}: ban não encontrado")
+        else:
+            # Falha o job para que o agendador tente novamente
+            raise RuntimeError(f"unban retornou {response.status_code}: {response.text[:100]}")
+    
+    @tasks.loop(seconds=AVAILABILITY_RECONCILE_SECONDS)
+    async def availability_reconcile(self):
+        """Reconcilia o índice de disponibilidade com o banco de dados"""
+        if not db_manager.pool:
+            return
+        
+        # Usa o mesmo lock da distribuição para não sobrescrever envios em andamento
+        async with self._distribution_lock:
+            await availability_index.reconcile()
+    
     @distribution_loop.before_loop
     async def before_distribution_loop(self):
         """Aguarda o bot estar pronto antes de iniciar o loop"""
         await self.bot.wait_until_ready()
     
+    @availability_reconcile.before_loop
+    async def before_availability_reconcile(self):
+        """Aguarda o bot estar pronto antes de iniciar o loop"""
+        await self.bot.wait_until_ready()
+    
     @timeout_check.before_loop
     async def before_timeout_check(self):
-        """Aguarda o bot estar pronto antes de iniciar o loop"""
+        """Aguarda o bot e o banco estarem prontos (a primeira execução carrega os prazos)"""
         await self.bot.wait_until_ready()
+        while not db_manager.pool:
+            await asyncio.sleep(1)
     
     @inactivity_check.before_loop
     async def before_inactivity_check(self):
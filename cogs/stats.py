@@ -8,7 +8,7 @@ from discord.ext import commands
 from discord import app_commands
 import logging
 from datetime import datetime
-from database.connection import db_manager, get_user_by_discord_id_sync
+from database.connection import db_manager, get_user_by_discord_id
 from utils.experience_system import (
     get_experience_rank, 
     get_rank_emoji, 
@@ -43,10 +43,10 @@ class StatsCog(commands.Cog):
         try:
             # Verifica se o banco de dados está disponível
             if not db_manager.pool:
-                db_manager.initialize_pool()
+                await db_manager.initialize_pool()
             
             # Busca os dados do usuário
-            user_data = get_user_by_discord_id_sync(interaction.user.id)
+            user_data = await get_user_by_discord_id(interaction.user.id)
             
             if not user_data:
                 embed = discord.Embed(
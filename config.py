@@ -24,9 +24,22 @@ POSTGRES_PORT = os.getenv('POSTGRES_PORT', '5432')
 # URL de conexão do banco de dados
 DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
+# Pool dedicado das chamadas síncronas (Flask / --web-only)
+DB_SYNC_POOL_MIN = int(os.getenv('DB_SYNC_POOL_MIN', '1'))
+DB_SYNC_POOL_MAX = int(os.getenv('DB_SYNC_POOL_MAX', '10'))
+DB_SYNC_TIMEOUT_SECONDS = int(os.getenv('DB_SYNC_TIMEOUT_SECONDS', '30'))
+# Proteção contra chamadas *_sync dentro de um event loop: 'off', 'log' ou 'raise'
+DB_SYNC_GUARD = os.getenv('DB_SYNC_GUARD', 'log').lower()
+
 # Configurações da Aplicação Web
 WEB_PORT = int(os.getenv('WEB_PORT', '8080'))
 FLASK_SECRET_KEY = os.getenv('FLASK_SECRET_KEY')
+# Servidor de produção (python main.py --web-only): cada worker é um processo com o próprio pool DB_SYNC_POOL_*
+WEB_WORKERS = int(os.getenv('WEB_WORKERS', '2'))
+WEB_THREADS = int(os.getenv('WEB_THREADS', '4'))  # Threads por worker (requisições simultâneas por processo)
+WEB_TIMEOUT_SECONDS = int(os.getenv('WEB_TIMEOUT_SECONDS', '60'))  # Worker sem resposta por mais que isso é reiniciado
+WEB_GRACEFUL_TIMEOUT_SECONDS = int(os.getenv('WEB_GRACEFUL_TIMEOUT_SECONDS', '30'))  # Prazo para terminar requisições no reload/parada
+WEB_PID_FILE = os.getenv('WEB_PID_FILE')  # Opcional: reload gracioso com `kill -HUP $(cat $WEB_PID_FILE)`
 
 # Configurações do Bot
 BOT_PREFIX = os.getenv('BOT_PREFIX', '!')
@@ -40,6 +53,40 @@ VOTE_TIMEOUT_MINUTES = 5
 DISPENSE_COOLDOWN_MINUTES = 10
 INACTIVE_PENALTY_HOURS = 1
 PROVA_COOLDOWN_HOURS = 24
+DISTRIBUTION_SWEEP_SECONDS = 120  # Varredura de segurança; a distribuição normal é por eventos
+DISTRIBUTION_BATCH_SIZE = 200  # Máximo de denúncias carregadas por rodada de distribuição
+AVAILABILITY_RECONCILE_SECONDS = 300  # Reconciliação do índice de disponibilidade com o banco
+DM_FANOUT_CONCURRENCY = int(os.getenv('DM_FANOUT_CONCURRENCY', '5'))  # DMs simultâneas na distribuição
+TIMEOUT_SWEEP_MINUTES = 10  # Varredura de segurança dos prazos; a expiração normal é por agendador
+JOB_POLL_SECONDS = 30  # Intervalo máximo entre verificações da tabela jobs_agendados
+JOB_BATCH_SIZE = 20  # Jobs reivindicados por rodada do agendador
+JOB_LEASE_MINUTES = 5  # Após esse tempo um job 'Executando' órfão volta a ser executável
+JOB_RETENTION_DAYS = int(os.getenv('JOB_RETENTION_DAYS', '7'))  # Jobs 'Concluido'/'Falhou' mais antigos que isso são excluídos
+JOB_PURGE_INTERVAL_MINUTES = 60  # Intervalo da limpeza de jobs finalizados
+BROADCAST_BATCH_SIZE = int(os.getenv('BROADCAST_BATCH_SIZE', '50'))  # Destinatários por lote (checkpoint) de um broadcast
+BROADCAST_RESUME_MINUTES = 5  # Varredura de broadcasts pendentes ou com lease vencido
+DISCORD_REST_POOL_SIZE = int(os.getenv('DISCORD_REST_POOL_SIZE', '50'))  # Conexões HTTP simultâneas com a API do Discord
+DISCORD_REST_MAX_RETRIES = 3  # Novas tentativas após 429, 5xx ou erro de rede
+DISCORD_REST_TIMEOUT_SECONDS = 10  # Timeout total de cada requisição REST
+MESSAGE_BUFFER_ENABLED = os.getenv('MESSAGE_BUFFER_ENABLED', 'true').lower() == 'true'  # Buffer de mensagens por canal para evidências
+MESSAGE_BUFFER_PER_CHANNEL = 100  # Mensagens guardadas por canal (igual ao limite de captura)
+MESSAGE_BUFFER_MAX_AGE_HOURS = 24  # Janela de captura das evidências
+MESSAGE_BUFFER_MAX_MESSAGES = int(os.getenv('MESSAGE_BUFFER_MAX_MESSAGES', '20000'))  # Teto global; canais frios são descartados
+EVIDENCE_CACHE_SIZE = int(os.getenv('EVIDENCE_CACHE_SIZE', '500'))  # Denúncias com evidências já renderizadas em memória
+USER_PROFILE_CACHE_SIZE = int(os.getenv('USER_PROFILE_CACHE_SIZE', '5000'))  # Perfis do Discord em memória (LRU)
+USER_PROFILE_TTL_SECONDS = 900  # Validade de um perfil do Discord em memória
+USER_PROFILE_NEGATIVE_TTL_SECONDS = 600  # Usuários inexistentes (404) não são buscados de novo nesse intervalo
+USER_PROFILE_FETCH_CONCURRENCY = 10  # GET /users/{id} simultâneos em um lote
+USER_PROFILE_PERSIST = os.getenv('USER_PROFILE_PERSIST', 'false').lower() == 'true'  # Guarda perfis em usuarios_discord_cache
+USER_PROFILE_PERSIST_HOURS = 24  # Perfis persistidos mais antigos que isso são buscados de novo
+COUNT_CACHE_TTL_SECONDS = 60  # Validade dos totais (COUNT) das listas filtradas do painel
+COUNT_EXACT_BELOW = 10000  # Abaixo disso as listas sem filtro contam de verdade em vez de usar pg_class.reltuples
+GUILD_SETTINGS_TTL_SECONDS = 300  # Validade do cache de configuração/premium por servidor (invalidado também por NOTIFY)
+DASHBOARD_REFRESH_SECONDS = int(os.getenv('DASHBOARD_REFRESH_SECONDS', '60'))  # Intervalo de recálculo das estatísticas do dashboard admin
+REPORT_RETENTION_DAYS = int(os.getenv('REPORT_RETENTION_DAYS', '0'))  # Denúncias finalizadas e punições inativas mais antigas que isso saem das tabelas quentes (0 = desativado)
+REPORT_RETENTION_MODE = os.getenv('REPORT_RETENTION_MODE', 'arquivar')  # 'arquivar' (denuncias_arquivo) ou 'excluir'
+REPORT_RETENTION_BATCH_SIZE = 200  # Denúncias por transação da retenção
+REPORT_RETENTION_INTERVAL_HOURS = 6  # Intervalo entre execuções da retenção
 
 # Configurações de Punição
 PUNISHMENT_RULES = {
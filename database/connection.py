@@ -5,10 +5,16 @@ Implementa pool de conexões assíncronas para o ambiente de produção (Disclou
 
 import asyncio
 import asyncpg
+import concurrent.futures
 import logging
-from typing import Optional, List, Dict, Any
+import threading
+import traceback
+from typing import Optional, List, Dict, Any, Callable
 from contextlib import asynccontextmanager
-from config import DATABASE_URL, POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD
+from config import (
+    DATABASE_URL, POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD,
+    DB_SYNC_POOL_MIN, DB_SYNC_POOL_MAX, DB_SYNC_TIMEOUT_SECONDS, DB_SYNC_GUARD
+)
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +28,18 @@ class DatabaseManager:
         self.pool: Optional[asyncpg.Pool] = None
         self._connection_url = DATABASE_URL
         
+        # Loop do bot (dono do pool principal) e ponte síncrona dedicada
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_pool: Optional[asyncpg.Pool] = None
+        self._sync_thread: Optional[threading.Thread] = None
+        self._sync_lock = threading.Lock()
+        
+        # LISTEN/NOTIFY: conexão dedicada de escuta e callbacks por canal
+        self._listen_callbacks: Dict[str, List[Callable[[Optional[str]], Any]]] = {}
+        self._listen_connection: Optional[asyncpg.Connection] = None
+        self._listen_task: Optional[asyncio.Task] = None
+        
     async def initialize_pool(self, min_connections: int = 5, max_connections: int = 20):
         """
         Inicializa o pool de conexões
@@ -49,6 +67,8 @@ class DatabaseManager:
                 }
             )
             
+            self._loop = asyncio.get_running_loop()
+            
             logger.info(f"Pool de conexões criado com sucesso! ({min_connections}-{max_connections} conexões)")
             
             # Testa a conexão
@@ -71,9 +91,15 @@ class DatabaseManager:
     
     async def close_pool(self):
         """Fecha o pool de conexões"""
+        await self.stop_listening()
+        
         if self.pool:
             await self.pool.close()
+            self.pool = None
+            self._loop = None
             logger.info("Pool de conexões fechado.")
+        
+        self.close_sync_bridge()
     
     async def create_tables(self):
         """Cria todas as tabelas necessárias no banco de dados"""
@@ -116,214 +142,212 @@ class DatabaseManager:
             return False
     
     def create_tables_sync(self):
-        """Versão síncrona para criar tabelas - CONEXÃO ISOLADA"""
-        import asyncio
-        import asyncpg
+        """Versão síncrona para criar tabelas"""
         import os
         
-        def run_query():
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                async def execute():
-                    # Lê o arquivo SQL
-                    sql_file = os.path.join(os.path.dirname(__file__), 'init_schema.sql')
-                    if not os.path.exists(sql_file):
-                        logger.error(f"Arquivo SQL não encontrado: {sql_file}")
-                        return False
-                    
-                    with open(sql_file, 'r', encoding='utf-8') as f:
-                        sql_content = f.read()
-                    
-                    # Configurações do banco
-                    db_config = {
-                        'host': os.getenv('POSTGRES_HOST'),
-                        'port': int(os.getenv('POSTGRES_PORT', 5432)),
-                        'user': os.getenv('POSTGRES_USER'),
-                        'password': os.getenv('POSTGRES_PASSWORD'),
-                        'database': os.getenv('POSTGRES_DB')
-                    }
-                    
-                    # Cria conexão direta independente
-                    conn = await asyncpg.connect(**db_config)
-                    try:
-                        await conn.execute(sql_content)
-                        return True
-                    finally:
-                        await conn.close()
-                
-                result = loop.run_until_complete(execute())
-                loop.close()
-                return result
-            except Exception as e:
-                logger.error(f"Erro na criação síncrona isolada de tabelas: {e}")
-                return False
+        sql_file = os.path.join(os.path.dirname(__file__), 'init_schema.sql')
+        if not os.path.exists(sql_file):
+            logger.error(f"Arquivo SQL não encontrado: {sql_file}")
+            return False
         
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(run_query)
-            return future.result(timeout=60)
+        with open(sql_file, 'r', encoding='utf-8') as f:
+            sql_content = f.read()
+        
+        result = self._run_sync(lambda pool: self._pool_execute(pool, sql_content, ()), "ERROR", timeout=60)
+        return result == "OK"
     
     # Versões síncronas das funções para uso em Flask
-    def execute_query_sync(self, query: str, *args) -> List[Dict[str, Any]]:
-        """Versão síncrona de execute_query para uso em Flask - CONEXÃO ISOLADA"""
-        import asyncio
-        import asyncpg
-        import os
+    #
+    # Todas as chamadas *_sync passam pela mesma ponte: a corrotina é agendada
+    # com run_coroutine_threadsafe em um loop que já possui um pool aberto,
+    # reaproveitando conexões em vez de abrir uma conexão nova por query.
+    def _get_sync_target(self):
+        """
+        Escolhe o loop e o pool onde a chamada síncrona será executada
         
-        def run_query():
+        Returns:
+            Tupla (loop, pool). Usa o pool do bot quando ele está ativo e a
+            chamada vem de outra thread; caso contrário usa o pool dedicado
+            da ponte síncrona (modo --web-only ou chamada dentro do loop do bot).
+        """
+        bot_loop = self._loop
+        if self.pool and bot_loop and bot_loop.is_running():
             try:
-                # Cria um loop completamente isolado
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                async def execute():
-                    # Configurações do banco
-                    db_config = {
-                        'host': os.getenv('POSTGRES_HOST'),
-                        'port': int(os.getenv('POSTGRES_PORT', 5432)),
-                        'user': os.getenv('POSTGRES_USER'),
-                        'password': os.getenv('POSTGRES_PASSWORD'),
-                        'database': os.getenv('POSTGRES_DB')
-                    }
-                    
-                    # Cria conexão direta independente
-                    conn = await asyncpg.connect(**db_config)
-                    try:
-                        rows = await conn.fetch(query, *args)
-                        return [dict(row) for row in rows]
-                    finally:
-                        await conn.close()
-                
-                result = loop.run_until_complete(execute())
-                loop.close()
-                return result
-            except Exception as e:
-                logger.error(f"Erro na execução síncrona isolada: {e}")
-                return []
+                current_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                current_loop = None
+            
+            # Bloquear o próprio loop do bot esperando por ele causaria deadlock
+            if current_loop is not bot_loop:
+                return bot_loop, self.pool
         
-        # Executa em thread separada
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(run_query)
-            return future.result(timeout=30)
+        return self._ensure_sync_bridge()
     
-    def execute_one_sync(self, query: str, *args) -> Optional[Dict[str, Any]]:
-        """Versão síncrona de execute_one para uso em Flask - CONEXÃO ISOLADA"""
-        import asyncio
-        import asyncpg
-        import os
-        
-        def run_query():
-            try:
+    def _ensure_sync_bridge(self):
+        """Cria (uma única vez) a thread com loop e pool dedicados às chamadas síncronas"""
+        with self._sync_lock:
+            if self._sync_pool is None:
                 loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+                thread = threading.Thread(
+                    target=self._run_sync_loop,
+                    args=(loop,),
+                    name="db-sync-bridge",
+                    daemon=True
+                )
+                thread.start()
                 
-                async def execute():
-                    db_config = {
-                        'host': os.getenv('POSTGRES_HOST'),
-                        'port': int(os.getenv('POSTGRES_PORT', 5432)),
-                        'user': os.getenv('POSTGRES_USER'),
-                        'password': os.getenv('POSTGRES_PASSWORD'),
-                        'database': os.getenv('POSTGRES_DB')
-                    }
-                    
-                    conn = await asyncpg.connect(**db_config)
-                    try:
-                        row = await conn.fetchrow(query, *args)
-                        return dict(row) if row else None
-                    finally:
-                        await conn.close()
+                future = asyncio.run_coroutine_threadsafe(self._create_sync_pool(), loop)
+                try:
+                    self._sync_pool = future.result(timeout=DB_SYNC_TIMEOUT_SECONDS)
+                except Exception:
+                    loop.call_soon_threadsafe(loop.stop)
+                    raise
                 
-                result = loop.run_until_complete(execute())
-                loop.close()
-                return result
-            except Exception as e:
-                logger.error(f"Erro na execução síncrona isolada: {e}")
-                return None
+                self._sync_loop = loop
+                self._sync_thread = thread
+                logger.info(f"Ponte síncrona iniciada com pool dedicado ({DB_SYNC_POOL_MIN}-{DB_SYNC_POOL_MAX} conexões)")
+            
+            return self._sync_loop, self._sync_pool
+    
+    @staticmethod
+    def _run_sync_loop(loop: asyncio.AbstractEventLoop):
+        """Mantém o loop da ponte síncrona rodando em sua própria thread"""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+    
+    async def _create_sync_pool(self) -> asyncpg.Pool:
+        """Cria o pool limitado usado pela ponte síncrona"""
+        return await asyncpg.create_pool(
+            host=POSTGRES_HOST,
+            port=int(POSTGRES_PORT),
+            database=POSTGRES_DB,
+            user=POSTGRES_USER,
+            password=POSTGRES_PASSWORD,
+            min_size=DB_SYNC_POOL_MIN,
+            max_size=DB_SYNC_POOL_MAX,
+            command_timeout=60,
+            server_settings={
+                'application_name': 'guardiao_beta_sync',
+                'timezone': 'UTC'
+            }
+        )
+    
+    def close_sync_bridge(self):
+        """Fecha o pool dedicado e encerra a thread da ponte síncrona"""
+        with self._sync_lock:
+            if self._sync_pool is None:
+                return
+            
+            loop, pool = self._sync_loop, self._sync_pool
+            self._sync_pool = None
+            self._sync_loop = None
+            self._sync_thread = None
         
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(run_query)
-            return future.result(timeout=30)
+        try:
+            future = asyncio.run_coroutine_threadsafe(pool.close(), loop)
+            future.result(timeout=DB_SYNC_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.error(f"Erro ao fechar pool da ponte síncrona: {e}")
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            logger.info("Ponte síncrona encerrada.")
     
-    def execute_scalar_sync(self, query: str, *args) -> Any:
-        """Versão síncrona de execute_scalar para uso em Flask - CONEXÃO ISOLADA"""
-        import asyncio
-        import asyncpg
-        import os
+    def _check_sync_guard(self):
+        """
+        Detecta chamadas *_sync feitas de dentro de um event loop em execução
         
-        def run_query():
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                async def execute():
-                    db_config = {
-                        'host': os.getenv('POSTGRES_HOST'),
-                        'port': int(os.getenv('POSTGRES_PORT', 5432)),
-                        'user': os.getenv('POSTGRES_USER'),
-                        'password': os.getenv('POSTGRES_PASSWORD'),
-                        'database': os.getenv('POSTGRES_DB')
-                    }
-                    
-                    conn = await asyncpg.connect(**db_config)
-                    try:
-                        return await conn.fetchval(query, *args)
-                    finally:
-                        await conn.close()
-                
-                result = loop.run_until_complete(execute())
-                loop.close()
-                return result
-            except Exception as e:
-                logger.error(f"Erro na execução síncrona isolada: {e}")
-                return None
+        Essas chamadas bloqueiam o loop (no bot, o gateway do Discord inteiro)
+        até a query terminar. Código assíncrono deve usar execute_query,
+        execute_one, execute_scalar e execute_command.
+        
+        Raises:
+            RuntimeError: Se DB_SYNC_GUARD='raise' e houver loop rodando na thread
+        """
+        if DB_SYNC_GUARD == 'off':
+            return
         
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(run_query)
-            return future.result(timeout=30)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Nenhum loop nesta thread: uso correto (Flask)
+        
+        caller = traceback.extract_stack(limit=4)[0]
+        message = (f"Chamada síncrona ao banco dentro de um event loop "
+                   f"({caller.filename}:{caller.lineno} em {caller.name}) - use a API assíncrona")
+        
+        if DB_SYNC_GUARD == 'raise':
+            raise RuntimeError(message)
+        logger.warning(f"⚠️ {message}")
     
-    def execute_command_sync(self, command: str, *args) -> str:
-        """Versão síncrona de execute_command para uso em Flask - CONEXÃO ISOLADA"""
-        import asyncio
-        import asyncpg
-        import os
+    def _run_sync(self, operation, default: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Executa uma operação assíncrona do pool de forma síncrona
         
-        def run_query():
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                async def execute():
-                    db_config = {
-                        'host': os.getenv('POSTGRES_HOST'),
-                        'port': int(os.getenv('POSTGRES_PORT', 5432)),
-                        'user': os.getenv('POSTGRES_USER'),
-                        'password': os.getenv('POSTGRES_PASSWORD'),
-                        'database': os.getenv('POSTGRES_DB')
-                    }
-                    
-                    conn = await asyncpg.connect(**db_config)
-                    try:
-                        await conn.execute(command, *args)
-                        return "OK"
-                    finally:
-                        await conn.close()
-                
-                result = loop.run_until_complete(execute())
-                loop.close()
-                return result
-            except Exception as e:
-                logger.error(f"Erro na execução síncrona isolada: {e}")
-                return "ERROR"
+        Args:
+            operation: Função que recebe o pool e retorna a corrotina a executar
+            default: Valor retornado em caso de erro
+            timeout: Tempo máximo de espera em segundos
+            
+        Returns:
+            Resultado da operação ou o valor padrão
+        """
+        self._check_sync_guard()
         
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(run_query)
-            return future.result(timeout=30)
+        future = None
+        try:
+            loop, pool = self._get_sync_target()
+            future = asyncio.run_coroutine_threadsafe(operation(pool), loop)
+            return future.result(timeout=timeout or DB_SYNC_TIMEOUT_SECONDS)
+        except concurrent.futures.TimeoutError:
+            if future:
+                future.cancel()
+            logger.error("Timeout na execução síncrona do banco de dados")
+            return default
+        except Exception as e:
+            logger.error(f"Erro na execução síncrona: {e}")
+            return default
+    
+    @staticmethod
+    async def _pool_fetch(pool: asyncpg.Pool, query: str, args: tuple) -> List[Dict[str, Any]]:
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(query, *args)
+            return [dict(row) for row in rows]
+    
+    @staticmethod
+    async def _pool_fetchrow(pool: asyncpg.Pool, query: str, args: tuple) -> Optional[Dict[str, Any]]:
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(query, *args)
+            return dict(row) if row else None
+    
+    @staticmethod
+    async def _pool_fetchval(pool: asyncpg.Pool, query: str, args: tuple) -> Any:
+        async with pool.acquire() as conn:
+            return await conn.fetchval(query, *args)
+    
+    @staticmethod
+    async def _pool_execute(pool: asyncpg.Pool, command: str, args: tuple) -> str:
+        async with pool.acquire() as conn:
+            await conn.execute(command, *args)
+            return "OK"
+    
+    def execute_query_sync(self, query: str, *args) -> List[Dict[str, Any]]:
+        """Versão síncrona de execute_query para uso em Flask"""
+        return self._run_sync(lambda pool: self._pool_fetch(pool, query, args), [])
+    
+    def execute_one_sync(self, query: str, *args) -> Optional[Dict[str, Any]]:
+        """Versão síncrona de execute_one para uso em Flask"""
+        return self._run_sync(lambda pool: self._pool_fetchrow(pool, query, args), None)
+    
+    def execute_scalar_sync(self, query: str, *args) -> Any:
+        """Versão síncrona de execute_scalar para uso em Flask"""
+        return self._run_sync(lambda pool: self._pool_fetchval(pool, query, args), None)
+    
+    def execute_command_sync(self, command: str, *args) -> str:
+        """Versão síncrona de execute_command para uso em Flask"""
+        return self._run_sync(lambda pool: self._pool_execute(pool, command, args), "ERROR")
     
     @asynccontextmanager
     async def get_connection(self):
@@ -399,6 +423,25 @@ class DatabaseManager:
             result = await conn.execute(command, *args)
             return result
     
+    async def copy_records(self, table: str, columns: List[str], records: List[tuple]) -> int:
+        """
+        Insere vários registros de uma vez via COPY (um único round trip)
+        
+        Args:
+            table: Nome da tabela
+            columns: Colunas na ordem dos valores de cada registro
+            records: Lista de tuplas com os valores
+            
+        Returns:
+            Quantidade de registros copiados
+        """
+        if not records:
+            return 0
+        
+        async with self.get_connection() as conn:
+            await conn.copy_records_to_table(table, records=records, columns=columns)
+            return len(records)
+    
     async def execute_transaction(self, commands: List[tuple]) -> bool:
         """
         Executa múltiplos comandos em uma transação
@@ -414,6 +457,127 @@ class DatabaseManager:
                 for command, args in commands:
                     await conn.execute(command, *args)
             return True
+    
+    # ==================== LISTEN/NOTIFY ====================
+    #
+    # Notificações entre processos (bot e painel web): quem grava publica com
+    # NOTIFY e cada processo mantém UMA conexão dedicada em LISTEN, fora do pool.
+    # Se a conexão cai, notificações podem ter sido perdidas; ao reconectar os
+    # callbacks recebem payload None para descartar todo o estado derivado.
+    async def notify(self, channel: str, payload: str = '') -> bool:
+        """
+        Publica uma notificação
+        
+        Args:
+            channel: Canal do NOTIFY
+            payload: Texto entregue aos ouvintes (até 8000 bytes)
+            
+        Returns:
+            True se a notificação foi enviada
+        """
+        try:
+            await self.execute_scalar("SELECT pg_notify($1, $2)", channel, payload)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao publicar notificação em {channel}: {e}")
+            return False
+    
+    def notify_sync(self, channel: str, payload: str = '') -> bool:
+        """Versão síncrona de notify (rotas Flask)"""
+        # _run_sync não propaga erros: o valor padrão None indica que o NOTIFY não foi enviado
+        sent = self._run_sync(
+            lambda pool: self._pool_fetchval(pool, "SELECT true FROM pg_notify($1, $2)", (channel, payload)),
+            None
+        )
+        if sent is None:
+            logger.error(f"Erro ao publicar notificação em {channel}")
+            return False
+        return True
+    
+    async def listen(self, channel: str, callback: Callable[[Optional[str]], Any]):
+        """
+        Registra um callback para as notificações de um canal
+        
+        O callback é chamado no loop de quem registrou primeiro com o payload
+        recebido, ou com None após uma reconexão. Não deve bloquear.
+        
+        Args:
+            channel: Canal do LISTEN
+            callback: Função chamada com o payload
+        """
+        callbacks = self._listen_callbacks.setdefault(channel, [])
+        callbacks.append(callback)
+        
+        if self._listen_connection is not None and len(callbacks) == 1:
+            await self._listen_connection.add_listener(channel, self._dispatch_notification)
+        
+        if self._listen_task is None or self._listen_task.done():
+            self._listen_task = asyncio.create_task(self._listen_supervisor())
+    
+    def listen_sync(self, channel: str, callback: Callable[[Optional[str]], Any]):
+        """Registra o callback no loop da ponte síncrona (modo --web-only)"""
+        loop, _ = self._ensure_sync_bridge()
+        future = asyncio.run_coroutine_threadsafe(self.listen(channel, callback), loop)
+        future.result(timeout=DB_SYNC_TIMEOUT_SECONDS)
+    
+    async def stop_listening(self):
+        """Encerra a conexão de escuta"""
+        task, self._listen_task = self._listen_task, None
+        if task is None:
+            return
+        
+        if task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+        else:
+            task.get_loop().call_soon_threadsafe(task.cancel)
+    
+    def _dispatch_notification(self, connection, pid, channel: str, payload: Optional[str]):
+        """Entrega uma notificação (ou None, após reconexão) aos callbacks do canal"""
+        for callback in list(self._listen_callbacks.get(channel, ())):
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error(f"Erro no callback de notificação {channel}: {e}")
+    
+    async def _listen_supervisor(self):
+        """Mantém a conexão de escuta aberta, reconectando com backoff"""
+        delay = 1
+        while True:
+            closed = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(
+                    host=POSTGRES_HOST,
+                    port=int(POSTGRES_PORT),
+                    database=POSTGRES_DB,
+                    user=POSTGRES_USER,
+                    password=POSTGRES_PASSWORD,
+                    server_settings={'application_name': 'guardiao_beta_listen'}
+                )
+                connection.add_termination_listener(lambda conn: closed.set())
+                for channel in list(self._listen_callbacks):
+                    await connection.add_listener(channel, self._dispatch_notification)
+                
+                self._listen_connection = connection
+                logger.info(f"📡 Escutando notificações: {', '.join(self._listen_callbacks)}")
+                delay = 1
+                
+                # O que foi publicado enquanto não havia escuta se perdeu
+                for channel in list(self._listen_callbacks):
+                    self._dispatch_notification(connection, 0, channel, None)
+                
+                await closed.wait()
+                logger.warning("⚠️ Conexão de escuta encerrada, reconectando...")
+            except asyncio.CancelledError:
+                if self._listen_connection is not None:
+                    await self._listen_connection.close()
+                raise
+            except Exception as e:
+                logger.error(f"Erro na conexão de escuta (nova tentativa em {delay}s): {e}")
+            finally:
+                self._listen_connection = None
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
 
 
 # Instância global do gerenciador de banco de dados
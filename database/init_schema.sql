@@ -1,6 +1,9 @@
 -- Schema de Inicialização do Sistema Guardião BETA
 -- Execute este script no PostgreSQL do Discloud para criar todas as tabelas
 
+-- Extensão de trigramas (índices da busca do painel)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Tabela de usuários
 CREATE TABLE IF NOT EXISTS usuarios (
     id_discord BIGINT PRIMARY KEY,
@@ -33,7 +36,41 @@ CREATE TABLE IF NOT EXISTS denuncias (
     status VARCHAR(50) DEFAULT 'Pendente' NOT NULL,
     data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
     e_premium BOOLEAN DEFAULT FALSE NOT NULL,
-    resultado_final VARCHAR(50)
+    resultado_final VARCHAR(50),
+    votos_peso INTEGER DEFAULT 0 NOT NULL, -- Placar com peso (moderador = 5, guardião = 1)
+    votos_count INTEGER DEFAULT 0 NOT NULL -- Quantidade de votos recebidos
+);
+
+-- Contagem de denúncias por servidor, dia de criação, status e resultado
+CREATE TABLE IF NOT EXISTS denuncias_daily_rollup (
+    id_servidor BIGINT NOT NULL,
+    dia DATE NOT NULL, -- DATE(denuncias.data_criacao)
+    status VARCHAR(50) NOT NULL,
+    resultado_final VARCHAR(50) DEFAULT '' NOT NULL, -- '' = sem resultado (denúncia não finalizada)
+    quantidade INTEGER DEFAULT 0 NOT NULL,
+    quantidade_premium INTEGER DEFAULT 0 NOT NULL,
+    PRIMARY KEY (id_servidor, dia, status, resultado_final)
+);
+
+-- Denúncias arquivadas: uma linha por denúncia, com votos e mensagens capturadas em JSONB
+-- (valores grandes são comprimidos pelo TOAST; 100 mensagens viram um único valor comprimido)
+CREATE TABLE IF NOT EXISTS denuncias_arquivo (
+    id INTEGER PRIMARY KEY, -- Mesmo id de denuncias
+    hash_denuncia VARCHAR(64) UNIQUE NOT NULL,
+    id_servidor BIGINT NOT NULL,
+    id_canal BIGINT NOT NULL,
+    id_denunciante BIGINT NOT NULL,
+    id_denunciado BIGINT NOT NULL,
+    motivo TEXT NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    data_criacao TIMESTAMP NOT NULL,
+    e_premium BOOLEAN NOT NULL,
+    resultado_final VARCHAR(50),
+    votos_peso INTEGER NOT NULL,
+    votos_count INTEGER NOT NULL,
+    votos JSONB DEFAULT '[]'::jsonb NOT NULL, -- [{id, id_guardiao, voto, data_voto}]
+    mensagens JSONB DEFAULT '[]'::jsonb NOT NULL, -- [{id, id_autor, conteudo, anexos_urls, anexos, timestamp_mensagem}]
+    data_arquivamento TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
 );
 
 -- Tabela de mensagens capturadas
@@ -43,6 +80,7 @@ CREATE TABLE IF NOT EXISTS mensagens_capturadas (
     id_autor BIGINT NOT NULL,
     conteudo TEXT NOT NULL,
     anexos_urls TEXT,
+    anexos JSONB DEFAULT '[]'::jsonb NOT NULL, -- Metadados dos anexos: [{id, filename, url, content_type, size}]
     timestamp_mensagem TIMESTAMP NOT NULL
 );
 
@@ -63,6 +101,23 @@ CREATE TABLE IF NOT EXISTS servidores_premium (
     data_fim TIMESTAMP NOT NULL
 );
 
+-- Servidores em que o bot está (mantida pelo bot a partir do gateway; lida pelo painel)
+CREATE TABLE IF NOT EXISTS servidores_bot (
+    id_servidor BIGINT PRIMARY KEY,
+    nome VARCHAR(100),
+    data_entrada TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+-- Cache persistente de perfis do Discord exibidos no painel (opcional, USER_PROFILE_PERSIST)
+CREATE TABLE IF NOT EXISTS usuarios_discord_cache (
+    id_discord BIGINT PRIMARY KEY,
+    username VARCHAR(100),
+    global_name VARCHAR(100),
+    avatar VARCHAR(100),
+    discriminator VARCHAR(10),
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
 -- Tabela de configurações dos servidores (para servidores premium)
 CREATE TABLE IF NOT EXISTS configuracoes_servidor (
     id SERIAL PRIMARY KEY,
@@ -85,6 +140,50 @@ CREATE TABLE IF NOT EXISTS mensagens_guardioes (
     status VARCHAR(20) DEFAULT 'Enviada' NOT NULL
 );
 
+-- Tabela de jobs agendados (unban, expiração de captcha, penalidade de inatividade)
+CREATE TABLE IF NOT EXISTS jobs_agendados (
+    id BIGSERIAL PRIMARY KEY,
+    tipo VARCHAR(50) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    executar_em TIMESTAMP NOT NULL,
+    status VARCHAR(20) DEFAULT 'Pendente' NOT NULL, -- Pendente, Executando, Concluido, Falhou
+    tentativas INTEGER DEFAULT 0 NOT NULL,
+    max_tentativas INTEGER DEFAULT 5 NOT NULL,
+    ultimo_erro TEXT,
+    bloqueado_ate TIMESTAMP, -- Fim do lease de quem está executando
+    chave_unica VARCHAR(255) UNIQUE, -- Evita agendar o mesmo job duas vezes
+    data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    data_conclusao TIMESTAMP
+);
+
+-- Tabela de envios em massa do painel admin (mensagens enviadas pelo bot)
+CREATE TABLE IF NOT EXISTS broadcasts (
+    id BIGSERIAL PRIMARY KEY,
+    alvo VARCHAR(20) NOT NULL, -- user, guardians, moderators, administrators, server
+    id_alvo BIGINT, -- Usuário ou servidor dos alvos individuais
+    titulo VARCHAR(256) NOT NULL,
+    conteudo TEXT NOT NULL,
+    solicitado_por BIGINT NOT NULL,
+    status VARCHAR(20) DEFAULT 'Pendente' NOT NULL, -- Pendente, Enviando, Concluido
+    total INTEGER DEFAULT 0 NOT NULL,
+    enviados INTEGER DEFAULT 0 NOT NULL,
+    falhas INTEGER DEFAULT 0 NOT NULL,
+    bloqueado_ate TIMESTAMP, -- Fim do lease de quem está enviando
+    data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    data_inicio TIMESTAMP,
+    data_conclusao TIMESTAMP
+);
+
+-- Destinatários de cada envio (checkpoint do progresso)
+CREATE TABLE IF NOT EXISTS broadcast_destinatarios (
+    id_broadcast BIGINT NOT NULL REFERENCES broadcasts(id) ON DELETE CASCADE,
+    id_destino BIGINT NOT NULL, -- Usuário (DM) ou servidor
+    status VARCHAR(20) DEFAULT 'Pendente' NOT NULL, -- Pendente, Enviado, Falhou
+    erro TEXT,
+    data_envio TIMESTAMP,
+    PRIMARY KEY (id_broadcast, id_destino)
+);
+
 -- Tabela de logs de punições
 CREATE TABLE IF NOT EXISTS logs_punicoes (
     id SERIAL PRIMARY KEY,
@@ -113,6 +212,19 @@ CREATE INDEX IF NOT EXISTS idx_usuarios_em_servico ON usuarios(em_servico);
 CREATE INDEX IF NOT EXISTS idx_denuncias_status ON denuncias(status);
 CREATE INDEX IF NOT EXISTS idx_denuncias_data_criacao ON denuncias(data_criacao);
 CREATE INDEX IF NOT EXISTS idx_denuncias_premium ON denuncias(e_premium);
+CREATE INDEX IF NOT EXISTS idx_denuncias_keyset ON denuncias(data_criacao DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_denuncias_servidor_keyset ON denuncias(id_servidor, data_criacao DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_usuarios_keyset ON usuarios(data_criacao_registro DESC, id_discord DESC);
+CREATE INDEX IF NOT EXISTS idx_usuarios_username_trgm ON usuarios USING GIN (username gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_usuarios_display_name_trgm ON usuarios USING GIN (display_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_denuncias_motivo_trgm ON denuncias USING GIN (motivo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_denuncias_motivo_fts ON denuncias USING GIN (to_tsvector('portuguese', motivo));
+CREATE INDEX IF NOT EXISTS idx_denuncias_hash_trgm ON denuncias USING GIN (hash_denuncia gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_denuncias_hash_prefix ON denuncias(hash_denuncia varchar_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_denuncias_denunciado ON denuncias(id_denunciado);
+CREATE INDEX IF NOT EXISTS idx_denuncias_denunciante ON denuncias(id_denunciante);
+CREATE INDEX IF NOT EXISTS idx_denuncias_retencao ON denuncias(data_criacao) WHERE status = 'Finalizada';
+CREATE INDEX IF NOT EXISTS idx_denuncias_arquivo_denunciado ON denuncias_arquivo(id_denunciado);
 CREATE INDEX IF NOT EXISTS idx_votos_denuncia ON votos_guardioes(id_denuncia);
 CREATE INDEX IF NOT EXISTS idx_votos_guardiao ON votos_guardioes(id_guardiao);
 CREATE INDEX IF NOT EXISTS idx_mensagens_denuncia ON mensagens_capturadas(id_denuncia);
@@ -126,15 +238,74 @@ CREATE INDEX IF NOT EXISTS idx_logs_punicoes_tipo ON logs_punicoes(tipo_punicao)
 CREATE INDEX IF NOT EXISTS idx_logs_punicoes_data ON logs_punicoes(data_punicao);
 CREATE INDEX IF NOT EXISTS idx_logs_punicoes_ativa ON logs_punicoes(ativa);
 CREATE INDEX IF NOT EXISTS idx_logs_punicoes_servidor ON logs_punicoes(id_servidor);
+CREATE INDEX IF NOT EXISTS idx_logs_punicoes_retencao ON logs_punicoes(data_punicao) WHERE ativa = false;
+CREATE INDEX IF NOT EXISTS idx_jobs_agendados_pendentes ON jobs_agendados(executar_em) WHERE status = 'Pendente';
+CREATE INDEX IF NOT EXISTS idx_jobs_agendados_executando ON jobs_agendados(bloqueado_ate) WHERE status = 'Executando';
+CREATE INDEX IF NOT EXISTS idx_jobs_agendados_finalizados ON jobs_agendados(data_conclusao) WHERE status IN ('Concluido', 'Falhou');
+CREATE INDEX IF NOT EXISTS idx_broadcasts_abertos ON broadcasts(id) WHERE status IN ('Pendente', 'Enviando');
+CREATE INDEX IF NOT EXISTS idx_broadcast_destinatarios_pendentes ON broadcast_destinatarios(id_broadcast, id_destino) WHERE status = 'Pendente';
+
+-- Estatísticas diárias dos servidores mantidas a partir de denuncias
+-- Aplica a mudança de cada denúncia na linha do seu (servidor, dia, status, resultado)
+-- Roda na mesma transação da escrita: criação, finalização, apelação e exclusão pelo admin
+-- Exclusões da retenção (guardiao.retencao = 'on') não alteram as estatísticas
+CREATE OR REPLACE FUNCTION denuncias_rollup_apply() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' AND current_setting('guardiao.retencao', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE denuncias_daily_rollup
+        SET quantidade = quantidade - 1,
+            quantidade_premium = quantidade_premium - OLD.e_premium::int
+        WHERE id_servidor = OLD.id_servidor
+            AND dia = OLD.data_criacao::date
+            AND status = OLD.status
+            AND resultado_final = COALESCE(OLD.resultado_final, '');
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO denuncias_daily_rollup (id_servidor, dia, status, resultado_final, quantidade, quantidade_premium)
+        VALUES (NEW.id_servidor, NEW.data_criacao::date, NEW.status, COALESCE(NEW.resultado_final, ''), 1, NEW.e_premium::int)
+        ON CONFLICT (id_servidor, dia, status, resultado_final) DO UPDATE
+        SET quantidade = denuncias_daily_rollup.quantidade + 1,
+            quantidade_premium = denuncias_daily_rollup.quantidade_premium + EXCLUDED.quantidade_premium;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_denuncias_rollup_insert_delete ON denuncias;
+CREATE TRIGGER trg_denuncias_rollup_insert_delete
+    AFTER INSERT OR DELETE ON denuncias
+    FOR EACH ROW EXECUTE FUNCTION denuncias_rollup_apply();
+
+-- Votos (votos_peso/votos_count) não mudam a agregação e não disparam o trigger
+DROP TRIGGER IF EXISTS trg_denuncias_rollup_update ON denuncias;
+CREATE TRIGGER trg_denuncias_rollup_update
+    AFTER UPDATE OF id_servidor, data_criacao, status, resultado_final, e_premium ON denuncias
+    FOR EACH ROW
+    WHEN ((OLD.id_servidor, OLD.data_criacao::date, OLD.status, OLD.resultado_final, OLD.e_premium)
+          IS DISTINCT FROM (NEW.id_servidor, NEW.data_criacao::date, NEW.status, NEW.resultado_final, NEW.e_premium))
+    EXECUTE FUNCTION denuncias_rollup_apply();
 
 -- Comentários nas tabelas
 COMMENT ON TABLE usuarios IS 'Tabela de usuários do sistema Guardião BETA';
 COMMENT ON TABLE denuncias IS 'Tabela de denúncias reportadas pelos usuários';
+COMMENT ON TABLE denuncias_daily_rollup IS 'Denúncias por servidor/dia/status/resultado (mantida por trigger em denuncias)';
+COMMENT ON TABLE denuncias_arquivo IS 'Denúncias finalizadas antigas com votos e evidências compactados (retenção)';
 COMMENT ON TABLE mensagens_capturadas IS 'Mensagens capturadas durante as denúncias';
 COMMENT ON TABLE votos_guardioes IS 'Votos dos guardiões nas denúncias';
 COMMENT ON TABLE servidores_premium IS 'Servidores com assinatura premium';
+COMMENT ON TABLE usuarios_discord_cache IS 'Perfis do Discord (nome e avatar) já buscados pelo painel';
+COMMENT ON TABLE servidores_bot IS 'Servidores do gateway do bot (sincronizada no on_ready e em entradas/saídas)';
 COMMENT ON TABLE configuracoes_servidor IS 'Configurações personalizadas dos servidores premium';
 COMMENT ON TABLE mensagens_guardioes IS 'Rastreamento de mensagens enviadas aos guardiões';
+COMMENT ON TABLE jobs_agendados IS 'Ações atrasadas persistentes executadas pelo agendador de jobs';
+COMMENT ON TABLE broadcasts IS 'Mensagens em massa solicitadas pelo painel admin';
+COMMENT ON TABLE broadcast_destinatarios IS 'Destinatários e progresso de cada broadcast';
 
 -- Dados iniciais (opcional)
 -- Você pode adicionar dados de teste aqui se necessário
@@ -146,5 +317,5 @@ SELECT
     tableowner
 FROM pg_tables 
 WHERE schemaname = 'public' 
-    AND tablename IN ('usuarios', 'denuncias', 'mensagens_capturadas', 'votos_guardioes', 'servidores_premium', 'configuracoes_servidor', 'mensagens_guardioes')
+    AND tablename IN ('usuarios', 'denuncias', 'mensagens_capturadas', 'votos_guardioes', 'servidores_premium', 'configuracoes_servidor', 'mensagens_guardioes', 'jobs_agendados', 'broadcasts', 'broadcast_destinatarios', 'servidores_bot', 'usuarios_discord_cache', 'denuncias_daily_rollup', 'denuncias_arquivo')
 ORDER BY tablename;
@@ -0,0 +1,16 @@
+-- Migração: Metadados estruturados dos anexos em mensagens_capturadas
+-- Descrição: Adiciona a coluna anexos (JSONB) preenchida pela captura de evidências.
+-- A coluna anexos_urls continua sendo preenchida para as telas existentes.
+
+ALTER TABLE mensagens_capturadas ADD COLUMN IF NOT EXISTS anexos JSONB DEFAULT '[]'::jsonb NOT NULL;
+
+COMMENT ON COLUMN mensagens_capturadas.anexos IS 'Metadados dos anexos: [{id, filename, url, content_type, size}]';
+
+-- Converte as URLs já capturadas para o formato estruturado
+UPDATE mensagens_capturadas
+SET anexos = (
+    SELECT COALESCE(jsonb_agg(jsonb_build_object('url', url)), '[]'::jsonb)
+    FROM unnest(string_to_array(anexos_urls, ',')) AS url
+    WHERE url <> ''
+)
+WHERE anexos_urls IS NOT NULL AND anexos_urls <> '' AND anexos = '[]'::jsonb;
@@ -0,0 +1,40 @@
+-- Migração para Broadcasts - Sistema Guardião BETA
+-- Envios em massa do painel admin executados em background pelo bot, com progresso persistido
+
+-- Tabela de envios em massa do painel admin (mensagens enviadas pelo bot)
+CREATE TABLE IF NOT EXISTS broadcasts (
+    id BIGSERIAL PRIMARY KEY,
+    alvo VARCHAR(20) NOT NULL, -- user, guardians, moderators, administrators, server
+    id_alvo BIGINT, -- Usuário ou servidor dos alvos individuais
+    titulo VARCHAR(256) NOT NULL,
+    conteudo TEXT NOT NULL,
+    solicitado_por BIGINT NOT NULL,
+    status VARCHAR(20) DEFAULT 'Pendente' NOT NULL, -- Pendente, Enviando, Concluido
+    total INTEGER DEFAULT 0 NOT NULL,
+    enviados INTEGER DEFAULT 0 NOT NULL,
+    falhas INTEGER DEFAULT 0 NOT NULL,
+    bloqueado_ate TIMESTAMP, -- Fim do lease de quem está enviando
+    data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    data_inicio TIMESTAMP,
+    data_conclusao TIMESTAMP
+);
+
+-- Destinatários de cada envio (checkpoint do progresso)
+CREATE TABLE IF NOT EXISTS broadcast_destinatarios (
+    id_broadcast BIGINT NOT NULL REFERENCES broadcasts(id) ON DELETE CASCADE,
+    id_destino BIGINT NOT NULL, -- Usuário (DM) ou servidor
+    status VARCHAR(20) DEFAULT 'Pendente' NOT NULL, -- Pendente, Enviado, Falhou
+    erro TEXT,
+    data_envio TIMESTAMP,
+    PRIMARY KEY (id_broadcast, id_destino)
+);
+
+-- Índices parciais: só o que o executor ainda precisa enviar
+CREATE INDEX IF NOT EXISTS idx_broadcasts_abertos ON broadcasts(id) WHERE status IN ('Pendente', 'Enviando');
+CREATE INDEX IF NOT EXISTS idx_broadcast_destinatarios_pendentes ON broadcast_destinatarios(id_broadcast, id_destino) WHERE status = 'Pendente';
+
+-- Comentários para documentação
+COMMENT ON TABLE broadcasts IS 'Mensagens em massa solicitadas pelo painel admin';
+COMMENT ON TABLE broadcast_destinatarios IS 'Destinatários e progresso de cada broadcast';
+COMMENT ON COLUMN broadcasts.bloqueado_ate IS 'Lease: broadcasts Enviando com lease vencido são retomados';
+COMMENT ON COLUMN broadcast_destinatarios.status IS 'Status: Pendente, Enviado, Falhou';
@@ -0,0 +1,57 @@
+-- Migração para Estatísticas Diárias dos Servidores - Sistema Guardião BETA
+-- O painel do servidor soma esta tabela em vez de agregar todas as denúncias a cada carregamento
+-- Depois de aplicar, preencha o histórico com: python backfill_rollups.py
+
+-- Contagem de denúncias por servidor, dia de criação, status e resultado
+CREATE TABLE IF NOT EXISTS denuncias_daily_rollup (
+    id_servidor BIGINT NOT NULL,
+    dia DATE NOT NULL, -- DATE(denuncias.data_criacao)
+    status VARCHAR(50) NOT NULL,
+    resultado_final VARCHAR(50) DEFAULT '' NOT NULL, -- '' = sem resultado (denúncia não finalizada)
+    quantidade INTEGER DEFAULT 0 NOT NULL,
+    quantidade_premium INTEGER DEFAULT 0 NOT NULL,
+    PRIMARY KEY (id_servidor, dia, status, resultado_final)
+);
+
+-- Aplica a mudança de cada denúncia na linha do seu (servidor, dia, status, resultado)
+-- Roda na mesma transação da escrita: criação, finalização, apelação e exclusão pelo admin
+CREATE OR REPLACE FUNCTION denuncias_rollup_apply() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE denuncias_daily_rollup
+        SET quantidade = quantidade - 1,
+            quantidade_premium = quantidade_premium - OLD.e_premium::int
+        WHERE id_servidor = OLD.id_servidor
+            AND dia = OLD.data_criacao::date
+            AND status = OLD.status
+            AND resultado_final = COALESCE(OLD.resultado_final, '');
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO denuncias_daily_rollup (id_servidor, dia, status, resultado_final, quantidade, quantidade_premium)
+        VALUES (NEW.id_servidor, NEW.data_criacao::date, NEW.status, COALESCE(NEW.resultado_final, ''), 1, NEW.e_premium::int)
+        ON CONFLICT (id_servidor, dia, status, resultado_final) DO UPDATE
+        SET quantidade = denuncias_daily_rollup.quantidade + 1,
+            quantidade_premium = denuncias_daily_rollup.quantidade_premium + EXCLUDED.quantidade_premium;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_denuncias_rollup_insert_delete ON denuncias;
+CREATE TRIGGER trg_denuncias_rollup_insert_delete
+    AFTER INSERT OR DELETE ON denuncias
+    FOR EACH ROW EXECUTE FUNCTION denuncias_rollup_apply();
+
+-- Votos (votos_peso/votos_count) não mudam a agregação e não disparam o trigger
+DROP TRIGGER IF EXISTS trg_denuncias_rollup_update ON denuncias;
+CREATE TRIGGER trg_denuncias_rollup_update
+    AFTER UPDATE OF id_servidor, data_criacao, status, resultado_final, e_premium ON denuncias
+    FOR EACH ROW
+    WHEN ((OLD.id_servidor, OLD.data_criacao::date, OLD.status, OLD.resultado_final, OLD.e_premium)
+          IS DISTINCT FROM (NEW.id_servidor, NEW.data_criacao::date, NEW.status, NEW.resultado_final, NEW.e_premium))
+    EXECUTE FUNCTION denuncias_rollup_apply();
+
+-- Comentários para documentação
+COMMENT ON TABLE denuncias_daily_rollup IS 'Denúncias por servidor/dia/status/resultado (mantida por trigger em denuncias)';
@@ -0,0 +1,31 @@
+-- Migração para Jobs Agendados - Sistema Guardião BETA
+-- Adiciona tabela persistente para ações atrasadas (unban, captcha, inatividade)
+
+-- Tabela de jobs agendados
+CREATE TABLE IF NOT EXISTS jobs_agendados (
+    id BIGSERIAL PRIMARY KEY,
+    tipo VARCHAR(50) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    executar_em TIMESTAMP NOT NULL,
+    status VARCHAR(20) DEFAULT 'Pendente' NOT NULL, -- Pendente, Executando, Concluido, Falhou
+    tentativas INTEGER DEFAULT 0 NOT NULL,
+    max_tentativas INTEGER DEFAULT 5 NOT NULL,
+    ultimo_erro TEXT,
+    bloqueado_ate TIMESTAMP, -- Fim do lease de quem está executando
+    chave_unica VARCHAR(255) UNIQUE, -- Evita agendar o mesmo job duas vezes
+    data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    data_conclusao TIMESTAMP
+);
+
+-- Índices parciais: só os jobs que o agendador ainda precisa olhar ou limpar
+CREATE INDEX IF NOT EXISTS idx_jobs_agendados_pendentes ON jobs_agendados(executar_em) WHERE status = 'Pendente';
+CREATE INDEX IF NOT EXISTS idx_jobs_agendados_executando ON jobs_agendados(bloqueado_ate) WHERE status = 'Executando';
+CREATE INDEX IF NOT EXISTS idx_jobs_agendados_finalizados ON jobs_agendados(data_conclusao) WHERE status IN ('Concluido', 'Falhou');
+
+-- Comentários para documentação
+COMMENT ON TABLE jobs_agendados IS 'Ações atrasadas persistentes executadas pelo agendador de jobs';
+COMMENT ON COLUMN jobs_agendados.tipo IS 'Tipo do job: unban, captcha_expirado, penalidade_inatividade';
+COMMENT ON COLUMN jobs_agendados.payload IS 'Parâmetros do job em JSON';
+COMMENT ON COLUMN jobs_agendados.status IS 'Status: Pendente, Executando, Concluido, Falhou';
+COMMENT ON COLUMN jobs_agendados.bloqueado_ate IS 'Lease: jobs Executando com lease vencido são reivindicados de novo';
+COMMENT ON COLUMN jobs_agendados.chave_unica IS 'Chave de deduplicação (ex: unban:servidor:usuario)';
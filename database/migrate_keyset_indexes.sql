@@ -0,0 +1,6 @@
+-- Migração para Paginação por Cursor - Sistema Guardião BETA
+-- Índices das listas do painel ordenadas por (data, id): cada página é uma busca no índice, sem OFFSET
+
+CREATE INDEX IF NOT EXISTS idx_denuncias_keyset ON denuncias(data_criacao DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_denuncias_servidor_keyset ON denuncias(id_servidor, data_criacao DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_usuarios_keyset ON usuarios(data_criacao_registro DESC, id_discord DESC);
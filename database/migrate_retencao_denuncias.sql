@@ -0,0 +1,65 @@
+-- Migração para Retenção de Denúncias - Sistema Guardião BETA
+-- Denúncias finalizadas antigas saem das tabelas quentes (ver utils/report_retention.py)
+-- Requer database/migrate_denuncias_rollup.sql aplicada antes
+
+-- Denúncias arquivadas: uma linha por denúncia, com votos e mensagens capturadas em JSONB
+-- (valores grandes são comprimidos pelo TOAST; 100 mensagens viram um único valor comprimido)
+CREATE TABLE IF NOT EXISTS denuncias_arquivo (
+    id INTEGER PRIMARY KEY, -- Mesmo id de denuncias
+    hash_denuncia VARCHAR(64) UNIQUE NOT NULL,
+    id_servidor BIGINT NOT NULL,
+    id_canal BIGINT NOT NULL,
+    id_denunciante BIGINT NOT NULL,
+    id_denunciado BIGINT NOT NULL,
+    motivo TEXT NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    data_criacao TIMESTAMP NOT NULL,
+    e_premium BOOLEAN NOT NULL,
+    resultado_final VARCHAR(50),
+    votos_peso INTEGER NOT NULL,
+    votos_count INTEGER NOT NULL,
+    votos JSONB DEFAULT '[]'::jsonb NOT NULL, -- [{id, id_guardiao, voto, data_voto}]
+    mensagens JSONB DEFAULT '[]'::jsonb NOT NULL, -- [{id, id_autor, conteudo, anexos_urls, anexos, timestamp_mensagem}]
+    data_arquivamento TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_denuncias_arquivo_denunciado ON denuncias_arquivo(id_denunciado);
+
+-- Busca das denúncias elegíveis sem ler as abertas nem as recentes
+CREATE INDEX IF NOT EXISTS idx_denuncias_retencao ON denuncias(data_criacao) WHERE status = 'Finalizada';
+
+-- Busca das punições inativas antigas, também removidas pela retenção
+CREATE INDEX IF NOT EXISTS idx_logs_punicoes_retencao ON logs_punicoes(data_punicao) WHERE ativa = false;
+
+-- A retenção remove denúncias sem alterar as estatísticas: com guardiao.retencao = 'on'
+-- na transação o trigger não desconta as linhas removidas de denuncias_daily_rollup
+CREATE OR REPLACE FUNCTION denuncias_rollup_apply() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' AND current_setting('guardiao.retencao', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE denuncias_daily_rollup
+        SET quantidade = quantidade - 1,
+            quantidade_premium = quantidade_premium - OLD.e_premium::int
+        WHERE id_servidor = OLD.id_servidor
+            AND dia = OLD.data_criacao::date
+            AND status = OLD.status
+            AND resultado_final = COALESCE(OLD.resultado_final, '');
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO denuncias_daily_rollup (id_servidor, dia, status, resultado_final, quantidade, quantidade_premium)
+        VALUES (NEW.id_servidor, NEW.data_criacao::date, NEW.status, COALESCE(NEW.resultado_final, ''), 1, NEW.e_premium::int)
+        ON CONFLICT (id_servidor, dia, status, resultado_final) DO UPDATE
+        SET quantidade = denuncias_daily_rollup.quantidade + 1,
+            quantidade_premium = denuncias_daily_rollup.quantidade_premium + EXCLUDED.quantidade_premium;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Comentários para documentação
+COMMENT ON TABLE denuncias_arquivo IS 'Denúncias finalizadas antigas com votos e evidências compactados (retenção)';
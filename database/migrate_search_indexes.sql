@@ -0,0 +1,19 @@
+-- Migração para Índices de Busca - Sistema Guardião BETA
+-- Filtros avançados das denúncias no painel (web/search.py) sem leitura completa das tabelas
+-- Verifique com: python check_search_indexes.py
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Trechos de nomes, motivo e hash (ILIKE '%...%')
+CREATE INDEX IF NOT EXISTS idx_usuarios_username_trgm ON usuarios USING GIN (username gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_usuarios_display_name_trgm ON usuarios USING GIN (display_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_denuncias_motivo_trgm ON denuncias USING GIN (motivo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_denuncias_hash_trgm ON denuncias USING GIN (hash_denuncia gin_trgm_ops);
+
+-- Palavras do motivo (full-text em português)
+CREATE INDEX IF NOT EXISTS idx_denuncias_motivo_fts ON denuncias USING GIN (to_tsvector('portuguese', motivo));
+
+-- Prefixo do hash (LIKE 'abc%') e IDs exatos de denunciado/denunciante
+CREATE INDEX IF NOT EXISTS idx_denuncias_hash_prefix ON denuncias(hash_denuncia varchar_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_denuncias_denunciado ON denuncias(id_denunciado);
+CREATE INDEX IF NOT EXISTS idx_denuncias_denunciante ON denuncias(id_denunciante);
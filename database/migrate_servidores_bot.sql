@@ -0,0 +1,12 @@
+-- Migração para Presença do Bot - Sistema Guardião BETA
+-- O painel consulta esta tabela em vez de chamar a API do Discord para cada servidor
+
+-- Servidores em que o bot está (mantida pelo bot a partir do gateway; lida pelo painel)
+CREATE TABLE IF NOT EXISTS servidores_bot (
+    id_servidor BIGINT PRIMARY KEY,
+    nome VARCHAR(100),
+    data_entrada TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+-- Comentários para documentação
+COMMENT ON TABLE servidores_bot IS 'Servidores do gateway do bot (sincronizada no on_ready e em entradas/saídas)';
@@ -0,0 +1,15 @@
+-- Migração para Cache de Perfis do Discord - Sistema Guardião BETA
+-- Perfis persistidos entre reinícios do painel (ativado com USER_PROFILE_PERSIST=true)
+
+-- Cache persistente de perfis do Discord exibidos no painel (opcional, USER_PROFILE_PERSIST)
+CREATE TABLE IF NOT EXISTS usuarios_discord_cache (
+    id_discord BIGINT PRIMARY KEY,
+    username VARCHAR(100),
+    global_name VARCHAR(100),
+    avatar VARCHAR(100),
+    discriminator VARCHAR(10),
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+-- Comentários para documentação
+COMMENT ON TABLE usuarios_discord_cache IS 'Perfis do Discord (nome e avatar) já buscados pelo painel';
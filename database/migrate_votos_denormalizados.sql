@@ -0,0 +1,22 @@
+-- Migração: Placar de votos denormalizado na tabela denuncias
+-- Descrição: Adiciona votos_peso/votos_count, mantidos pela transação do voto,
+-- para que o voto e a decisão não precisem somar votos_guardioes a cada clique
+
+ALTER TABLE denuncias ADD COLUMN IF NOT EXISTS votos_peso INTEGER DEFAULT 0 NOT NULL;
+ALTER TABLE denuncias ADD COLUMN IF NOT EXISTS votos_count INTEGER DEFAULT 0 NOT NULL;
+
+COMMENT ON COLUMN denuncias.votos_peso IS 'Soma dos pesos dos votos (moderador = 5, guardião = 1)';
+COMMENT ON COLUMN denuncias.votos_count IS 'Quantidade de votos recebidos';
+
+-- Preenche o placar das denúncias existentes a partir de votos_guardioes
+UPDATE denuncias d
+SET votos_peso = v.peso, votos_count = v.total
+FROM (
+    SELECT vg.id_denuncia,
+           SUM(CASE WHEN u.categoria = 'Moderador' THEN 5 ELSE 1 END) AS peso,
+           COUNT(*) AS total
+    FROM votos_guardioes vg
+    LEFT JOIN usuarios u ON u.id_discord = vg.id_guardiao
+    GROUP BY vg.id_denuncia
+) v
+WHERE d.id = v.id_denuncia;
@@ -7,6 +7,7 @@ from sqlalchemy import (
     Column, Integer, BigInteger, String, Text, Boolean, 
     DateTime, ForeignKey, UniqueConstraint
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -54,6 +55,8 @@ class Denuncia(Base):
     data_criacao = Column(DateTime, default=func.current_timestamp(), nullable=False, comment='Data da denúncia')
     e_premium = Column(Boolean, default=False, nullable=False, comment='Se é servidor premium')
     resultado_final = Column(String(50), nullable=True, comment='Resultado final da denúncia')
+    votos_peso = Column(Integer, default=0, nullable=False, comment='Soma dos pesos dos votos (moderador = 5)')
+    votos_count = Column(Integer, default=0, nullable=False, comment='Quantidade de votos recebidos')
     
     def __repr__(self):
         return f"<Denuncia(id={self.id}, hash='{self.hash_denuncia}', status='{self.status}')>"
@@ -68,6 +71,7 @@ class MensagemCapturada(Base):
     id_autor = Column(BigInteger, nullable=False, comment='ID do autor da mensagem')
     conteudo = Column(Text, nullable=False, comment='Conteúdo da mensagem')
     anexos_urls = Column(Text, nullable=True, comment='URLs dos anexos separados por vírgula')
+    anexos = Column(JSONB, default=list, nullable=False, comment='Metadados dos anexos (id, filename, url, content_type, size)')
     timestamp_mensagem = Column(DateTime, nullable=False, comment='Timestamp da mensagem original')
     
     def __repr__(self):
@@ -23,18 +23,22 @@ from flask import Flask
 from config import (
     DISCORD_CLIENT_ID, DISCORD_CLIENT_SECRET, DISCORD_TOKEN,
     POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_HOST, POSTGRES_PORT,
-    WEB_PORT, FLASK_SECRET_KEY, BOT_PREFIX,
+    FLASK_SECRET_KEY, BOT_PREFIX,
     GUARDIAO_MIN_ACCOUNT_AGE_MONTHS, TURN_POINTS_PER_HOUR,
     MAX_GUARDIANS_PER_REPORT, REQUIRED_VOTES_FOR_DECISION,
     VOTE_TIMEOUT_MINUTES, DISPENSE_COOLDOWN_MINUTES,
     INACTIVE_PENALTY_HOURS, PROVA_COOLDOWN_HOURS, PUNISHMENT_RULES
 )
 from database.connection import db_manager
-from web.auth import setup_auth
-from web.routes import setup_routes
+from utils.discord_rest import discord_rest
+from utils.guild_settings import guild_settings
+from utils.evidence_cache import evidence_cache
+from utils.bot_guilds import bot_guilds
+from utils.user_profiles import user_profiles
+from utils.event_bus import event_bus
 from web.admin_routes import setup_admin_routes
 from web.admin_routes_fixed import setup_admin_routes_fixed
-from web.admin_complete import setup_admin_complete
+from web.server import configure_app, run_development_server, run_production_server
 
 # Configuração de logging
 logging.basicConfig(
@@ -109,7 +113,9 @@ class GuardiaoBot:
             'cogs.guardiao',
             'cogs.stats',
             'cogs.moderacao',
-            'cogs.captcha_system'
+            'cogs.captcha_system',
+            'cogs.agendador',
+            'cogs.eventos'
         ]
         
         for cog in cogs_to_load:
@@ -146,6 +152,9 @@ class GuardiaoBot:
             # Inicializa banco de dados
             await self.initialize_database()
             
+            # Presença do bot consultada pelo painel (/servers)
+            await bot_guilds.sync(self.bot.guilds)
+            
             # Inicia background tasks
             self.start_background_tasks()
         
@@ -190,6 +199,7 @@ class GuardiaoBot:
         async def on_guild_join(guild):
             """Evento quando o bot entra em um servidor"""
             logger.info(f'Bot adicionado ao servidor: {guild.name} (ID: {guild.id})')
+            await bot_guilds.add(guild)
             
             # Envia mensagem de boas-vindas
             try:
@@ -233,6 +243,7 @@ class GuardiaoBot:
         async def on_guild_remove(guild):
             """Evento quando o bot sai de um servidor"""
             logger.info(f'Bot removido do servidor: {guild.name} (ID: {guild.id})')
+            await bot_guilds.remove(guild.id)
         
         @self.bot.event
         async def on_application_command_error(ctx, error):
@@ -287,6 +298,11 @@ class GuardiaoBot:
         try:
             await self.db_manager.initialize_pool()
             
+            # Eventos publicados pelo painel web (invalidação de cache, broadcasts, banimentos)
+            guild_settings.subscribe()
+            evidence_cache.subscribe()
+            await event_bus.start()
+            
             # Cria as tabelas se não existirem
             tables_created = await self.db_manager.create_tables()
             if tables_created:
@@ -305,35 +321,11 @@ class GuardiaoBot:
     def setup_web_app(self):
         """Configura a aplicação web Flask"""
         try:
-            # Configura autenticação
-            setup_auth(self.web_app)
+            # Autenticação, rotas e APIs gerais (as mesmas dos workers do --web-only)
+            configure_app(self.web_app)
             
-            # Configura rotas
-            logger.info("🔧 Configurando rotas principais...")
-            try:
-                setup_routes(self.web_app)
-                logger.info("✅ Rotas principais configuradas")
-            except Exception as e:
-                logger.error(f"❌ Erro ao configurar rotas principais: {e}")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
-            
-            # Configura painel admin completo (sistema principal)
-            logger.info("🔧 Configurando painel admin completo...")
-            setup_admin_complete(self.web_app)
-            logger.info("✅ Painel admin completo configurado")
-
-            # NOTA: As rotas admin principais estão definidas em routes.py
-            # Os outros sistemas (admin_routes.py, admin_routes_fixed.py) são backups
-            
-            # Lista todas as rotas registradas
-            with self.web_app.app_context():
-                all_routes = [str(rule) for rule in self.web_app.url_map.iter_rules()]
-                admin_routes = [route for route in all_routes if '/admin' in route]
-                logger.info(f"📋 Total de rotas registradas: {len(all_routes)}")
-                logger.info(f"📋 Rotas admin registradas: {len(admin_routes)}")
-                for route in admin_routes:
-                    logger.info(f"  - {route}")
+            # Perfis do Discord exibidos no painel saem primeiro do cache do gateway
+            user_profiles.attach_bot(self.bot)
             
             # Adiciona rota para status do bot
             @self.web_app.route('/api/bot/status')
@@ -343,31 +335,11 @@ class GuardiaoBot:
                     'guilds': len(self.bot.guilds),
                     'users': len(self.bot.users),
                     'uptime': str(datetime.now(timezone.utc) - self.start_time),
-                    'stats': self.stats
+                    'stats': self.stats,
+                    'discord_rest': discord_rest.metrics_snapshot(),
+                    'user_profiles': user_profiles.metrics_snapshot()
                 }
             
-            # Adiciona rota para estatísticas gerais
-            @self.web_app.route('/api/stats')
-            async def general_stats():
-                try:
-                    if not self.db_manager.pool:
-                        return {'error': 'Database not initialized'}, 500
-                    
-                    stats_query = """
-                        SELECT 
-                            (SELECT COUNT(*) FROM usuarios) as total_usuarios,
-                            (SELECT COUNT(*) FROM usuarios WHERE categoria = 'Guardião') as total_guardioes,
-                            (SELECT COUNT(*) FROM denuncias) as total_denuncias,
-                            (SELECT COUNT(DISTINCT id_servidor) FROM denuncias) as total_servidores
-                    """
-                    stats = self.db_manager.execute_query(stats_query)
-                    
-                    return stats[0] if stats else {}
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao buscar estatísticas: {e}")
-                    return {'error': 'Internal server error'}, 500
-            
             logger.info("Aplicação web configurada com sucesso")
             
         except Exception as e:
@@ -377,28 +349,31 @@ class GuardiaoBot:
     def run_web_app(self):
         """Executa a aplicação web em thread separada"""
         try:
-            port = int(WEB_PORT)
-            host = '0.0.0.0'  # Para funcionar na Discloud
-            
-            logger.info(f"Iniciando servidor web na porta {port}")
-            self.web_app.run(host=host, port=port, debug=False, threaded=True)
+            run_development_server(self.web_app)
             
         except Exception as e:
             logger.error(f"Erro ao executar aplicação web: {e}")
             raise
     
-    async def run(self):
-        """Executa o sistema completo"""
+    async def run(self, with_web: bool = True):
+        """
+        Executa o sistema completo
+        
+        Args:
+            with_web: Sobe o painel numa thread deste processo (False com --bot-only,
+                quando o painel roda separado em `python main.py --web-only`)
+        """
         try:
-            # Configura aplicação web
-            self.setup_web_app()
-            
-            # Inicia aplicação web em thread separada
-            web_thread = threading.Thread(target=self.run_web_app, daemon=True)
-            web_thread.start()
-            
-            # Aguarda um pouco para a web app inicializar
-            await asyncio.sleep(2)
+            if with_web:
+                # Configura aplicação web
+                self.setup_web_app()
+                
+                # Inicia aplicação web em thread separada
+                web_thread = threading.Thread(target=self.run_web_app, daemon=True)
+                web_thread.start()
+                
+                # Aguarda um pouco para a web app inicializar
+                await asyncio.sleep(2)
             
             # Configura bot
             await self.setup_bot()
@@ -423,8 +398,8 @@ class GuardiaoBot:
             # Fecha conexões do banco
             await self.db_manager.close_pool()
             
-            # Fecha sessão HTTP (se existir)
-            pass
+            # Fecha a sessão HTTP do cliente REST do Discord
+            await discord_rest.close()
             
             logger.info("Sistema encerrado com sucesso")
             
@@ -473,17 +448,17 @@ async def main():
             # Modo teste
             success = await run_tests()
             sys.exit(0 if success else 1)
-        elif sys.argv[1] == '--web-only':
-            # Modo apenas web
+        elif sys.argv[1] == '--bot-only':
+            # Modo apenas bot (painel em outro processo com --web-only)
             guardiao = GuardiaoBot()
-            guardiao.setup_web_app()
-            guardiao.run_web_app()
+            await guardiao.run(with_web=False)
             return
         elif sys.argv[1] == '--help':
             print("Sistema Guardião BETA - Opções:")
             print("  python main.py          - Executa o sistema completo")
             print("  python main.py --test   - Executa testes")
-            print("  python main.py --web-only - Executa apenas a aplicação web")
+            print("  python main.py --web-only - Executa apenas a aplicação web (gunicorn, WEB_WORKERS x WEB_THREADS)")
+            print("  python main.py --bot-only - Executa apenas o bot (sem o painel embutido)")
             print("  python main.py --help   - Mostra esta ajuda")
             sys.exit(0)
     
@@ -500,8 +475,12 @@ if __name__ == "__main__":
             # Windows
             asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
         
-        # Executa o sistema
-        asyncio.run(main())
+        if sys.argv[1:2] == ['--web-only']:
+            # Modo apenas web: fora de qualquer event loop, os workers são processos próprios
+            run_production_server()
+        else:
+            # Executa o sistema
+            asyncio.run(main())
         
     except KeyboardInterrupt:
         logger.info("Sistema interrompido pelo usuário")
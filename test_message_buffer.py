@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Testes do buffer de mensagens por canal (utils/message_buffer.py)
+
+Execute com: python -m pytest test_message_buffer.py
+"""
+
+from datetime import datetime, timedelta, timezone
+from utils.message_buffer import ChannelMessageBuffer, BufferedMessage
+
+CHANNEL_ID = 1234
+
+
+def make_buffer() -> ChannelMessageBuffer:
+    """Buffer que escuta o gateway há mais tempo que a janela do /report"""
+    buffer = ChannelMessageBuffer(per_channel=100, max_age=timedelta(hours=24), max_messages=1000)
+    buffer.start_listening()
+    buffer.listening_since -= timedelta(hours=48)
+    return buffer
+
+
+def make_record(message_id: int, created_at: datetime) -> BufferedMessage:
+    return BufferedMessage(message_id, 42, f"mensagem {message_id}", (), created_at)
+
+
+def test_snapshot_returns_messages_of_the_report_window():
+    """A janela de 24h do /report é atendida pelo buffer"""
+    buffer = make_buffer()
+    now = datetime.now(timezone.utc)
+    for message_id in range(5):
+        buffer.record(CHANNEL_ID, make_record(message_id, now + timedelta(seconds=message_id)))
+
+    messages = buffer.snapshot(CHANNEL_ID, now - timedelta(hours=24), 100)
+
+    assert messages is not None
+    assert [record.id for record in messages] == [0, 1, 2, 3, 4]
+    assert buffer.hits == 1 and buffer.misses == 0
+
+
+def test_record_prunes_messages_older_than_max_age():
+    """Mensagens fora da janela máxima saem do buffer e do total global"""
+    buffer = make_buffer()
+    now = datetime.now(timezone.utc)
+    buffer.record(CHANNEL_ID, make_record(1, now - timedelta(hours=30)))
+    buffer.record(CHANNEL_ID, make_record(2, now))
+
+    assert len(buffer) == 1
+    messages = buffer.snapshot(CHANNEL_ID, now - timedelta(hours=24), 100)
+    assert [record.id for record in messages] == [2]
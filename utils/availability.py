@@ -0,0 +1,194 @@
+"""
+Índice de Disponibilidade de Guardiões - Sistema Guardião BETA
+Mantém em memória quem está em serviço, cooldowns e quem já recebeu cada denúncia
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from database.connection import db_manager
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Categorias que recebem denúncias
+DISTRIBUTION_CATEGORIES = ('Guardião', 'Moderador')
+
+
+class GuardianState:
+    """Estado de um Guardião/Moderador em serviço"""
+
+    __slots__ = ('id_discord', 'categoria', 'cooldown_dispensa', 'cooldown_inativo')
+
+    def __init__(self, id_discord: int, categoria: str,
+                 cooldown_dispensa: Optional[datetime] = None,
+                 cooldown_inativo: Optional[datetime] = None):
+        self.id_discord = id_discord
+        self.categoria = categoria
+        self.cooldown_dispensa = cooldown_dispensa
+        self.cooldown_inativo = cooldown_inativo
+
+    def is_available(self, now: datetime) -> bool:
+        """Retorna se não há cooldown ativo"""
+        if self.cooldown_dispensa and self.cooldown_dispensa > now:
+            return False
+        if self.cooldown_inativo and self.cooldown_inativo > now:
+            return False
+        return True
+
+
+class GuardianAvailabilityIndex:
+    """
+    Índice em memória de disponibilidade dos Guardiões
+
+    É atualizado pelos eventos do bot (/turno, dispensa, inatividade, captcha,
+    votos e mensagens enviadas) e reconciliado periodicamente com o PostgreSQL,
+    de modo que a distribuição não precise consultar o banco para saber quem
+    pode receber cada denúncia.
+    """
+
+    def __init__(self):
+        self._on_duty: Dict[int, GuardianState] = {}
+        # {id_denuncia: {id_guardiao}} - quem já votou
+        self._voted: Dict[int, Set[int]] = {}
+        # {id_denuncia: {id_guardiao: timeout_expira}} - mensagens 'Enviada' ativas
+        self._sent: Dict[int, Dict[int, datetime]] = {}
+        self.loaded = False
+        self.last_reconcile: Optional[datetime] = None
+
+    # ==================== EVENTOS ====================
+    def set_on_duty(self, id_discord: int, categoria: str,
+                    cooldown_dispensa: Optional[datetime] = None,
+                    cooldown_inativo: Optional[datetime] = None):
+        """Registra entrada em serviço"""
+        if categoria not in DISTRIBUTION_CATEGORIES:
+            return
+        self._on_duty[id_discord] = GuardianState(id_discord, categoria, cooldown_dispensa, cooldown_inativo)
+
+    def set_off_duty(self, id_discord: int):
+        """Registra saída de serviço (turno, captcha expirado, banimento)"""
+        self._on_duty.pop(id_discord, None)
+
+    def set_dispense_cooldown(self, id_discord: int, until: datetime):
+        """Registra cooldown de dispensa"""
+        state = self._on_duty.get(id_discord)
+        if state:
+            state.cooldown_dispensa = until
+
+    def set_inactive_cooldown(self, id_discord: int, until: datetime):
+        """Registra cooldown de inatividade"""
+        state = self._on_duty.get(id_discord)
+        if state:
+            state.cooldown_inativo = until
+
+    def message_sent(self, id_denuncia: int, id_guardiao: int, expires_at: datetime):
+        """Registra que a denúncia foi enviada ao Guardião"""
+        self._sent.setdefault(id_denuncia, {})[id_guardiao] = expires_at
+
+    def message_closed(self, id_denuncia: int, id_guardiao: int):
+        """Registra que a mensagem deixou de estar 'Enviada' (atendida, dispensada ou expirada)"""
+        sent = self._sent.get(id_denuncia)
+        if sent:
+            sent.pop(id_guardiao, None)
+            if not sent:
+                self._sent.pop(id_denuncia, None)
+
+    def vote_recorded(self, id_denuncia: int, id_guardiao: int):
+        """Registra o voto de um Guardião"""
+        self._voted.setdefault(id_denuncia, set()).add(id_guardiao)
+        self.message_closed(id_denuncia, id_guardiao)
+
+    def drop_report(self, id_denuncia: int):
+        """Descarta o estado de uma denúncia finalizada"""
+        self._voted.pop(id_denuncia, None)
+        self._sent.pop(id_denuncia, None)
+
+    # ==================== CONSULTAS ====================
+    def available(self, categoria: str, now: Optional[datetime] = None) -> List[int]:
+        """Lista os IDs em serviço e sem cooldown da categoria informada"""
+        now = now or datetime.utcnow()
+        return [
+            state.id_discord for state in self._on_duty.values()
+            if state.categoria == categoria and state.is_available(now)
+        ]
+
+    def count_on_duty(self, categoria: str) -> int:
+        """Quantidade em serviço da categoria (com ou sem cooldown)"""
+        return sum(1 for state in self._on_duty.values() if state.categoria == categoria)
+
+    def excluded_for(self, id_denuncia: int, now: Optional[datetime] = None) -> Set[int]:
+        """Quem não pode receber a denúncia: já votou ou tem mensagem ativa"""
+        now = now or datetime.utcnow()
+        excluded = set(self._voted.get(id_denuncia, ()))
+        for id_guardiao, expires_at in self._sent.get(id_denuncia, {}).items():
+            if expires_at > now:
+                excluded.add(id_guardiao)
+        return excluded
+
+    def candidates_for(self, id_denuncia: int, categoria: str = 'Guardião') -> List[int]:
+        """Quem pode receber a denúncia agora"""
+        now = datetime.utcnow()
+        excluded = self.excluded_for(id_denuncia, now)
+        return [id_discord for id_discord in self.available(categoria, now) if id_discord not in excluded]
+
+    # ==================== RECONCILIAÇÃO ====================
+    async def reconcile(self):
+        """Recarrega o índice a partir do PostgreSQL"""
+        try:
+            staff_query = """
+                SELECT id_discord, categoria, cooldown_dispensa, cooldown_inativo
+                FROM usuarios
+                WHERE em_servico = TRUE AND categoria = ANY($1::text[])
+            """
+            staff = await db_manager.execute_query(staff_query, list(DISTRIBUTION_CATEGORIES))
+
+            votes_query = """
+                SELECT vg.id_denuncia, vg.id_guardiao
+                FROM votos_guardioes vg
+                JOIN denuncias d ON d.id = vg.id_denuncia
+                WHERE d.status IN ('Pendente', 'Em Análise', 'Apelada')
+            """
+            votes = await db_manager.execute_query(votes_query)
+
+            sent_rows = []
+            table_exists = await db_manager.execute_scalar(
+                "SELECT to_regclass('public.mensagens_guardioes') IS NOT NULL"
+            )
+            if table_exists:
+                sent_query = """
+                    SELECT id_denuncia, id_guardiao, timeout_expira
+                    FROM mensagens_guardioes
+                    WHERE status = 'Enviada' AND timeout_expira > NOW()
+                """
+                sent_rows = await db_manager.execute_query(sent_query)
+
+            on_duty = {
+                row['id_discord']: GuardianState(
+                    row['id_discord'], row['categoria'], row['cooldown_dispensa'], row['cooldown_inativo']
+                )
+                for row in staff
+            }
+            voted: Dict[int, Set[int]] = {}
+            for row in votes:
+                voted.setdefault(row['id_denuncia'], set()).add(row['id_guardiao'])
+            sent: Dict[int, Dict[int, datetime]] = {}
+            for row in sent_rows:
+                sent.setdefault(row['id_denuncia'], {})[row['id_guardiao']] = row['timeout_expira']
+
+            if not table_exists:
+                # Sem a tabela as mensagens ativas só existem em memória
+                sent = self._sent
+
+            if self.loaded and set(on_duty) != set(self._on_duty):
+                logger.info(f"🔄 Índice de disponibilidade divergente do banco: {len(self._on_duty)} → {len(on_duty)} em serviço")
+
+            self._on_duty, self._voted, self._sent = on_duty, voted, sent
+            self.loaded = True
+            self.last_reconcile = datetime.utcnow()
+
+        except Exception as e:
+            logger.error(f"Erro ao reconciliar índice de disponibilidade: {e}")
+
+
+# Instância global do índice de disponibilidade
+availability_index = GuardianAvailabilityIndex()
@@ -0,0 +1,100 @@
+"""
+Presença do Bot nos Servidores - Sistema Guardião BETA
+Espelho em servidores_bot do conjunto de servidores do gateway
+
+O bot sincroniza a tabela inteira no on_ready e a atualiza a cada entrada e
+saída; o painel consulta a tabela (junto com as estatísticas, em uma query)
+em vez de chamar GET /guilds/{id}/channels para cada servidor do usuário.
+"""
+
+import logging
+from typing import Dict, Iterable
+from database.connection import db_manager
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Presença e denúncias abertas de vários servidores em um único round trip
+GUILDS_OVERVIEW_QUERY = """
+    SELECT g.id AS id_servidor,
+           EXISTS (SELECT 1 FROM servidores_bot sb WHERE sb.id_servidor = g.id) AS bot_presente,
+           COUNT(d.id) AS total,
+           COUNT(d.id) FILTER (WHERE d.status = 'Pendente') AS pendentes,
+           COUNT(d.id) FILTER (WHERE d.status = 'Em Análise') AS analise
+    FROM unnest($1::bigint[]) AS g(id)
+    LEFT JOIN denuncias d ON d.id_servidor = g.id AND d.status IN ('Pendente', 'Em Análise')
+    GROUP BY g.id
+"""
+
+
+class BotGuildRegistry:
+    """Mantém servidores_bot em dia com o gateway e a consulta pelo painel"""
+
+    # ==================== BOT ====================
+    async def sync(self, guilds: Iterable) -> bool:
+        """
+        Substitui o conteúdo da tabela pelos servidores atuais do gateway
+
+        Args:
+            guilds: bot.guilds
+
+        Returns:
+            True se a sincronização foi gravada
+        """
+        guilds = list(guilds)
+        ids = [guild.id for guild in guilds]
+        names = [guild.name[:100] for guild in guilds]
+        try:
+            await db_manager.execute_transaction([
+                ("DELETE FROM servidores_bot WHERE id_servidor <> ALL($1::bigint[])", (ids,)),
+                ("""
+                    INSERT INTO servidores_bot (id_servidor, nome)
+                    SELECT * FROM unnest($1::bigint[], $2::text[])
+                    ON CONFLICT (id_servidor) DO UPDATE SET nome = EXCLUDED.nome
+                """, (ids, names)),
+            ])
+            logger.info(f"🌐 Presença do bot sincronizada: {len(ids)} servidores")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao sincronizar servidores do bot: {e}")
+            return False
+
+    async def add(self, guild) -> None:
+        """Registra a entrada do bot em um servidor"""
+        try:
+            await db_manager.execute_command("""
+                INSERT INTO servidores_bot (id_servidor, nome) VALUES ($1, $2)
+                ON CONFLICT (id_servidor) DO UPDATE SET nome = EXCLUDED.nome
+            """, guild.id, guild.name[:100])
+        except Exception as e:
+            logger.error(f"Erro ao registrar servidor {guild.id}: {e}")
+
+    async def remove(self, guild_id: int) -> None:
+        """Registra a saída do bot de um servidor"""
+        try:
+            await db_manager.execute_command("DELETE FROM servidores_bot WHERE id_servidor = $1", guild_id)
+        except Exception as e:
+            logger.error(f"Erro ao remover servidor {guild_id}: {e}")
+
+    # ==================== PAINEL ====================
+    def overview_sync(self, guild_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Presença do bot e denúncias abertas de cada servidor (uma query)
+
+        Args:
+            guild_ids: Servidores a consultar
+
+        Returns:
+            Dicionário id_servidor -> {bot_presente, total, pendentes, analise};
+            servidores ausentes do resultado (erro no banco) devem ser tratados
+            como sem bot e sem denúncias
+        """
+        guild_ids = [int(guild_id) for guild_id in guild_ids]
+        if not guild_ids:
+            return {}
+        rows = db_manager.execute_query_sync(GUILDS_OVERVIEW_QUERY, guild_ids)
+        return {row['id_servidor']: row for row in rows}
+
+
+# Instância global do registro de servidores do bot
+bot_guilds = BotGuildRegistry()
@@ -0,0 +1,257 @@
+"""
+Executor de Broadcasts - Sistema Guardião BETA
+Mensagens em massa do painel admin enviadas em background pelo bot
+
+O painel grava o broadcast e seus destinatários (`create_sync`) e publica
+BROADCAST_SOLICITADO. O bot reivindica o broadcast com um lease, envia os
+destinatários pendentes em lotes concorrentes (o cliente REST respeita os
+rate limits do Discord) e grava o resultado de cada lote antes do próximo.
+Se o processo cair, o lease vence e o envio continua do último lote gravado.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+from database.connection import db_manager
+from utils.discord_rest import discord_rest
+from config import BROADCAST_BATCH_SIZE, DM_FANOUT_CONCURRENCY, JOB_LEASE_MINUTES
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Categorias que recebem cada tipo de broadcast
+BROADCAST_CATEGORIES = {
+    'guardians': ('Guardião', 'Moderador', 'Administrador'),
+    'moderators': ('Moderador', 'Administrador'),
+    'administrators': ('Administrador',),
+}
+BROADCAST_TARGETS = ('user', 'server') + tuple(BROADCAST_CATEGORIES)
+
+BROADCAST_COLUMNS = """
+    id, alvo, id_alvo, titulo, status, total, enviados, falhas,
+    data_criacao, data_inicio, data_conclusao
+"""
+
+
+def broadcast_progress(row: Dict) -> Dict:
+    """Linha de broadcasts no formato JSON do painel (com percentual)"""
+    done = row['enviados'] + row['falhas']
+    return {
+        'id': row['id'],
+        'alvo': row['alvo'],
+        'id_alvo': str(row['id_alvo']) if row['id_alvo'] else None,
+        'titulo': row['titulo'],
+        'status': row['status'],
+        'total': row['total'],
+        'enviados': row['enviados'],
+        'falhas': row['falhas'],
+        'progresso': round(done * 100 / row['total'], 1) if row['total'] else 100.0,
+        'data_criacao': row['data_criacao'].isoformat() if row['data_criacao'] else None,
+        'data_inicio': row['data_inicio'].isoformat() if row['data_inicio'] else None,
+        'data_conclusao': row['data_conclusao'].isoformat() if row['data_conclusao'] else None,
+    }
+
+
+class BroadcastRunner:
+    """Envia broadcasts pendentes com checkpoint por lote"""
+
+    def __init__(self):
+        self._running: Dict[int, asyncio.Task] = {}
+
+    # ==================== PAINEL (síncrono) ====================
+    def create_sync(self, alvo: str, id_alvo: Optional[int], titulo: str, conteudo: str,
+                    solicitado_por: int) -> Tuple[Optional[int], int]:
+        """
+        Grava o broadcast e seus destinatários em um único comando
+
+        Args:
+            alvo: user, server ou uma chave de BROADCAST_CATEGORIES
+            id_alvo: Usuário ou servidor dos alvos individuais
+
+        Returns:
+            Tupla (id do broadcast ou None em caso de erro, total de destinatários)
+        """
+        try:
+            query = """
+                WITH destinos AS (
+                    SELECT id_discord AS id_destino FROM usuarios WHERE categoria = ANY($6::text[])
+                    UNION
+                    SELECT $2::bigint WHERE $2::bigint IS NOT NULL
+                ), novo AS (
+                    INSERT INTO broadcasts (alvo, id_alvo, titulo, conteudo, solicitado_por, total)
+                    SELECT $1, $2, $3, $4, $5, COUNT(*) FROM destinos
+                    RETURNING id, total
+                ), inseridos AS (
+                    INSERT INTO broadcast_destinatarios (id_broadcast, id_destino)
+                    SELECT novo.id, destinos.id_destino FROM novo, destinos
+                )
+                SELECT id, total FROM novo
+            """
+            row = db_manager.execute_one_sync(
+                query, alvo, id_alvo, titulo, conteudo, solicitado_por,
+                list(BROADCAST_CATEGORIES.get(alvo, ()))
+            )
+            return row['id'], row['total']
+        except Exception as e:
+            logger.error(f"Erro ao criar broadcast: {e}")
+            return None, 0
+
+    def status_sync(self, broadcast_id: int) -> Optional[Dict]:
+        """Progresso de um broadcast"""
+        row = db_manager.execute_one_sync(
+            f"SELECT {BROADCAST_COLUMNS} FROM broadcasts WHERE id = $1", broadcast_id
+        )
+        return broadcast_progress(row) if row else None
+
+    def recent_sync(self, limit: int = 20) -> List[Dict]:
+        """Broadcasts mais recentes"""
+        rows = db_manager.execute_query_sync(
+            f"SELECT {BROADCAST_COLUMNS} FROM broadcasts ORDER BY id DESC LIMIT $1", limit
+        )
+        return [broadcast_progress(row) for row in rows]
+
+    # ==================== BOT ====================
+    def start(self, broadcast_id: int):
+        """Inicia o envio em background (ignorado se já está rodando neste processo)"""
+        task = self._running.get(broadcast_id)
+        if task is None or task.done():
+            task = asyncio.create_task(self.run(broadcast_id))
+            self._running[broadcast_id] = task
+            task.add_done_callback(lambda _: self._running.pop(broadcast_id, None))
+
+    async def resume_pending(self) -> int:
+        """Retoma broadcasts pendentes ou com lease vencido; retorna quantos foram iniciados"""
+        query = """
+            SELECT id FROM broadcasts
+            WHERE status = 'Pendente' OR (status = 'Enviando' AND bloqueado_ate < NOW())
+            ORDER BY id
+        """
+        rows = await db_manager.execute_query(query)
+        for row in rows:
+            self.start(row['id'])
+        return len(rows)
+
+    async def _claim(self, broadcast_id: int) -> Optional[Dict]:
+        """Reivindica o broadcast (lease de JOB_LEASE_MINUTES)"""
+        query = """
+            UPDATE broadcasts
+            SET status = 'Enviando', data_inicio = COALESCE(data_inicio, NOW()),
+                bloqueado_ate = NOW() + ($2 * INTERVAL '1 minute')
+            WHERE id = $1
+              AND (status = 'Pendente' OR (status = 'Enviando' AND bloqueado_ate < NOW()))
+            RETURNING id, alvo, titulo, conteudo, solicitado_por, total, enviados, falhas
+        """
+        return await db_manager.execute_one(query, broadcast_id, JOB_LEASE_MINUTES)
+
+    async def _checkpoint(self, broadcast_id: int, results: List[Tuple[int, bool, Optional[str]]]):
+        """Grava o resultado do lote, atualiza os contadores e renova o lease"""
+        query = """
+            WITH resultado AS (
+                SELECT * FROM unnest($2::bigint[], $3::bool[], $4::text[]) AS r(id_destino, ok, erro)
+            ), gravados AS (
+                UPDATE broadcast_destinatarios d
+                SET status = CASE WHEN resultado.ok THEN 'Enviado' ELSE 'Falhou' END,
+                    erro = resultado.erro, data_envio = NOW()
+                FROM resultado
+                WHERE d.id_broadcast = $1 AND d.id_destino = resultado.id_destino AND d.status = 'Pendente'
+                RETURNING resultado.ok
+            )
+            UPDATE broadcasts
+            SET enviados = enviados + (SELECT COUNT(*) FROM gravados WHERE ok),
+                falhas = falhas + (SELECT COUNT(*) FROM gravados WHERE NOT ok),
+                bloqueado_ate = NOW() + ($5 * INTERVAL '1 minute')
+            WHERE id = $1
+        """
+        await db_manager.execute_command(
+            query, broadcast_id,
+            [result[0] for result in results],
+            [result[1] for result in results],
+            [result[2] for result in results],
+            JOB_LEASE_MINUTES
+        )
+
+    async def _send_to_server(self, server_id: int, payload: Dict) -> Tuple[bool, Optional[str]]:
+        """Envia no canal do sistema do servidor (ou no primeiro canal de texto)"""
+        guild = await discord_rest.get_guild(server_id)
+        if not guild.ok:
+            return False, f"servidor {guild.status_code}"
+
+        channel_id = guild.json().get('system_channel_id')
+        if not channel_id:
+            channels = await discord_rest.get_guild_channels(server_id)
+            text_channels = sorted(
+                (channel for channel in (channels.json() if channels.ok else []) if channel.get('type') == 0),
+                key=lambda channel: channel.get('position', 0)
+            )
+            if not text_channels:
+                return False, "nenhum canal disponível"
+            channel_id = text_channels[0]['id']
+
+        response = await discord_rest.send_message(int(channel_id), payload)
+        return response.ok, None if response.ok else str(response.status_code)
+
+    async def _send(self, broadcast: Dict, destino: int, payload: Dict) -> Tuple[int, bool, Optional[str]]:
+        """Envia para um destinatário; retorna (destino, sucesso, erro)"""
+        try:
+            if broadcast['alvo'] == 'server':
+                ok, error = await self._send_to_server(destino, payload)
+            else:
+                response = await discord_rest.send_dm(destino, payload)
+                ok, error = response.ok, None if response.ok else str(response.status_code)
+            return destino, ok, error
+        except Exception as e:
+            return destino, False, str(e)[:500]
+
+    async def run(self, broadcast_id: int):
+        """Envia os destinatários pendentes do broadcast, lote a lote"""
+        try:
+            broadcast = await self._claim(broadcast_id)
+            if not broadcast:
+                return
+
+            logger.info(f"📢 Broadcast {broadcast_id} ({broadcast['alvo']}) iniciado: "
+                        f"{broadcast['enviados'] + broadcast['falhas']}/{broadcast['total']} já processados")
+
+            payload = {'embeds': [{
+                'title': f"📢 {broadcast['titulo']}",
+                'description': broadcast['conteudo'],
+                'color': 0x00ff00,
+                'footer': {'text': "Sistema Guardião BETA - Mensagem Administrativa"}
+            }]}
+            semaphore = asyncio.Semaphore(DM_FANOUT_CONCURRENCY)
+
+            async def send(destino: int):
+                async with semaphore:
+                    return await self._send(broadcast, destino, payload)
+
+            pending_query = """
+                SELECT id_destino FROM broadcast_destinatarios
+                WHERE id_broadcast = $1 AND status = 'Pendente'
+                ORDER BY id_destino
+                LIMIT $2
+            """
+            while True:
+                rows = await db_manager.execute_query(pending_query, broadcast_id, BROADCAST_BATCH_SIZE)
+                if not rows:
+                    break
+                results = await asyncio.gather(*(send(row['id_destino']) for row in rows))
+                await self._checkpoint(broadcast_id, results)
+
+            final = await db_manager.execute_one("""
+                UPDATE broadcasts
+                SET status = 'Concluido', data_conclusao = NOW(), bloqueado_ate = NULL
+                WHERE id = $1
+                RETURNING enviados, falhas, total
+            """, broadcast_id)
+            logger.info(f"✅ Broadcast {broadcast_id} concluído: {final['enviados']}/{final['total']} enviados, "
+                        f"{final['falhas']} falhas")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # O lease vence e o broadcast é retomado na próxima varredura
+            logger.error(f"Erro no broadcast {broadcast_id}: {e}")
+
+
+# Instância global do executor de broadcasts
+broadcast_runner = BroadcastRunner()
@@ -0,0 +1,100 @@
+"""
+Agendador de Prazos - Sistema Guardião BETA
+Min-heap de prazos que dispara cada expiração no instante exato, sem polling
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+DueCallback = Callable[[List[Tuple[Hashable, Any]]], Awaitable[None]]
+
+
+class DeadlineScheduler:
+    """
+    Agenda prazos (datetime UTC naive) e chama o callback quando vencem
+
+    Reagendar uma chave substitui o prazo anterior; cancelamentos são
+    preguiçosos (a entrada antiga é descartada ao chegar ao topo do heap).
+    Prazos que vencem juntos são entregues ao callback em um único lote.
+    """
+
+    def __init__(self, name: str, callback: DueCallback):
+        self.name = name
+        self._callback = callback
+        self._heap: List[Tuple[datetime, int, Hashable]] = []
+        self._entries: Dict[Hashable, Tuple[datetime, int, Any]] = {}
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def schedule(self, key: Hashable, deadline: datetime, payload: Any = None):
+        """Agenda (ou reagenda) a chave para o prazo informado"""
+        sequence = next(self._sequence)
+        self._entries[key] = (deadline, sequence, payload)
+        heapq.heappush(self._heap, (deadline, sequence, key))
+
+        # Novo prazo mais próximo: acorda o loop para recalcular a espera
+        if self._heap[0][1] == sequence:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable):
+        """Cancela o prazo da chave (se existir)"""
+        self._entries.pop(key, None)
+
+    def start(self):
+        """Inicia o loop do agendador"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Para o loop do agendador"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _pop_due(self, now: datetime) -> List[Tuple[Hashable, Any]]:
+        """Remove do heap todos os prazos vencidos ainda válidos"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, sequence, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry and entry[1] == sequence:
+                del self._entries[key]
+                due.append((key, entry[2]))
+        return due
+
+    async def _run(self):
+        """Dorme até o próximo prazo e entrega os vencidos ao callback"""
+        while True:
+            now = datetime.utcnow()
+            due = self._pop_due(now)
+
+            if due:
+                try:
+                    await self._callback(due)
+                except Exception as e:
+                    logger.error(f"Erro ao processar prazos vencidos ({self.name}): {e}")
+                continue
+
+            timeout = None
+            if self._heap:
+                timeout = max(0.0, (self._heap[0][0] - now).total_seconds())
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,409 @@
+"""
+Cliente REST do Discord - Sistema Guardião BETA
+Sessão aiohttp compartilhada com rate limit por bucket, limite global, novas
+tentativas e métricas por rota. Inclui fachada síncrona para as rotas Flask.
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json as json_module
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+
+import aiohttp
+
+from config import (
+    DISCORD_TOKEN, DISCORD_REST_POOL_SIZE, DISCORD_REST_MAX_RETRIES, DISCORD_REST_TIMEOUT_SECONDS
+)
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+DISCORD_API_BASE = "https://discord.com/api/v10"
+USER_AGENT = "DiscordBot (https://github.com/Konnak/guardiaobeta, 1.0)"
+
+# Parâmetros que definem buckets distintos para a mesma rota
+MAJOR_PARAMETERS = ('guild_id', 'channel_id', 'webhook_id')
+
+# Erros de servidor que valem nova tentativa
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class Route:
+    """
+    Rota da API do Discord
+
+    Usage:
+        Route('GET', '/guilds/{guild_id}/channels', guild_id=123)
+    """
+
+    __slots__ = ('method', 'path', 'url', 'major')
+
+    def __init__(self, method: str, path: str, **params):
+        self.method = method
+        self.path = path
+        self.url = DISCORD_API_BASE + path.format(
+            **{key: quote(str(value)) for key, value in params.items()}
+        )
+        self.major = ':'.join(str(params[key]) for key in MAJOR_PARAMETERS if key in params)
+
+    @property
+    def key(self) -> str:
+        """Identificação da rota para métricas e descoberta de bucket"""
+        return f"{self.method} {self.path}"
+
+
+class RestResponse:
+    """Resposta da API (interface compatível com a usada antes via requests)"""
+
+    __slots__ = ('status_code', 'text', 'headers', '_data')
+
+    def __init__(self, status_code: int, text: str = "", headers: Optional[Dict[str, str]] = None,
+                 data: Any = None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self._data = data
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    def json(self) -> Any:
+        return self._data
+
+
+class _Bucket:
+    """Estado de um bucket de rate limit"""
+
+    __slots__ = ('lock', 'remaining', 'reset_at')
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+
+
+class DiscordRestClient:
+    """
+    Cliente REST do Discord compartilhado pelo bot e pela aplicação web
+
+    A sessão aiohttp (e todo o estado de rate limit) pertence a um único event
+    loop: o primeiro que usar o cliente. Chamadas de outro loop são repassadas
+    a ele, e as rotas Flask usam `request_sync`/`run_sync`, que agendam a
+    corrotina nesse loop ou, se nenhum existir, em um loop próprio em thread.
+    """
+
+    def __init__(self, token: Optional[str] = DISCORD_TOKEN):
+        self.token = token
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bridge_thread: Optional[threading.Thread] = None
+        self._bridge_lock = threading.Lock()
+        # {rota: hash do bucket informado pelo Discord}
+        self._bucket_hashes: Dict[str, str] = {}
+        # {hash ou rota + parâmetro principal: estado}
+        self._buckets: Dict[str, _Bucket] = {}
+        self._global_reset_at = 0.0
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def has_token(self) -> bool:
+        return bool(self.token)
+
+    # ==================== LOOP E SESSÃO ====================
+    def _ensure_bridge(self):
+        """Cria um loop próprio em thread para uso exclusivamente síncrono"""
+        with self._bridge_lock:
+            if self._loop is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._bridge_thread = threading.Thread(target=run_loop, name="discord-rest-bridge", daemon=True)
+            self._bridge_thread.start()
+            ready.wait()
+            self._loop = loop
+            logger.info("🌐 Cliente REST do Discord usando loop próprio (modo síncrono)")
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Retorna a sessão compartilhada (criada sob demanda)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=DISCORD_REST_POOL_SIZE, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=DISCORD_REST_TIMEOUT_SECONDS),
+                headers={'User-Agent': USER_AGENT}
+            )
+        return self._session
+
+    async def close(self):
+        """Fecha a sessão HTTP (no loop dono da sessão)"""
+        if self._session is None or self._session.closed:
+            self._session = None
+            return
+
+        if self._loop is not None and self._loop is not asyncio.get_running_loop():
+            future = asyncio.run_coroutine_threadsafe(self._session.close(), self._loop)
+            await asyncio.wrap_future(future)
+        else:
+            await self._session.close()
+        self._session = None
+
+    # ==================== REQUISIÇÕES ====================
+    async def request(self, route: Route, *, json: Any = None, data: Any = None,
+                      params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+                      bearer_token: Optional[str] = None, auth: bool = True,
+                      reason: Optional[str] = None) -> RestResponse:
+        """
+        Executa uma requisição respeitando os rate limits do Discord
+
+        Args:
+            route: Rota da API
+            json: Corpo JSON
+            data: Corpo form-urlencoded (ex: troca de token OAuth2)
+            params: Query string
+            headers: Headers adicionais
+            bearer_token: Token OAuth2 do usuário (no lugar do token do bot)
+            auth: Se False, não envia Authorization
+            reason: Motivo registrado no audit log do servidor
+
+        Returns:
+            RestResponse; status_code 0 indica falha de rede ou configuração
+        """
+        current_loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = current_loop
+        elif self._loop is not current_loop:
+            # A sessão pertence a outro loop: executa lá e aguarda aqui
+            future = asyncio.run_coroutine_threadsafe(
+                self.request(route, json=json, data=data, params=params, headers=headers,
+                             bearer_token=bearer_token, auth=auth, reason=reason),
+                self._loop
+            )
+            return await asyncio.wrap_future(future)
+
+        request_headers = dict(headers or {})
+        scope = route.major
+        if auth:
+            if bearer_token:
+                request_headers['Authorization'] = f'Bearer {bearer_token}'
+                # Rotas OAuth2 têm limites por usuário
+                scope += ':' + hashlib.sha1(bearer_token.encode()).hexdigest()[:12]
+            elif self.token:
+                request_headers['Authorization'] = f'Bot {self.token}'
+            else:
+                logger.error("DISCORD_TOKEN não configurado")
+                return RestResponse(0, "DISCORD_TOKEN não configurado")
+        if reason:
+            request_headers['X-Audit-Log-Reason'] = quote(reason, safe=' ')
+
+        session = await self._get_session()
+        attempt = 0
+        while True:
+            bucket = await self._acquire(route, scope)
+            started = time.perf_counter()
+            try:
+                async with session.request(route.method, route.url, json=json, data=data,
+                                           params=params, headers=request_headers) as response:
+                    text = await response.text()
+                    payload = None
+                    if response.content_type == 'application/json' and text:
+                        try:
+                            payload = json_module.loads(text)
+                        except ValueError:
+                            payload = None
+                    result = RestResponse(response.status, text, response.headers.copy(), payload)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._record(route, started, error=True)
+                if attempt >= DISCORD_REST_MAX_RETRIES:
+                    logger.error(f"❌ {route.key} falhou após {attempt + 1} tentativas: {e}")
+                    return RestResponse(0, str(e))
+                await asyncio.sleep(0.5 * 2 ** attempt)
+                attempt += 1
+                continue
+
+            self._update_bucket(route, scope, bucket, result.headers)
+
+            if result.status_code == 429:
+                self._record(route, started, rate_limited=True)
+                retry_after = self._retry_after(result)
+                if result.headers.get('X-RateLimit-Global') == 'true' or (payload or {}).get('global'):
+                    self._global_reset_at = time.monotonic() + retry_after
+                    logger.warning(f"⏳ Rate limit global do Discord: aguardando {retry_after:.2f}s")
+                else:
+                    bucket.remaining = 0
+                    bucket.reset_at = time.monotonic() + retry_after
+                    logger.warning(f"⏳ Rate limit em {route.key}: aguardando {retry_after:.2f}s")
+                if attempt >= DISCORD_REST_MAX_RETRIES:
+                    return result
+                attempt += 1
+                continue
+
+            if result.status_code in RETRY_STATUSES and attempt < DISCORD_REST_MAX_RETRIES:
+                self._record(route, started, error=True)
+                await asyncio.sleep(0.5 * 2 ** attempt)
+                attempt += 1
+                continue
+
+            self._record(route, started, error=result.status_code >= 500)
+            return result
+
+    def request_sync(self, route: Route, timeout: float = None, **kwargs) -> RestResponse:
+        """Versão síncrona de request para uso em Flask"""
+        return self.run_sync(self.request(route, **kwargs), timeout=timeout)
+
+    def run_sync(self, coro, timeout: float = None) -> Any:
+        """
+        Executa uma corrotina do cliente a partir de código síncrono
+
+        Não pode ser chamado de dentro do loop dono da sessão (bloquearia o loop).
+        """
+        if timeout is None:
+            timeout = DISCORD_REST_TIMEOUT_SECONDS * (DISCORD_REST_MAX_RETRIES + 1) + 5
+
+        if self._loop is None or self._loop.is_closed():
+            self._loop = None
+            self._ensure_bridge()
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            coro.close()
+            logger.error("Chamada síncrona ao Discord dentro do event loop - use a versão assíncrona")
+            return RestResponse(0, "chamada síncrona dentro do event loop")
+
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.error(f"Timeout na chamada síncrona ao Discord ({timeout}s)")
+            return RestResponse(0, "timeout")
+
+    # ==================== RATE LIMIT ====================
+    def _bucket_key(self, route: Route, scope: str) -> str:
+        bucket_hash = self._bucket_hashes.get(route.key, route.key)
+        return f"{bucket_hash}:{scope}"
+
+    async def _acquire(self, route: Route, scope: str) -> _Bucket:
+        """Aguarda o limite global e o do bucket antes de enviar"""
+        now = time.monotonic()
+        if self._global_reset_at > now:
+            await asyncio.sleep(self._global_reset_at - now)
+
+        key = self._bucket_key(route, scope)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+
+        async with bucket.lock:
+            now = time.monotonic()
+            if bucket.remaining == 0 and bucket.reset_at > now:
+                await asyncio.sleep(bucket.reset_at - now)
+                bucket.remaining = None
+            elif bucket.remaining:
+                bucket.remaining -= 1
+        return bucket
+
+    def _update_bucket(self, route: Route, scope: str, bucket: _Bucket, headers: Dict[str, str]):
+        """Atualiza o bucket com os headers X-RateLimit-* da resposta"""
+        bucket_hash = headers.get('X-RateLimit-Bucket')
+        if bucket_hash and self._bucket_hashes.get(route.key) != bucket_hash:
+            self._bucket_hashes[route.key] = bucket_hash
+            # Rotas diferentes podem compartilhar o mesmo bucket do Discord
+            bucket = self._buckets.setdefault(self._bucket_key(route, scope), bucket)
+
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        if remaining is not None:
+            bucket.remaining = int(remaining)
+        if reset_after is not None:
+            bucket.reset_at = time.monotonic() + float(reset_after)
+
+    @staticmethod
+    def _retry_after(response: RestResponse) -> float:
+        """Segundos de espera informados em uma resposta 429"""
+        payload = response.json() or {}
+        retry_after = payload.get('retry_after') or response.headers.get('Retry-After') or 1
+        return float(retry_after)
+
+    # ==================== MÉTRICAS ====================
+    def _record(self, route: Route, started: float, error: bool = False, rate_limited: bool = False):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        metric = self._metrics.setdefault(route.key, {
+            'requests': 0, 'errors': 0, 'rate_limited': 0, 'total_ms': 0.0, 'max_ms': 0.0
+        })
+        metric['requests'] += 1
+        metric['total_ms'] += elapsed_ms
+        metric['max_ms'] = max(metric['max_ms'], elapsed_ms)
+        if error:
+            metric['errors'] += 1
+        if rate_limited:
+            metric['rate_limited'] += 1
+
+    def metrics_snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Latência média/máxima, erros e respostas 429 por rota"""
+        return {
+            key: {
+                'requests': metric['requests'],
+                'errors': metric['errors'],
+                'rate_limited': metric['rate_limited'],
+                'avg_ms': round(metric['total_ms'] / metric['requests'], 1) if metric['requests'] else 0.0,
+                'max_ms': round(metric['max_ms'], 1)
+            }
+            for key, metric in self._metrics.items()
+        }
+
+    # ==================== ATALHOS ====================
+    async def create_dm(self, user_id: int) -> RestResponse:
+        return await self.request(Route('POST', '/users/@me/channels'), json={'recipient_id': str(user_id)})
+
+    async def send_message(self, channel_id: int, payload: Dict[str, Any]) -> RestResponse:
+        return await self.request(Route('POST', '/channels/{channel_id}/messages', channel_id=channel_id), json=payload)
+
+    async def send_dm(self, user_id: int, payload: Dict[str, Any]) -> RestResponse:
+        """Abre (ou reutiliza) o canal de DM e envia a mensagem"""
+        dm_response = await self.create_dm(user_id)
+        if not dm_response.ok:
+            return dm_response
+        return await self.send_message(int(dm_response.json()['id']), payload)
+
+    async def get_user(self, user_id: int) -> RestResponse:
+        return await self.request(Route('GET', '/users/{user_id}', user_id=user_id))
+
+    async def get_guild(self, guild_id: int) -> RestResponse:
+        return await self.request(Route('GET', '/guilds/{guild_id}', guild_id=guild_id))
+
+    async def get_guild_channels(self, guild_id: int) -> RestResponse:
+        return await self.request(Route('GET', '/guilds/{guild_id}/channels', guild_id=guild_id))
+
+    async def edit_member(self, guild_id: int, user_id: int, payload: Dict[str, Any],
+                          reason: Optional[str] = None) -> RestResponse:
+        route = Route('PATCH', '/guilds/{guild_id}/members/{user_id}', guild_id=guild_id, user_id=user_id)
+        return await self.request(route, json=payload, reason=reason)
+
+    async def ban(self, guild_id: int, user_id: int, delete_message_seconds: int = 0,
+                  reason: Optional[str] = None) -> RestResponse:
+        route = Route('PUT', '/guilds/{guild_id}/bans/{user_id}', guild_id=guild_id, user_id=user_id)
+        return await self.request(route, json={'delete_message_seconds': delete_message_seconds}, reason=reason)
+
+    async def unban(self, guild_id: int, user_id: int, reason: Optional[str] = None) -> RestResponse:
+        route = Route('DELETE', '/guilds/{guild_id}/bans/{user_id}', guild_id=guild_id, user_id=user_id)
+        return await self.request(route, reason=reason)
+
+
+# Instância global do cliente REST
+discord_rest = DiscordRestClient()
@@ -0,0 +1,198 @@
+"""
+Barramento de Eventos - Sistema Guardião BETA
+Eventos tipados entre o painel web e o bot sobre LISTEN/NOTIFY do PostgreSQL
+
+O painel publica e retorna na hora; o bot consome no próprio event loop e faz
+o I/O com o Discord. Todo processo que chama `start`/`start_sync` recebe os
+eventos, inclusive os que ele mesmo publicou (ver `Event.local`).
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+from database.connection import db_manager
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Canal do NOTIFY
+EVENT_CHANNEL = 'guardiao_eventos'
+
+# Tipos de evento
+DENUNCIA_CRIADA = 'denuncia_criada'
+PREMIUM_ATIVADO = 'premium_ativado'
+CONFIG_ALTERADA = 'config_alterada'
+BROADCAST_SOLICITADO = 'broadcast_solicitado'
+USUARIO_BANIDO = 'usuario_banido'
+LOG_SERVIDOR = 'log_servidor'
+EVIDENCIA_ALTERADA = 'evidencia_alterada'
+# Emitido localmente quando a escuta reconecta (eventos podem ter se perdido)
+RECONECTADO = 'reconectado'
+
+# Campos obrigatórios de cada tipo publicável
+EVENT_FIELDS = {
+    DENUNCIA_CRIADA: ('id_denuncia', 'hash_denuncia', 'id_servidor'),
+    PREMIUM_ATIVADO: ('id_servidor', 'data_fim'),
+    CONFIG_ALTERADA: ('id_servidor',),
+    BROADCAST_SOLICITADO: ('id_broadcast',),
+    USUARIO_BANIDO: ('id_usuario', 'motivo', 'aplicado_por'),
+    LOG_SERVIDOR: ('id_servidor', 'tipo_log', 'titulo', 'descricao'),
+    EVIDENCIA_ALTERADA: ('hash_denuncia',),
+}
+
+# Limite do payload do NOTIFY (8000 bytes) com folga para o envelope
+MAX_PAYLOAD_BYTES = 7900
+
+EventHandler = Callable[['Event'], Any]
+
+
+class Event:
+    """Evento recebido do barramento"""
+
+    __slots__ = ('tipo', 'dados', 'origem')
+
+    def __init__(self, tipo: str, dados: Dict[str, Any], origem: str):
+        self.tipo = tipo
+        self.dados = dados
+        self.origem = origem
+
+    @property
+    def local(self) -> bool:
+        """Publicado por este processo"""
+        return self.origem == event_bus.instance_id
+
+    def __getitem__(self, key: str) -> Any:
+        return self.dados[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.dados.get(key, default)
+
+
+class EventBus:
+    """Publica e distribui eventos do canal EVENT_CHANNEL"""
+
+    def __init__(self):
+        self.instance_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, List[EventHandler]] = {}
+        self._tasks = set()
+        self._started = False
+
+    # ==================== CONSUMO ====================
+    def subscribe(self, tipo: str, handler: EventHandler):
+        """Registra um handler (função ou corrotina) para um tipo de evento"""
+        handlers = self._handlers.setdefault(tipo, [])
+        if handler not in handlers:
+            handlers.append(handler)
+
+    def unsubscribe(self, tipo: str, handler: EventHandler):
+        """Remove um handler"""
+        handlers = self._handlers.get(tipo, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    async def start(self):
+        """Começa a escutar no loop atual (processo do bot)"""
+        if not self._started:
+            self._started = True
+            await db_manager.listen(EVENT_CHANNEL, self._on_notification)
+
+    def start_sync(self):
+        """Começa a escutar no loop da ponte síncrona (processo --web-only)"""
+        if self._started:
+            return
+        try:
+            db_manager.listen_sync(EVENT_CHANNEL, self._on_notification)
+            self._started = True
+        except Exception as e:
+            logger.error(f"Erro ao escutar o barramento de eventos: {e}")
+
+    def _on_notification(self, payload: Optional[str]):
+        """Converte o NOTIFY em evento e o entrega aos handlers"""
+        if payload is None:
+            self._dispatch(Event(RECONECTADO, {}, self.instance_id))
+            return
+
+        try:
+            message = json.loads(payload)
+            event = Event(message['tipo'], message.get('dados') or {}, message.get('origem', ''))
+        except Exception as e:
+            logger.error(f"Evento inválido recebido: {e}")
+            return
+
+        self._dispatch(event)
+
+    def _dispatch(self, event: Event):
+        """Chama os handlers do tipo; corrotinas viram tasks no loop da escuta"""
+        for handler in list(self._handlers.get(event.tipo, ())):
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(self._run_handler(event, result))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            except Exception as e:
+                logger.error(f"Erro no handler do evento {event.tipo}: {e}")
+
+    @staticmethod
+    async def _run_handler(event: Event, awaitable):
+        """Executa um handler assíncrono registrando falhas"""
+        try:
+            await awaitable
+        except Exception as e:
+            logger.error(f"Erro no handler do evento {event.tipo}: {e}")
+
+    # ==================== PUBLICAÇÃO ====================
+    def _encode(self, tipo: str, dados: Dict[str, Any]) -> str:
+        """
+        Valida e serializa um evento
+
+        Raises:
+            ValueError: Tipo desconhecido, campo obrigatório ausente ou payload grande demais
+        """
+        fields = EVENT_FIELDS.get(tipo)
+        if fields is None:
+            raise ValueError(f"Tipo de evento desconhecido: {tipo}")
+
+        missing = [field for field in fields if dados.get(field) is None]
+        if missing:
+            raise ValueError(f"Evento {tipo} sem os campos: {', '.join(missing)}")
+
+        payload = json.dumps({'tipo': tipo, 'dados': dados, 'origem': self.instance_id}, default=str)
+        if len(payload.encode('utf-8')) > MAX_PAYLOAD_BYTES:
+            raise ValueError(f"Evento {tipo} excede {MAX_PAYLOAD_BYTES} bytes")
+        return payload
+
+    async def publish(self, tipo: str, **dados) -> bool:
+        """
+        Publica um evento
+
+        Args:
+            tipo: Um dos tipos de EVENT_FIELDS
+            **dados: Campos do evento (serializáveis em JSON)
+
+        Returns:
+            True se o evento foi publicado
+        """
+        try:
+            payload = self._encode(tipo, dados)
+        except ValueError as e:
+            logger.error(f"Evento não publicado: {e}")
+            return False
+        return await db_manager.notify(EVENT_CHANNEL, payload)
+
+    def publish_sync(self, tipo: str, **dados) -> bool:
+        """Versão síncrona de publish (rotas Flask)"""
+        try:
+            payload = self._encode(tipo, dados)
+        except ValueError as e:
+            logger.error(f"Evento não publicado: {e}")
+            return False
+        return db_manager.notify_sync(EVENT_CHANNEL, payload)
+
+
+# Instância global do barramento de eventos
+event_bus = EventBus()
@@ -0,0 +1,180 @@
+"""
+Cache de Evidências Renderizadas - Sistema Guardião BETA
+Anonimiza as mensagens capturadas de uma denúncia uma única vez e guarda os
+campos prontos do embed em um LRU limitado, indexado pelo hash da denúncia
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from utils.event_bus import event_bus, EVIDENCIA_ALTERADA, RECONECTADO
+from config import EVIDENCE_CACHE_SIZE
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Limite de caracteres de cada campo de mensagens no embed
+EVIDENCE_FIELD_LENGTH = 1000
+
+MENTION_PATTERN = re.compile(r'<@!?\d+>')
+
+
+def anonymize_messages(mensagens: List[Dict], id_denunciado: int) -> str:
+    """
+    Anonimiza as mensagens para proteção da privacidade
+
+    Args:
+        mensagens: Mensagens capturadas, da mais recente à mais antiga
+        id_denunciado: ID do usuário denunciado (destacado no texto)
+
+    Returns:
+        Texto com uma linha por mensagem (no máximo 15)
+    """
+    try:
+        if not mensagens:
+            return "Nenhuma mensagem encontrada."
+
+        # Mapeia usuários únicos para nomes anônimos
+        usuarios_unicos = {}
+        contador_usuario = 1
+
+        for msg in mensagens:
+            if msg['id_autor'] not in usuarios_unicos:
+                if msg['id_autor'] == id_denunciado:
+                    usuarios_unicos[msg['id_autor']] = "**🔴 Denunciado**"
+                else:
+                    usuarios_unicos[msg['id_autor']] = f"**Usuário {contador_usuario}**"
+                    contador_usuario += 1
+
+        result = []
+        for msg in mensagens[:15]:  # Limita a 15 mensagens
+            # Converte para horário de Brasília
+            timestamp_brasilia = msg['timestamp_mensagem'] - timedelta(hours=3)
+            timestamp_formatado = timestamp_brasilia.strftime('%H:%M')
+
+            autor = usuarios_unicos[msg['id_autor']]
+            conteudo = msg['conteudo'][:150] + "..." if len(msg['conteudo']) > 150 else msg['conteudo']
+
+            # Remove menções para anonimização
+            conteudo = MENTION_PATTERN.sub('[Usuário]', conteudo)
+
+            if msg['id_autor'] == id_denunciado:
+                linha = f"🔴 **{autor}** ({timestamp_formatado}): **{conteudo}**"
+            else:
+                linha = f"{autor} ({timestamp_formatado}): {conteudo}"
+
+            result.append(linha)
+
+        return "\n\n".join(result)
+
+    except Exception as e:
+        logger.error(f"Erro ao anonimizar mensagens: {e}")
+        return "Erro ao processar mensagens."
+
+
+def split_into_chunks(text: str, max_length: int) -> List[str]:
+    """Divide o texto em chunks para não exceder o limite do Discord"""
+    if len(text) <= max_length:
+        return [text]
+
+    chunks = []
+    lines = text.split('\n\n')
+    current_chunk = ""
+
+    for line in lines:
+        if len(current_chunk + line + "\n\n") > max_length:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+            current_chunk = line + "\n\n"
+        else:
+            current_chunk += line + "\n\n"
+
+    if current_chunk.strip():
+        chunks.append(current_chunk.strip())
+
+    return chunks
+
+
+def render_evidence(mensagens: List[Dict], id_denunciado: int) -> Tuple[str, ...]:
+    """
+    Renderiza os campos de mensagens do embed de análise
+
+    Returns:
+        Valores dos campos "💬 Mensagens Capturadas" (vazio se não há mensagens)
+    """
+    if not mensagens:
+        return ()
+    return tuple(split_into_chunks(anonymize_messages(mensagens, id_denunciado), EVIDENCE_FIELD_LENGTH))
+
+
+class EvidenceCache:
+    """
+    LRU dos campos de evidência já renderizados
+
+    Preenchido ao fim da captura do /report e consultado a cada "Atender". As
+    evidências de uma denúncia não mudam depois da captura; a entrada só é
+    invalidada quando as mensagens capturadas são regravadas ou excluídas, em
+    todos os processos (evento EVIDENCIA_ALTERADA).
+    Acessado pelo bot e pelo painel web (threads diferentes), por isso o lock.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[str, Tuple[str, ...]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, hash_denuncia: str) -> Optional[Tuple[str, ...]]:
+        """Retorna os campos renderizados ou None se não estão no cache"""
+        with self._lock:
+            fields = self._entries.get(hash_denuncia)
+            if fields is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(hash_denuncia)
+            self.hits += 1
+            return fields
+
+    def put(self, hash_denuncia: str, fields: Tuple[str, ...]):
+        """Guarda os campos renderizados de uma denúncia"""
+        with self._lock:
+            self._entries[hash_denuncia] = fields
+            self._entries.move_to_end(hash_denuncia)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *hashes: str):
+        """Remove as entradas das denúncias cujas evidências mudaram"""
+        with self._lock:
+            for hash_denuncia in hashes:
+                self._entries.pop(hash_denuncia, None)
+
+    # ==================== EVENTOS ====================
+    def _on_event(self, event):
+        """Invalida a denúncia do evento (RECONECTADO descarta tudo)"""
+        if event.tipo == RECONECTADO:
+            with self._lock:
+                self._entries.clear()
+        else:
+            self.invalidate(event['hash_denuncia'])
+
+    def subscribe(self):
+        """Registra a invalidação no barramento de eventos"""
+        for tipo in (EVIDENCIA_ALTERADA, RECONECTADO):
+            event_bus.subscribe(tipo, self._on_event)
+
+    def publish_change_sync(self, hash_denuncia: str):
+        """Invalida localmente e avisa os outros processos (rotas Flask)"""
+        self.invalidate(hash_denuncia)
+        event_bus.publish_sync(EVIDENCIA_ALTERADA, hash_denuncia=hash_denuncia)
+
+
+# Instância global do cache de evidências
+evidence_cache = EvidenceCache(EVIDENCE_CACHE_SIZE)
@@ -0,0 +1,169 @@
+"""
+Cache de Configurações dos Servidores - Sistema Guardião BETA
+Configuração (configuracoes_servidor) e premium (servidores_premium) de cada
+servidor em memória, invalidados entre processos pelo barramento de eventos
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from database.connection import db_manager
+from utils.event_bus import event_bus, CONFIG_ALTERADA, PREMIUM_ATIVADO, RECONECTADO
+from config import GUILD_SETTINGS_TTL_SECONDS
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+GUILD_SETTINGS_QUERY = """
+    SELECT g.id AS id_servidor, cs.canal_log,
+           cs.duracao_intimidou, cs.duracao_intimidou_grave, cs.duracao_grave, cs.duracao_grave_4plus,
+           sp.data_inicio, sp.data_fim
+    FROM unnest($1::bigint[]) AS g(id)
+    LEFT JOIN configuracoes_servidor cs ON cs.id_servidor = g.id
+    LEFT JOIN servidores_premium sp ON sp.id_servidor = g.id
+"""
+
+
+class GuildSettings:
+    """Configuração e assinatura premium de um servidor"""
+
+    __slots__ = ('id_servidor', 'canal_log', 'duracao_intimidou', 'duracao_intimidou_grave',
+                 'duracao_grave', 'duracao_grave_4plus', 'premium_inicio', 'premium_ate', 'expira_em')
+
+    def __init__(self, row: Dict, now: datetime):
+        self.id_servidor = row['id_servidor']
+        self.canal_log = row['canal_log']
+        self.duracao_intimidou = row['duracao_intimidou'] or 1
+        self.duracao_intimidou_grave = row['duracao_intimidou_grave'] or 6
+        self.duracao_grave = row['duracao_grave'] or 12
+        self.duracao_grave_4plus = row['duracao_grave_4plus'] or 24
+        self.premium_inicio = row['data_inicio']
+        self.premium_ate = row['data_fim']
+
+        # Recarrega no fim do TTL ou quando o premium vence, o que vier antes
+        self.expira_em = now + timedelta(seconds=GUILD_SETTINGS_TTL_SECONDS)
+        if self.premium_ate and now < self.premium_ate < self.expira_em:
+            self.expira_em = self.premium_ate
+
+    @property
+    def is_premium(self) -> bool:
+        """Servidor com premium ativo"""
+        return self.premium_ate is not None and self.premium_ate > datetime.utcnow()
+
+    @property
+    def premium_data(self) -> Optional[Dict]:
+        """Dados do premium ativo no formato usado pelos templates (ou None)"""
+        if not self.is_premium:
+            return None
+        return {
+            'id_servidor': self.id_servidor,
+            'data_inicio': self.premium_inicio,
+            'data_fim': self.premium_ate,
+            # Horário de Brasília
+            'data_fim_br': self.premium_ate - timedelta(hours=3)
+        }
+
+
+class GuildSettingsCache:
+    """
+    Cache por servidor com TTL, expiração no fim do premium e invalidação explícita
+
+    Quem grava em configuracoes_servidor chama `publish_change` (ou
+    `publish_change_sync`) e quem ativa premium publica PREMIUM_ATIVADO: a
+    entrada local é descartada e o evento avisa os outros processos, que
+    escutam com `subscribe`. Usado pelo bot e pelas threads do Flask.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, GuildSettings] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, guild_ids: Iterable[int]) -> Dict[int, GuildSettings]:
+        """Entradas ainda válidas para os servidores pedidos"""
+        now = datetime.utcnow()
+        found = {}
+        with self._lock:
+            for guild_id in guild_ids:
+                settings = self._entries.get(guild_id)
+                if settings is not None and settings.expira_em > now:
+                    found[guild_id] = settings
+            self.hits += len(found)
+        return found
+
+    def _store(self, rows: List[Dict]) -> Dict[int, GuildSettings]:
+        """Guarda as linhas carregadas do banco"""
+        now = datetime.utcnow()
+        loaded = {row['id_servidor']: GuildSettings(row, now) for row in rows}
+        with self._lock:
+            self._entries.update(loaded)
+            self.misses += len(loaded)
+        return loaded
+
+    async def get_many(self, guild_ids: Iterable[int]) -> Dict[int, GuildSettings]:
+        """Configurações de vários servidores (uma query para todos os que faltam)"""
+        guild_ids = [int(guild_id) for guild_id in guild_ids]
+        found = self._cached(guild_ids)
+        missing = [guild_id for guild_id in guild_ids if guild_id not in found]
+        if missing:
+            found.update(self._store(await db_manager.execute_query(GUILD_SETTINGS_QUERY, missing)))
+        return found
+
+    def get_many_sync(self, guild_ids: Iterable[int]) -> Dict[int, GuildSettings]:
+        """Versão síncrona de get_many (rotas Flask)"""
+        guild_ids = [int(guild_id) for guild_id in guild_ids]
+        found = self._cached(guild_ids)
+        missing = [guild_id for guild_id in guild_ids if guild_id not in found]
+        if missing:
+            found.update(self._store(db_manager.execute_query_sync(GUILD_SETTINGS_QUERY, missing)))
+        return found
+
+    async def get(self, guild_id: int) -> GuildSettings:
+        """Configurações de um servidor"""
+        return (await self.get_many([guild_id]))[int(guild_id)]
+
+    def get_sync(self, guild_id: int) -> GuildSettings:
+        """Versão síncrona de get (rotas Flask)"""
+        return self.get_many_sync([guild_id])[int(guild_id)]
+
+    def invalidate(self, guild_id: Optional[int] = None):
+        """Descarta a entrada de um servidor (ou todas)"""
+        with self._lock:
+            if guild_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(int(guild_id), None)
+
+    # ==================== EVENTOS ====================
+    def _on_event(self, event):
+        """Invalida o servidor do evento (RECONECTADO descarta tudo)"""
+        if event.tipo == RECONECTADO:
+            self.invalidate()
+        else:
+            self.invalidate(event['id_servidor'])
+
+    def subscribe(self):
+        """Registra a invalidação no barramento de eventos"""
+        for tipo in (CONFIG_ALTERADA, PREMIUM_ATIVADO, RECONECTADO):
+            event_bus.subscribe(tipo, self._on_event)
+
+    async def publish_change(self, guild_id: int):
+        """Invalida localmente e avisa os outros processos"""
+        self.invalidate(guild_id)
+        await event_bus.publish(CONFIG_ALTERADA, id_servidor=int(guild_id))
+
+    def publish_change_sync(self, guild_id: int):
+        """Versão síncrona de publish_change (rotas Flask)"""
+        self.invalidate(guild_id)
+        event_bus.publish_sync(CONFIG_ALTERADA, id_servidor=int(guild_id))
+
+    def publish_premium_sync(self, guild_id: int, data_fim: datetime):
+        """Invalida localmente e publica a ativação/renovação do premium"""
+        self.invalidate(guild_id)
+        event_bus.publish_sync(PREMIUM_ATIVADO, id_servidor=int(guild_id), data_fim=data_fim.isoformat())
+
+
+# Instância global do cache de configurações dos servidores
+guild_settings = GuildSettingsCache()
@@ -0,0 +1,260 @@
+"""
+Agendador de Jobs Persistentes - Sistema Guardião BETA
+Ações atrasadas (unban, expiração de captcha, penalidade de inatividade) gravadas
+no PostgreSQL e executadas por um loop que reivindica jobs com FOR UPDATE SKIP LOCKED
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from database.connection import db_manager
+from config import (
+    JOB_POLL_SECONDS, JOB_BATCH_SIZE, JOB_LEASE_MINUTES, JOB_RETENTION_DAYS, JOB_PURGE_INTERVAL_MINUTES
+)
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Espera máxima entre novas tentativas de um job que falhou
+MAX_RETRY_DELAY_SECONDS = 3600
+
+# Jobs finalizados excluídos por transação da limpeza
+PURGE_BATCH_SIZE = 500
+
+
+class JobScheduler:
+    """
+    Executa os jobs da tabela jobs_agendados
+
+    Cada cog registra o handler dos tipos que conhece. O loop dorme até o
+    próximo `executar_em` (limitado a JOB_POLL_SECONDS), reivindica os jobs
+    vencidos com SKIP LOCKED — várias instâncias podem rodar sem executar o
+    mesmo job — e os executa. Jobs 'Executando' cujo lease venceu (processo
+    reiniciado no meio da execução) voltam a ser reivindicados.
+
+    A cada JOB_PURGE_INTERVAL_MINUTES o loop exclui os jobs 'Concluido' e
+    'Falhou' finalizados há mais de JOB_RETENTION_DAYS. A chave única só
+    deduplica enquanto o job está pendente (enqueue reagenda o existente),
+    então o histórico é mantido apenas para consulta de falhas recentes.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, JobHandler] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._next_purge = 0.0
+
+    def register(self, tipo: str, handler: JobHandler):
+        """Registra o handler de um tipo de job"""
+        self._handlers[tipo] = handler
+        self._wakeup.set()
+
+    def unregister(self, tipo: str):
+        """Remove o handler de um tipo de job"""
+        self._handlers.pop(tipo, None)
+
+    def start(self):
+        """Inicia o loop do agendador"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Para o loop do agendador"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def enqueue(self, tipo: str, payload: Dict[str, Any], executar_em: datetime,
+                      chave_unica: Optional[str] = None, max_tentativas: int = 5) -> Optional[int]:
+        """
+        Agenda um job
+
+        Args:
+            tipo: Tipo do job (precisa de handler registrado para executar)
+            payload: Parâmetros do job (serializáveis em JSON)
+            executar_em: Momento de execução (UTC)
+            chave_unica: Se informada, reagenda o job existente com a mesma chave
+            max_tentativas: Tentativas antes de marcar o job como 'Falhou'
+
+        Returns:
+            ID do job ou None em caso de erro
+        """
+        try:
+            query = """
+                INSERT INTO jobs_agendados (tipo, payload, executar_em, chave_unica, max_tentativas)
+                VALUES ($1, $2::jsonb, $3, $4, $5)
+                ON CONFLICT (chave_unica) DO UPDATE
+                SET tipo = EXCLUDED.tipo, payload = EXCLUDED.payload, executar_em = EXCLUDED.executar_em,
+                    max_tentativas = EXCLUDED.max_tentativas, status = 'Pendente', tentativas = 0,
+                    ultimo_erro = NULL, bloqueado_ate = NULL, data_conclusao = NULL
+                RETURNING id
+            """
+            job_id = await db_manager.execute_scalar(
+                query, tipo, json.dumps(payload), executar_em, chave_unica, max_tentativas
+            )
+            # Acorda o loop para recalcular a próxima execução
+            self._wakeup.set()
+            return job_id
+        except Exception as e:
+            logger.error(f"Erro ao agendar job {tipo}: {e}")
+            return None
+
+    async def cancel(self, chave_unica: str) -> bool:
+        """Cancela um job pendente pela chave única"""
+        try:
+            query = """
+                DELETE FROM jobs_agendados
+                WHERE chave_unica = $1 AND status = 'Pendente'
+                RETURNING id
+            """
+            return await db_manager.execute_scalar(query, chave_unica) is not None
+        except Exception as e:
+            logger.error(f"Erro ao cancelar job {chave_unica}: {e}")
+            return False
+
+    async def purge_finished(self, days: int = JOB_RETENTION_DAYS) -> int:
+        """
+        Exclui em lotes os jobs finalizados há mais de `days` dias
+
+        Args:
+            days: Dias de histórico mantidos para jobs 'Concluido' e 'Falhou'
+
+        Returns:
+            Quantidade de jobs excluídos
+        """
+        query = """
+            DELETE FROM jobs_agendados
+            WHERE id IN (
+                SELECT id FROM jobs_agendados
+                WHERE status IN ('Concluido', 'Falhou')
+                  AND data_conclusao < NOW() - ($1 * INTERVAL '1 day')
+                ORDER BY data_conclusao
+                LIMIT $2
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id
+        """
+        total = 0
+        while True:
+            rows = await db_manager.execute_query(query, days, PURGE_BATCH_SIZE)
+            total += len(rows)
+            if len(rows) < PURGE_BATCH_SIZE:
+                break
+            # Devolve o loop ao bot entre lotes
+            await asyncio.sleep(0)
+
+        if total:
+            logger.info(f"🧹 {total} job(s) finalizado(s) há mais de {days} dias excluído(s)")
+        return total
+
+    async def _claim_due(self) -> List[Dict]:
+        """Reivindica os jobs vencidos dos tipos com handler registrado"""
+        query = """
+            UPDATE jobs_agendados
+            SET status = 'Executando', tentativas = tentativas + 1,
+                bloqueado_ate = NOW() + ($3 * INTERVAL '1 minute')
+            WHERE id IN (
+                SELECT id FROM jobs_agendados
+                WHERE tipo = ANY($2::text[])
+                  AND ((status = 'Pendente' AND executar_em <= NOW())
+                       OR (status = 'Executando' AND bloqueado_ate < NOW()))
+                ORDER BY executar_em
+                LIMIT $1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, tipo, payload, tentativas, max_tentativas
+        """
+        return await db_manager.execute_query(query, JOB_BATCH_SIZE, list(self._handlers), JOB_LEASE_MINUTES)
+
+    async def _execute(self, job: Dict):
+        """Executa um job e registra o resultado"""
+        handler = self._handlers.get(job['tipo'])
+        try:
+            if handler is None:
+                raise RuntimeError(f"handler do tipo {job['tipo']} não registrado")
+
+            payload = job['payload']
+            if isinstance(payload, str):
+                payload = json.loads(payload)
+
+            await handler(payload)
+
+            await db_manager.execute_command(
+                "UPDATE jobs_agendados SET status = 'Concluido', data_conclusao = NOW(), bloqueado_ate = NULL WHERE id = $1",
+                job['id']
+            )
+        except Exception as e:
+            if job['tentativas'] >= job['max_tentativas']:
+                logger.error(f"❌ Job {job['id']} ({job['tipo']}) falhou definitivamente: {e}")
+                query = """
+                    UPDATE jobs_agendados
+                    SET status = 'Falhou', ultimo_erro = $2, data_conclusao = NOW(), bloqueado_ate = NULL
+                    WHERE id = $1
+                """
+                await db_manager.execute_command(query, job['id'], str(e))
+            else:
+                delay = min(30 * 2 ** (job['tentativas'] - 1), MAX_RETRY_DELAY_SECONDS)
+                logger.warning(f"⚠️ Job {job['id']} ({job['tipo']}) falhou, nova tentativa em {delay}s: {e}")
+                query = """
+                    UPDATE jobs_agendados
+                    SET status = 'Pendente', ultimo_erro = $2, bloqueado_ate = NULL, executar_em = $3
+                    WHERE id = $1
+                """
+                await db_manager.execute_command(
+                    query, job['id'], str(e), datetime.utcnow() + timedelta(seconds=delay)
+                )
+
+    async def run_due(self) -> int:
+        """Reivindica e executa os jobs vencidos; retorna quantos foram executados"""
+        if not self._handlers:
+            return 0
+
+        jobs = await self._claim_due()
+        if jobs:
+            await asyncio.gather(*(self._execute(job) for job in jobs))
+            logger.info(f"⏰ {len(jobs)} job(s) agendado(s) executado(s)")
+        return len(jobs)
+
+    async def _seconds_until_next(self) -> float:
+        """Segundos até o próximo job pendente, limitado a JOB_POLL_SECONDS"""
+        query = """
+            SELECT EXTRACT(EPOCH FROM (MIN(executar_em) - NOW()))
+            FROM jobs_agendados
+            WHERE status = 'Pendente' AND tipo = ANY($1::text[])
+        """
+        seconds = await db_manager.execute_scalar(query, list(self._handlers))
+        if seconds is None:
+            return JOB_POLL_SECONDS
+        return min(max(float(seconds), 0.0), JOB_POLL_SECONDS)
+
+    async def _run(self):
+        """Dorme até o próximo job e executa os vencidos"""
+        while True:
+            timeout = JOB_POLL_SECONDS
+            try:
+                if db_manager.pool and time.monotonic() >= self._next_purge:
+                    self._next_purge = time.monotonic() + JOB_PURGE_INTERVAL_MINUTES * 60
+                    await self.purge_finished()
+                if db_manager.pool and self._handlers:
+                    executed = await self.run_due()
+                    if executed >= JOB_BATCH_SIZE:
+                        # Pode haver mais jobs vencidos na fila
+                        continue
+                    timeout = await self._seconds_until_next()
+            except Exception as e:
+                logger.error(f"Erro no agendador de jobs: {e}")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+# Instância global do agendador de jobs
+job_scheduler = JobScheduler()
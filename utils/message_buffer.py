@@ -0,0 +1,203 @@
+"""
+Buffer de Mensagens por Canal - Sistema Guardião BETA
+Guarda em memória as mensagens recentes de cada canal (via on_message) para que
+a captura de evidências do /report não precise paginar o histórico pela API
+"""
+
+import logging
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+from config import MESSAGE_BUFFER_PER_CHANNEL, MESSAGE_BUFFER_MAX_AGE_HOURS, MESSAGE_BUFFER_MAX_MESSAGES
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+
+class BufferedMessage:
+    """Registro compacto de uma mensagem"""
+
+    __slots__ = ('id', 'author_id', 'content', 'attachments', 'created_at')
+
+    def __init__(self, id: int, author_id: int, content: str, attachments: Tuple[dict, ...],
+                 created_at: datetime):
+        self.id = id
+        self.author_id = author_id
+        self.content = content
+        self.attachments = attachments
+        self.created_at = created_at
+
+    @classmethod
+    def from_message(cls, message) -> 'BufferedMessage':
+        """Converte um discord.Message"""
+        attachments = tuple(
+            {
+                'id': attachment.id,
+                'filename': attachment.filename,
+                'url': attachment.url,
+                'content_type': attachment.content_type,
+                'size': attachment.size
+            }
+            for attachment in message.attachments
+        )
+        return cls(message.id, message.author.id, message.content, attachments, message.created_at)
+
+
+class ChannelMessageBuffer:
+    """
+    Ring buffer de mensagens por canal, limitado por quantidade e idade
+
+    O total de mensagens em memória tem um teto global; ao ultrapassá-lo, os
+    canais menos ativos (LRU) são descartados. Cada canal guarda a partir de
+    quando seu buffer está completo, de modo que `snapshot` só responde quando
+    tem certeza de ter todas as mensagens da janela pedida.
+    """
+
+    def __init__(self, per_channel: int, max_age: timedelta, max_messages: int):
+        self.per_channel = per_channel
+        self.max_age = max_age
+        self.max_messages = max_messages
+        self._channels: 'OrderedDict[int, Deque[BufferedMessage]]' = OrderedDict()
+        # {canal: instante a partir do qual o buffer tem todas as mensagens}
+        self._complete_since: Dict[int, datetime] = {}
+        # {canal descartado por LRU: instante do descarte}
+        self._evicted: Dict[int, datetime] = {}
+        self._total = 0
+        # Até o bot começar a ouvir, nenhum canal está completo
+        self.listening_since: Optional[datetime] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self._total
+
+    def start_listening(self):
+        """
+        Marca o início (ou reinício, após nova sessão do gateway) da escuta
+
+        Mensagens anteriores podem ter sido perdidas, então nenhum canal é
+        considerado completo antes deste instante.
+        """
+        now = datetime.now(timezone.utc)
+        self.listening_since = now
+        for channel_id in self._channels:
+            self._complete_since[channel_id] = now
+
+    # ==================== EVENTOS ====================
+    def record(self, channel_id: int, record: BufferedMessage):
+        """Adiciona uma mensagem ao buffer do canal"""
+        if self.listening_since is None:
+            return
+
+        buffer = self._channels.get(channel_id)
+        if buffer is None:
+            buffer = self._channels[channel_id] = deque()
+            self._complete_since[channel_id] = self._evicted.pop(channel_id, self.listening_since)
+        else:
+            self._channels.move_to_end(channel_id)
+
+        buffer.append(record)
+        self._total += 1
+
+        if len(buffer) > self.per_channel:
+            self._drop_oldest(channel_id, buffer)
+        self._prune_expired(channel_id, buffer)
+
+        if self._total > self.max_messages:
+            self._evict_cold_channels()
+
+    def _drop_oldest(self, channel_id: int, buffer: Deque[BufferedMessage]):
+        """Descarta a mensagem mais antiga do canal"""
+        dropped = buffer.popleft()
+        self._total -= 1
+        # Mensagens até a descartada não estão mais garantidas
+        self._complete_since[channel_id] = max(self._complete_since[channel_id], dropped.created_at)
+
+    def _prune_expired(self, channel_id: int, buffer: Deque[BufferedMessage]):
+        """Descarta as mensagens mais antigas que a janela máxima"""
+        cutoff = datetime.now(timezone.utc) - self.max_age
+        while buffer and buffer[0].created_at < cutoff:
+            self._drop_oldest(channel_id, buffer)
+
+    def record_edit(self, channel_id: int, message_id: int, content: str):
+        """Atualiza o conteúdo de uma mensagem editada"""
+        for record in reversed(self._channels.get(channel_id, ())):
+            if record.id == message_id:
+                record.content = content
+                return
+
+    def record_delete(self, channel_id: int, message_id: int):
+        """Remove uma mensagem apagada (como o histórico da API faria)"""
+        buffer = self._channels.get(channel_id)
+        if not buffer:
+            return
+        for record in buffer:
+            if record.id == message_id:
+                buffer.remove(record)
+                self._total -= 1
+                return
+
+    def drop_channel(self, channel_id: int):
+        """Descarta o buffer de um canal apagado"""
+        buffer = self._channels.pop(channel_id, None)
+        if buffer is not None:
+            self._total -= len(buffer)
+        self._complete_since.pop(channel_id, None)
+        self._evicted.pop(channel_id, None)
+
+    def _evict_cold_channels(self):
+        """Descarta os canais menos recentes até voltar ao teto global"""
+        now = datetime.now(timezone.utc)
+        while self._total > self.max_messages and self._channels:
+            channel_id, buffer = self._channels.popitem(last=False)
+            self._total -= len(buffer)
+            self._complete_since.pop(channel_id, None)
+            self._evicted[channel_id] = now
+
+        # Descartes mais antigos que a janela máxima já não importam
+        cutoff = now - self.max_age
+        for channel_id in [cid for cid, evicted_at in self._evicted.items() if evicted_at < cutoff]:
+            del self._evicted[channel_id]
+
+    # ==================== CONSULTA ====================
+    def snapshot(self, channel_id: int, after: datetime, limit: int) -> Optional[List[BufferedMessage]]:
+        """
+        Retorna as últimas `limit` mensagens do canal após `after` (da mais antiga à mais recente)
+
+        Returns:
+            Lista de mensagens ou None se o buffer não cobre a janela (usar a API)
+        """
+        # A cobertura da janela vem de listening_since/_complete_since; comparar
+        # `after` com o relógio aqui rejeitaria a janela de 24h pedida pelo /report
+        if self.listening_since is None:
+            self.misses += 1
+            return None
+
+        buffer = self._channels.get(channel_id)
+        if buffer is None:
+            # Canal sem mensagens desde o início da escuta (e nunca descartado)
+            if channel_id not in self._evicted and self.listening_since <= after:
+                self.hits += 1
+                return []
+            self.misses += 1
+            return None
+
+        self._prune_expired(channel_id, buffer)
+        messages = [record for record in buffer if record.created_at > after][-limit:]
+
+        # Completo se o buffer cobre toda a janela ou já tem mensagens suficientes
+        if self._complete_since[channel_id] <= after or len(messages) >= limit:
+            self._channels.move_to_end(channel_id)
+            self.hits += 1
+            return messages
+
+        self.misses += 1
+        return None
+
+
+# Instância global do buffer de mensagens
+message_buffer = ChannelMessageBuffer(
+    per_channel=MESSAGE_BUFFER_PER_CHANNEL,
+    max_age=timedelta(hours=MESSAGE_BUFFER_MAX_AGE_HOURS),
+    max_messages=MESSAGE_BUFFER_MAX_MESSAGES
+)
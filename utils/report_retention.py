@@ -0,0 +1,174 @@
+"""
+Retenção de Denúncias - Sistema Guardião BETA
+Tira das tabelas quentes as denúncias finalizadas há mais de REPORT_RETENTION_DAYS
+
+Cada lote (uma transação) seleciona até REPORT_RETENTION_BATCH_SIZE denúncias
+finalizadas antigas com SKIP LOCKED, grava em denuncias_arquivo uma linha por
+denúncia com votos e mensagens capturadas em JSONB (modo 'arquivar') e apaga a
+denúncia, o que remove em cascata mensagens_capturadas, votos_guardioes e
+mensagens_guardioes. Com isso denuncias, mensagens_capturadas e
+votos_guardioes (e seus índices) guardam apenas o período recente e as
+denúncias em aberto. As estatísticas de denuncias_daily_rollup não mudam.
+
+Na mesma execução, os registros de logs_punicoes já inativos (ativa = false)
+e aplicados há mais de REPORT_RETENTION_DAYS são excluídos em lotes, nos dois
+modos. Punições ativas nunca são removidas.
+"""
+
+import asyncio
+import logging
+from typing import List
+from database.connection import db_manager
+from utils.evidence_cache import evidence_cache
+from config import REPORT_RETENTION_DAYS, REPORT_RETENTION_MODE, REPORT_RETENTION_BATCH_SIZE
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+RETENTION_MODES = ('arquivar', 'excluir')
+
+# Denúncias elegíveis (idx_denuncias_retencao); lotes simultâneos pegam linhas diferentes
+ELIGIBLE_CTE = """
+    alvo AS (
+        SELECT id FROM denuncias
+        WHERE status = 'Finalizada' AND data_criacao < NOW() - ($1 * INTERVAL '1 day')
+        ORDER BY data_criacao
+        LIMIT $2
+        FOR UPDATE SKIP LOCKED
+    )
+"""
+
+ARCHIVE_CTE = """
+    arquivo AS (
+        INSERT INTO denuncias_arquivo (
+            id, hash_denuncia, id_servidor, id_canal, id_denunciante, id_denunciado, motivo, status,
+            data_criacao, e_premium, resultado_final, votos_peso, votos_count, votos, mensagens
+        )
+        SELECT d.id, d.hash_denuncia, d.id_servidor, d.id_canal, d.id_denunciante, d.id_denunciado,
+               d.motivo, d.status, d.data_criacao, d.e_premium, d.resultado_final, d.votos_peso, d.votos_count,
+               COALESCE((
+                   SELECT jsonb_agg(to_jsonb(v) - 'id_denuncia' ORDER BY v.data_voto)
+                   FROM votos_guardioes v WHERE v.id_denuncia = d.id
+               ), '[]'::jsonb),
+               COALESCE((
+                   SELECT jsonb_agg(to_jsonb(m) - 'id_denuncia' ORDER BY m.timestamp_mensagem)
+                   FROM mensagens_capturadas m WHERE m.id_denuncia = d.id
+               ), '[]'::jsonb)
+        FROM denuncias d
+        JOIN alvo ON alvo.id = d.id
+    )
+"""
+
+DELETE_ELIGIBLE = """
+    DELETE FROM denuncias d
+    USING alvo
+    WHERE d.id = alvo.id
+    RETURNING d.hash_denuncia
+"""
+
+# Punições inativas antigas (idx_logs_punicoes_retencao)
+DELETE_PUNISHMENT_LOGS = """
+    WITH alvo AS (
+        SELECT id FROM logs_punicoes
+        WHERE ativa = false AND data_punicao < NOW() - ($1 * INTERVAL '1 day')
+        ORDER BY data_punicao
+        LIMIT $2
+        FOR UPDATE SKIP LOCKED
+    )
+    DELETE FROM logs_punicoes p
+    USING alvo
+    WHERE p.id = alvo.id
+    RETURNING p.id
+"""
+
+
+class ReportRetention:
+    """Arquivamento ou exclusão em lotes das denúncias finalizadas antigas"""
+
+    def __init__(self, days: int, mode: str, batch_size: int):
+        self.days = days
+        self.mode = mode if mode in RETENTION_MODES else 'arquivar'
+        self.batch_size = batch_size
+        if mode not in RETENTION_MODES:
+            logger.warning(f"⚠️ REPORT_RETENTION_MODE inválido ({mode}), usando 'arquivar'")
+
+    @property
+    def enabled(self) -> bool:
+        return self.days > 0
+
+    def _batch_query(self) -> str:
+        """Query de um lote no modo configurado"""
+        ctes = [ELIGIBLE_CTE, ARCHIVE_CTE] if self.mode == 'arquivar' else [ELIGIBLE_CTE]
+        return f"WITH {','.join(ctes)} {DELETE_ELIGIBLE}"
+
+    async def _run_batch(self) -> List[str]:
+        """
+        Processa um lote em uma transação
+
+        Returns:
+            Hashes das denúncias removidas das tabelas quentes
+        """
+        async with db_manager.get_connection() as conn:
+            async with conn.transaction():
+                # O trigger de denuncias_daily_rollup ignora estas exclusões
+                await conn.execute("SET LOCAL guardiao.retencao = 'on'")
+                rows = await conn.fetch(self._batch_query(), self.days, self.batch_size)
+        return [row['hash_denuncia'] for row in rows]
+
+    async def _run_punishment_logs(self) -> int:
+        """
+        Exclui em lotes os registros inativos antigos de logs_punicoes
+
+        Returns:
+            Quantidade de registros excluídos
+        """
+        total = 0
+        try:
+            while True:
+                rows = await db_manager.execute_query(DELETE_PUNISHMENT_LOGS, self.days, self.batch_size)
+                total += len(rows)
+                if len(rows) < self.batch_size:
+                    break
+                await asyncio.sleep(0)
+        except Exception as e:
+            logger.error(f"Erro na retenção de logs_punicoes: {e}")
+
+        if total:
+            logger.info(f"🗄️ {total} punição(ões) inativa(s) aplicada(s) há mais de {self.days} dias excluída(s)")
+        return total
+
+    async def run(self) -> int:
+        """
+        Processa lotes até não restarem denúncias elegíveis e, em seguida,
+        as punições inativas antigas
+
+        Returns:
+            Quantidade de denúncias arquivadas/excluídas
+        """
+        if not self.enabled:
+            return 0
+
+        total = 0
+        try:
+            while True:
+                hashes = await self._run_batch()
+                for hash_denuncia in hashes:
+                    evidence_cache.invalidate(hash_denuncia)
+                total += len(hashes)
+                if len(hashes) < self.batch_size:
+                    break
+                # Devolve o loop ao bot entre lotes
+                await asyncio.sleep(0)
+        except Exception as e:
+            logger.error(f"Erro na retenção de denúncias: {e}")
+
+        if total:
+            action = 'arquivada(s)' if self.mode == 'arquivar' else 'excluída(s)'
+            logger.info(f"🗄️ {total} denúncia(s) finalizada(s) há mais de {self.days} dias {action}")
+
+        await self._run_punishment_logs()
+        return total
+
+
+# Instância global da retenção de denúncias
+report_retention = ReportRetention(REPORT_RETENTION_DAYS, REPORT_RETENTION_MODE, REPORT_RETENTION_BATCH_SIZE)
@@ -0,0 +1,118 @@
+"""
+Estatísticas Diárias dos Servidores - Sistema Guardião BETA
+Leitura e reconstrução de denuncias_daily_rollup
+
+A tabela guarda uma linha por (servidor, dia, status, resultado) e é mantida
+pelo trigger denuncias_rollup_apply (database/migrate_denuncias_rollup.sql)
+na mesma transação de cada criação, finalização ou exclusão de denúncia. O
+painel soma essas linhas em vez de agregar a tabela denuncias inteira.
+"""
+
+import logging
+from typing import Dict, List
+from database.connection import db_manager
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Totais por status e por resultado de um servidor
+SERVER_TOTALS_QUERY = """
+    SELECT
+        COALESCE(SUM(quantidade), 0) AS total_denuncias,
+        COALESCE(SUM(quantidade) FILTER (WHERE status = 'Finalizada'), 0) AS denuncias_finalizadas,
+        COALESCE(SUM(quantidade) FILTER (WHERE status = 'Pendente'), 0) AS denuncias_pendentes,
+        COALESCE(SUM(quantidade) FILTER (WHERE status = 'Em Análise'), 0) AS denuncias_analise,
+        COALESCE(SUM(quantidade_premium), 0) AS denuncias_premium,
+        COALESCE(SUM(quantidade) FILTER (WHERE status = 'Finalizada' AND resultado_final = 'OK!'), 0) AS improcedentes,
+        COALESCE(SUM(quantidade) FILTER (WHERE status = 'Finalizada' AND resultado_final = 'Intimidou'), 0) AS intimidoes,
+        COALESCE(SUM(quantidade) FILTER (WHERE status = 'Finalizada' AND resultado_final = 'Grave'), 0) AS graves
+    FROM denuncias_daily_rollup
+    WHERE id_servidor = $1
+"""
+
+# Denúncias criadas por dia nos últimos N dias
+SERVER_PERIOD_QUERY = """
+    SELECT dia AS data, SUM(quantidade) AS quantidade
+    FROM denuncias_daily_rollup
+    WHERE id_servidor = $1 AND dia >= (NOW() - $2 * INTERVAL '1 day')::date
+    GROUP BY dia
+    HAVING SUM(quantidade) > 0
+    ORDER BY dia
+"""
+
+# Linhas de origem da reconstrução: denúncias ativas e, se existir, o arquivo da retenção
+REBUILD_SOURCE = "SELECT id_servidor, data_criacao, status, resultado_final, e_premium FROM denuncias"
+REBUILD_ARCHIVE_SOURCE = "SELECT id_servidor, data_criacao, status, resultado_final, e_premium FROM denuncias_arquivo"
+
+REBUILD_INSERT = """
+    INSERT INTO denuncias_daily_rollup (id_servidor, dia, status, resultado_final, quantidade, quantidade_premium)
+    SELECT id_servidor, data_criacao::date, status, COALESCE(resultado_final, ''),
+           COUNT(*), COUNT(*) FILTER (WHERE e_premium)
+    FROM ({source}) origem
+    GROUP BY 1, 2, 3, 4
+"""
+
+
+class ReportRollups:
+    """Consulta e reconstrução das estatísticas diárias por servidor"""
+
+    # ==================== PAINEL ====================
+    def server_totals_sync(self, server_id: int) -> Dict:
+        """
+        Totais de um servidor (uma query sobre as linhas diárias)
+
+        Args:
+            server_id: ID do servidor
+
+        Returns:
+            Dicionário com as chaves de 'general' e 'results' de get_server_stats
+        """
+        row = db_manager.execute_one_sync(SERVER_TOTALS_QUERY, server_id)
+        return row or {}
+
+    def server_period_sync(self, server_id: int, days: int = 7) -> List[Dict]:
+        """
+        Denúncias criadas por dia
+
+        Args:
+            server_id: ID do servidor
+            days: Janela em dias
+
+        Returns:
+            Lista de {data, quantidade} em ordem cronológica
+        """
+        return db_manager.execute_query_sync(SERVER_PERIOD_QUERY, server_id, days)
+
+    # ==================== MANUTENÇÃO ====================
+    async def rebuild(self) -> bool:
+        """
+        Recalcula a tabela inteira a partir de denuncias e denuncias_arquivo
+        (backfill inicial ou correção). Denúncias apagadas pela retenção no modo
+        'excluir' deixam de ser contadas.
+
+        Returns:
+            True se a reconstrução foi gravada
+        """
+        try:
+            source = REBUILD_SOURCE
+            has_archive = await db_manager.execute_scalar("SELECT to_regclass('public.denuncias_arquivo') IS NOT NULL")
+            if has_archive:
+                source = f"{REBUILD_SOURCE} UNION ALL {REBUILD_ARCHIVE_SOURCE}"
+
+            # O lock impede escritas em denuncias durante a agregação (inclusive a
+            # retenção), então nenhuma atualização do trigger se perde ou é contada duas vezes
+            await db_manager.execute_transaction([
+                ("LOCK TABLE denuncias IN SHARE MODE", ()),
+                ("DELETE FROM denuncias_daily_rollup", ()),
+                (REBUILD_INSERT.format(source=source), ()),
+            ])
+            rows = await db_manager.execute_scalar("SELECT COUNT(*) FROM denuncias_daily_rollup")
+            logger.info(f"📊 Estatísticas diárias reconstruídas: {rows} linhas")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao reconstruir estatísticas diárias: {e}")
+            return False
+
+
+# Instância global das estatísticas diárias
+report_rollups = ReportRollups()
@@ -0,0 +1,282 @@
+"""
+Cache de Perfis do Discord - Sistema Guardião BETA
+Nome, apelido e avatar de usuários do Discord exibidos pelo painel web
+
+LRU limitado com TTL e cache negativo (usuários inexistentes). Os ids que
+faltam são resolvidos em lote: primeiro o cache do gateway (quando o painel
+roda no processo do bot), depois a tabela usuarios_discord_cache (se
+USER_PROFILE_PERSIST) e por fim GET /users/{id} em paralelo.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from database.connection import db_manager
+from utils.discord_rest import discord_rest
+from config import (
+    USER_PROFILE_CACHE_SIZE, USER_PROFILE_TTL_SECONDS, USER_PROFILE_NEGATIVE_TTL_SECONDS,
+    USER_PROFILE_FETCH_CONCURRENCY, USER_PROFILE_PERSIST, USER_PROFILE_PERSIST_HOURS
+)
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Perfil de usuário desconhecido (mesmas chaves usadas pelos templates)
+EMPTY_PROFILE = {
+    'discord_username': None,
+    'discord_avatar': None,
+    'discord_discriminator': None,
+    'discord_display_name': None
+}
+
+PERSISTED_PROFILES_QUERY = """
+    SELECT id_discord, username, global_name, avatar, discriminator
+    FROM usuarios_discord_cache
+    WHERE id_discord = ANY($1::bigint[]) AND atualizado_em >= NOW() - ($2 * INTERVAL '1 hour')
+"""
+
+PERSIST_PROFILES_COMMAND = """
+    INSERT INTO usuarios_discord_cache (id_discord, username, global_name, avatar, discriminator, atualizado_em)
+    SELECT *, NOW() FROM unnest($1::bigint[], $2::text[], $3::text[], $4::text[], $5::text[])
+    ON CONFLICT (id_discord) DO UPDATE SET
+        username = EXCLUDED.username, global_name = EXCLUDED.global_name,
+        avatar = EXCLUDED.avatar, discriminator = EXCLUDED.discriminator,
+        atualizado_em = EXCLUDED.atualizado_em
+"""
+
+
+def build_profile(username: Optional[str], global_name: Optional[str],
+                  avatar: Optional[str], discriminator: Optional[str]) -> Dict[str, Optional[str]]:
+    """Perfil no formato dos templates a partir dos campos do Discord"""
+    return {
+        'discord_username': username,
+        'discord_avatar': avatar,
+        'discord_discriminator': discriminator,
+        'discord_display_name': global_name or username
+    }
+
+
+class UserProfileCache:
+    """
+    LRU de perfis do Discord com TTL e cache negativo
+
+    Usado pelas threads do Flask (get_sync / get_many_sync) e pelo bot
+    (get_many), por isso o lock.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, negative_ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        # id -> (perfil ou None para "não existe", expira_em em time.monotonic())
+        self._entries: 'OrderedDict[int, Tuple[Optional[Dict], float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._local_lookup: Optional[Callable[[int], Any]] = None
+        self.metrics = {
+            'hits': 0, 'negative_hits': 0, 'misses': 0,
+            'bot_cache': 0, 'database': 0, 'rest': 0, 'rest_not_found': 0, 'rest_errors': 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def attach_bot(self, bot):
+        """Usa o cache de usuários do gateway antes da API (painel no processo do bot)"""
+        self._local_lookup = bot.get_user
+
+    # ==================== LRU ====================
+    def _cached(self, user_ids: List[int]) -> Tuple[Dict[int, Dict], List[int]]:
+        """Separa os ids em (perfis válidos no cache, ids que precisam ser resolvidos)"""
+        now = time.monotonic()
+        found, missing = {}, []
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is None or entry[1] <= now:
+                    missing.append(user_id)
+                    continue
+                self._entries.move_to_end(user_id)
+                if entry[0] is None:
+                    self.metrics['negative_hits'] += 1
+                    found[user_id] = EMPTY_PROFILE
+                else:
+                    self.metrics['hits'] += 1
+                    found[user_id] = entry[0]
+            self.metrics['misses'] += len(missing)
+        return found, missing
+
+    def _store(self, profiles: Dict[int, Optional[Dict]]):
+        """Guarda perfis resolvidos (None = usuário inexistente, TTL negativo)"""
+        now = time.monotonic()
+        with self._lock:
+            for user_id, profile in profiles.items():
+                ttl = self.ttl_seconds if profile is not None else self.negative_ttl_seconds
+                self._entries[user_id] = (profile, now + ttl)
+                self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[int] = None):
+        """Descarta o perfil de um usuário (ou todos)"""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(int(user_id), None)
+
+    # ==================== FONTES ====================
+    def _from_bot_cache(self, user_ids: List[int]) -> Dict[int, Dict]:
+        """Perfis presentes no cache do gateway"""
+        if self._local_lookup is None:
+            return {}
+        found = {}
+        for user_id in user_ids:
+            user = self._local_lookup(user_id)
+            if user is not None:
+                found[user_id] = build_profile(user.name, getattr(user, 'global_name', None),
+                                               user.avatar.key if user.avatar else None, user.discriminator)
+        self.metrics['bot_cache'] += len(found)
+        return found
+
+    def _from_rows(self, rows: List[Dict]) -> Dict[int, Dict]:
+        """Perfis persistidos em usuarios_discord_cache"""
+        self.metrics['database'] += len(rows)
+        return {
+            row['id_discord']: build_profile(row['username'], row['global_name'], row['avatar'], row['discriminator'])
+            for row in rows
+        }
+
+    async def _fetch_rest(self, user_ids: List[int]) -> Dict[int, Optional[Dict]]:
+        """
+        GET /users/{id} em paralelo (o cliente REST respeita os rate limits)
+
+        Returns:
+            Perfis encontrados e None para 404; erros transitórios ficam de fora
+        """
+        semaphore = asyncio.Semaphore(USER_PROFILE_FETCH_CONCURRENCY)
+
+        async def fetch(user_id: int) -> Tuple[int, Optional[Dict], bool]:
+            async with semaphore:
+                try:
+                    response = await discord_rest.get_user(user_id)
+                except Exception as e:
+                    logger.error(f"Erro ao buscar usuário {user_id}: {e}")
+                    return user_id, None, False
+                if response.ok:
+                    data = response.json()
+                    return user_id, build_profile(data.get('username'), data.get('global_name'),
+                                                  data.get('avatar'), data.get('discriminator')), True
+                if response.status_code == 404:
+                    return user_id, None, True
+                logger.warning(f"Erro ao buscar usuário {user_id}: {response.status_code}")
+                return user_id, None, False
+
+        resolved = {}
+        for user_id, profile, definitive in await asyncio.gather(*(fetch(user_id) for user_id in user_ids)):
+            if definitive:
+                resolved[user_id] = profile
+                self.metrics['rest' if profile else 'rest_not_found'] += 1
+            else:
+                self.metrics['rest_errors'] += 1
+        return resolved
+
+    @staticmethod
+    def _persist_args(profiles: Dict[int, Optional[Dict]]) -> Optional[tuple]:
+        """Argumentos do upsert em usuarios_discord_cache (None se nada a gravar)"""
+        found = [(user_id, profile) for user_id, profile in profiles.items() if profile is not None]
+        if not found:
+            return None
+        return (
+            [user_id for user_id, _ in found],
+            [profile['discord_username'] for _, profile in found],
+            [profile['discord_display_name'] for _, profile in found],
+            [profile['discord_avatar'] for _, profile in found],
+            [profile['discord_discriminator'] for _, profile in found],
+        )
+
+    # ==================== CONSULTA ====================
+    def get_many_sync(self, user_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Perfis de vários usuários, resolvendo os que faltam em lote (rotas Flask)
+
+        Args:
+            user_ids: IDs do Discord
+
+        Returns:
+            Dicionário id -> perfil (EMPTY_PROFILE para desconhecidos)
+        """
+        user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+        found, missing = self._cached(user_ids)
+        if not missing:
+            return found
+
+        resolved: Dict[int, Optional[Dict]] = dict(self._from_bot_cache(missing))
+        missing = [user_id for user_id in missing if user_id not in resolved]
+
+        if missing and USER_PROFILE_PERSIST:
+            rows = db_manager.execute_query_sync(PERSISTED_PROFILES_QUERY, missing, USER_PROFILE_PERSIST_HOURS)
+            resolved.update(self._from_rows(rows))
+            missing = [user_id for user_id in missing if user_id not in resolved]
+
+        if missing and discord_rest.has_token:
+            fetched = discord_rest.run_sync(self._fetch_rest(missing))
+            if isinstance(fetched, dict):
+                resolved.update(fetched)
+                persist_args = self._persist_args(fetched) if USER_PROFILE_PERSIST else None
+                if persist_args:
+                    db_manager.execute_command_sync(PERSIST_PROFILES_COMMAND, *persist_args)
+
+        self._store(resolved)
+        for user_id in user_ids:
+            if user_id not in found:
+                found[user_id] = resolved.get(user_id) or EMPTY_PROFILE
+        return found
+
+    def get_sync(self, user_id: int) -> Dict:
+        """Perfil de um usuário (rotas Flask)"""
+        return self.get_many_sync([user_id])[int(user_id)]
+
+    async def get_many(self, user_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Versão assíncrona de get_many_sync (loop do bot)"""
+        user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+        found, missing = self._cached(user_ids)
+        if not missing:
+            return found
+
+        resolved: Dict[int, Optional[Dict]] = dict(self._from_bot_cache(missing))
+        missing = [user_id for user_id in missing if user_id not in resolved]
+
+        if missing and USER_PROFILE_PERSIST:
+            rows = await db_manager.execute_query(PERSISTED_PROFILES_QUERY, missing, USER_PROFILE_PERSIST_HOURS)
+            resolved.update(self._from_rows(rows))
+            missing = [user_id for user_id in missing if user_id not in resolved]
+
+        if missing and discord_rest.has_token:
+            fetched = await self._fetch_rest(missing)
+            resolved.update(fetched)
+            persist_args = self._persist_args(fetched) if USER_PROFILE_PERSIST else None
+            if persist_args:
+                await db_manager.execute_command(PERSIST_PROFILES_COMMAND, *persist_args)
+
+        self._store(resolved)
+        for user_id in user_ids:
+            if user_id not in found:
+                found[user_id] = resolved.get(user_id) or EMPTY_PROFILE
+        return found
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Acertos, faltas e origem dos perfis resolvidos"""
+        lookups = self.metrics['hits'] + self.metrics['negative_hits'] + self.metrics['misses']
+        return {
+            **self.metrics,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hit_rate': round((self.metrics['hits'] + self.metrics['negative_hits']) / lookups, 3) if lookups else 0.0
+        }
+
+
+# Instância global do cache de perfis do Discord
+user_profiles = UserProfileCache(USER_PROFILE_CACHE_SIZE, USER_PROFILE_TTL_SECONDS, USER_PROFILE_NEGATIVE_TTL_SECONDS)
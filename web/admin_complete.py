@@ -17,6 +17,11 @@ except Exception as e:
     logger.error(f"❌ Erro ao importar db_manager: {e}")
     db_manager = None
 
+from utils.guild_settings import guild_settings
+from web.pagination import fetch_keyset_page, count_cache
+from web.search import ReportSearchQuery
+from web.dashboard_stats import dashboard_stats
+
 def setup_admin_complete(app):
     """Configura painel administrativo completo - DESABILITADO TEMPORARIAMENTE"""
     logger.info("⚠️ setup_admin_complete DESABILITADO - Usando sistema principal de rotas admin")
@@ -84,69 +89,37 @@ def setup_admin_complete(app):
     def admin_dashboard_complete():
         """Dashboard administrativo completo"""
         try:
-            # Busca estatísticas gerais
-            stats = {}
-            
-            if db_manager and db_manager.pool:
-                # Estatísticas de usuários
-                user_stats = db_manager.execute_one_sync("""
-                    SELECT 
-                        COUNT(*) as total_usuarios,
-                        COUNT(CASE WHEN categoria = 'Guardião' THEN 1 END) as total_guardioes,
-                        COUNT(CASE WHEN em_servico = true THEN 1 END) as guardioes_servico,
-                        COUNT(CASE WHEN data_criacao_registro >= NOW() - INTERVAL '24 hours' THEN 1 END) as novos_24h
-                    FROM usuarios
-                """)
-                
-                # Estatísticas de denúncias
-                report_stats = db_manager.execute_one_sync("""
-                    SELECT 
-                        COUNT(*) as total_denuncias,
-                        COUNT(CASE WHEN status = 'Pendente' THEN 1 END) as pendentes,
-                        COUNT(CASE WHEN status = 'Em Análise' THEN 1 END) as em_analise,
-                        COUNT(CASE WHEN status = 'Finalizada' THEN 1 END) as finalizadas,
-                        COUNT(CASE WHEN data_criacao >= NOW() - INTERVAL '24 hours' THEN 1 END) as novas_24h
-                    FROM denuncias
-                """)
-                
-                # Estatísticas de votos
-                vote_stats = db_manager.execute_one_sync("""
-                    SELECT 
-                        COUNT(*) as total_votos,
-                        COUNT(CASE WHEN voto = 'OK!' THEN 1 END) as votos_ok,
-                        COUNT(CASE WHEN voto = 'Intimidou' THEN 1 END) as votos_intimidou,
-                        COUNT(CASE WHEN voto = 'Grave' THEN 1 END) as votos_grave
-                    FROM votos_guardioes
-                """)
-                
-                # Servidores premium
-                premium_stats = db_manager.execute_one_sync("""
-                    SELECT 
-                        COUNT(*) as total_premium,
-                        COUNT(CASE WHEN data_fim > NOW() THEN 1 END) as premium_ativos
-                    FROM servidores_premium
-                """)
-                
-                # Atividade recente
-                recent_activity = db_manager.execute_query_sync("""
-                    SELECT 'denuncia' as tipo, data_criacao as data, motivo as descricao 
-                    FROM denuncias 
-                    WHERE data_criacao >= NOW() - INTERVAL '24 hours'
-                    UNION ALL
-                    SELECT 'voto' as tipo, data_voto as data, CONCAT('Voto: ', voto) as descricao
-                    FROM votos_guardioes 
-                    WHERE data_voto >= NOW() - INTERVAL '24 hours'
-                    ORDER BY data DESC 
-                    LIMIT 10
-                """)
-                
-                stats = {
-                    'users': user_stats or {},
-                    'reports': report_stats or {},
-                    'votes': vote_stats or {},
-                    'premium': premium_stats or {},
-                    'activity': recent_activity or []
-                }
+            # Totais do snapshot em memória (web/dashboard_stats.py)
+            snapshot = dashboard_stats.get()
+            counts = snapshot['counts']
+            
+            stats = {
+                'users': {
+                    'total_usuarios': counts.get('total_usuarios', 0),
+                    'total_guardioes': counts.get('total_guardioes', 0),
+                    'guardioes_servico': counts.get('guardioes_servico', 0),
+                    'novos_24h': counts.get('novos_24h', 0)
+                },
+                'reports': {
+                    'total_denuncias': counts.get('total_denuncias', 0),
+                    'pendentes': counts.get('denuncias_pendentes', 0),
+                    'em_analise': counts.get('denuncias_analise', 0),
+                    'finalizadas': counts.get('denuncias_finalizadas', 0),
+                    'novas_24h': counts.get('novas_24h', 0)
+                },
+                'votes': {
+                    'total_votos': counts.get('total_votos', 0),
+                    'votos_ok': counts.get('votos_ok', 0),
+                    'votos_intimidou': counts.get('votos_intimidou', 0),
+                    'votos_grave': counts.get('votos_grave', 0)
+                },
+                'premium': {
+                    'total_premium': counts.get('total_premium', 0),
+                    'premium_ativos': counts.get('premium_ativos', 0)
+                },
+                'activity': snapshot['activity'],
+                'atualizado_em': snapshot['atualizado_em']
+            }
             
             return render_template('admin/dashboard_complete.html', stats=stats)
             
@@ -160,9 +133,7 @@ def setup_admin_complete(app):
     def admin_users_list():
         """Lista de usuários com filtros"""
         try:
-            page = request.args.get('page', 1, type=int)
             per_page = 25
-            offset = (page - 1) * per_page
             
             # Filtros
             categoria = request.args.get('categoria', '')
@@ -172,50 +143,42 @@ def setup_admin_complete(app):
             # Construir query
             where_conditions = []
             params = []
-            param_count = 0
             
             if categoria:
-                param_count += 1
-                where_conditions.append(f"categoria = ${param_count}")
                 params.append(categoria)
+                where_conditions.append(f"categoria = ${len(params)}")
             
             if em_servico:
-                param_count += 1
-                where_conditions.append(f"em_servico = ${param_count}")
                 params.append(em_servico == 'true')
+                where_conditions.append(f"em_servico = ${len(params)}")
             
             if search:
-                param_count += 1
-                where_conditions.append(f"(username ILIKE ${param_count} OR display_name ILIKE ${param_count} OR nome_completo ILIKE ${param_count})")
                 params.append(f"%{search}%")
+                where_conditions.append(f"(username ILIKE ${len(params)} OR display_name ILIKE ${len(params)} OR nome_completo ILIKE ${len(params)})")
             
-            where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-            
-            # Query principal
-            users_query = f"""
+            # Página por cursor em (data_criacao_registro, id_discord)
+            page = fetch_keyset_page(
+                """
                 SELECT id_discord, username, display_name, nome_completo, categoria, 
                        pontos, experiencia, em_servico, data_criacao_registro
-                FROM usuarios 
-                {where_clause}
-                ORDER BY data_criacao_registro DESC 
-                LIMIT ${param_count + 1} OFFSET ${param_count + 2}
-            """
-            params.extend([per_page, offset])
-            
-            users = db_manager.execute_query_sync(users_query, *params) if db_manager else []
-            
-            # Total para paginação
-            count_query = f"SELECT COUNT(*) as total FROM usuarios {where_clause}"
-            count_params = params[:-2]  # Remove limit e offset
-            total = db_manager.execute_one_sync(count_query, *count_params) if db_manager else {'total': 0}
-            total_users = total['total']
-            total_pages = (total_users + per_page - 1) // per_page
+                FROM usuarios
+                """,
+                where_conditions, params,
+                ('data_criacao_registro', 'data_criacao_registro'), ('id_discord', 'id_discord'), per_page,
+                after=request.args.get('after'), before=request.args.get('before')
+            )
+            
+            # Total (estimado sem filtro, cacheado com filtro)
+            total_users, total_estimado = count_cache.count(
+                'usuarios', "SELECT COUNT(*) AS total FROM usuarios", where_conditions, params
+            )
             
             return render_template('admin/users_list.html', 
-                                 users=users,
-                                 page=page,
-                                 total_pages=total_pages,
+                                 users=page.rows,
+                                 next_cursor=page.next_cursor,
+                                 prev_cursor=page.prev_cursor,
                                  total_users=total_users,
+                                 total_estimado=total_estimado,
                                  filters={'categoria': categoria, 'em_servico': em_servico, 'search': search})
             
         except Exception as e:
@@ -398,9 +361,9 @@ def setup_admin_complete(app):
     def admin_reports_list():
         """Lista de denúncias com filtros avançados"""
         try:
-            page = request.args.get('page', 1, type=int)
             per_page = request.args.get('per_page', 25, type=int)
-            offset = (page - 1) * per_page
+            if per_page not in (25, 50, 100):
+                per_page = 25
             
             # Filtros avançados
             status = request.args.get('status', '')
@@ -414,121 +377,71 @@ def setup_admin_complete(app):
             premium = request.args.get('premium', '')
             servidor_id = request.args.get('servidor', '')
             
-            # Construir query
-            where_conditions = []
-            params = []
-            param_count = 0
+            # Construir query (cada filtro na forma que os índices de busca atendem)
+            search = ReportSearchQuery()
             
             if status:
-                param_count += 1
-                where_conditions.append(f"d.status = ${param_count}")
-                params.append(status)
-            
-            if periodo:
-                param_count += 1
-                if periodo == 'hoje':
-                    where_conditions.append(f"d.data_criacao >= CURRENT_DATE")
-                elif periodo == 'semana':
-                    where_conditions.append(f"d.data_criacao >= NOW() - INTERVAL '7 days'")
-                elif periodo == 'mes':
-                    where_conditions.append(f"d.data_criacao >= NOW() - INTERVAL '30 days'")
-                elif periodo.isdigit():
-                    where_conditions.append(f"d.data_criacao >= NOW() - INTERVAL '{periodo} days'")
-            
-            if hash_search:
-                param_count += 1
-                where_conditions.append(f"d.hash_denuncia ILIKE ${param_count}")
-                params.append(f"%{hash_search}%")
-            
-            if denunciado_search:
-                param_count += 1
-                where_conditions.append(f"(u2.username ILIKE ${param_count} OR u2.display_name ILIKE ${param_count} OR d.id_denunciado::text ILIKE ${param_count})")
-                params.append(f"%{denunciado_search}%")
-            
-            if denunciante_search:
-                param_count += 1
-                where_conditions.append(f"(u1.username ILIKE ${param_count} OR u1.display_name ILIKE ${param_count} OR d.id_denunciante::text ILIKE ${param_count})")
-                params.append(f"%{denunciante_search}%")
-            
-            if motivo_search:
-                param_count += 1
-                where_conditions.append(f"d.motivo ILIKE ${param_count}")
-                params.append(f"%{motivo_search}%")
+                search.equals('d.status', status)
+            
+            if periodo == 'hoje':
+                search.raw("d.data_criacao >= CURRENT_DATE")
+            elif periodo == 'semana':
+                search.raw("d.data_criacao >= NOW() - INTERVAL '7 days'")
+            elif periodo == 'mes':
+                search.raw("d.data_criacao >= NOW() - INTERVAL '30 days'")
+            elif periodo.isdigit():
+                search.raw(f"d.data_criacao >= NOW() - INTERVAL '{int(periodo)} days'")
+            
+            search.hash(hash_search)
+            search.user('d.id_denunciado', denunciado_search)
+            search.user('d.id_denunciante', denunciante_search)
+            search.motivo(motivo_search)
             
             if resultado:
-                param_count += 1
-                where_conditions.append(f"d.resultado_final = ${param_count}")
-                params.append(resultado)
+                search.equals('d.resultado_final', resultado)
             
             if premium:
-                param_count += 1
-                where_conditions.append(f"d.e_premium = ${param_count}")
-                params.append(premium == 'true')
+                search.equals('d.e_premium', premium == 'true')
             
-            if servidor_id:
-                param_count += 1
-                where_conditions.append(f"d.id_servidor = ${param_count}")
-                params.append(int(servidor_id))
+            if servidor_id.isdigit():
+                search.equals('d.id_servidor', int(servidor_id))
             
             # Filtro por guardião que votou
-            if guardiao_search:
-                param_count += 1
-                where_conditions.append(f"""
-                    d.id IN (
-                        SELECT vg.id_denuncia FROM votos_guardioes vg
-                        JOIN usuarios ug ON vg.id_guardiao = ug.id_discord
-                        WHERE ug.username ILIKE ${param_count} OR ug.display_name ILIKE ${param_count} OR vg.id_guardiao::text ILIKE ${param_count}
-                    )
-                """)
-                params.append(f"%{guardiao_search}%")
+            search.guardian(guardiao_search)
             
+            where_conditions, params = search.conditions, search.params
             where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
             
-            # Query principal com contagem de votos
-            reports_query = f"""
+            # Página por cursor; votos agregados só das denúncias da página (LATERAL)
+            page = fetch_keyset_page(
+                """
                 SELECT d.*, 
                        u1.username as denunciante_username,
                        u1.display_name as denunciante_display,
                        u2.username as denunciado_username,
                        u2.display_name as denunciado_display,
-                       COALESCE(v.votos_count, 0) as total_votos,
-                       COALESCE(v.votos_ok, 0) as votos_ok,
-                       COALESCE(v.votos_intimidou, 0) as votos_intimidou,
-                       COALESCE(v.votos_grave, 0) as votos_grave
+                       v.votos_count as total_votos,
+                       v.votos_ok,
+                       v.votos_intimidou,
+                       v.votos_grave
                 FROM denuncias d
                 LEFT JOIN usuarios u1 ON d.id_denunciante = u1.id_discord
                 LEFT JOIN usuarios u2 ON d.id_denunciado = u2.id_discord
-                LEFT JOIN (
-                    SELECT id_denuncia,
-                           COUNT(*) as votos_count,
+                CROSS JOIN LATERAL (
+                    SELECT COUNT(*) as votos_count,
                            COUNT(CASE WHEN voto = 'OK!' THEN 1 END) as votos_ok,
                            COUNT(CASE WHEN voto = 'Intimidou' THEN 1 END) as votos_intimidou,
                            COUNT(CASE WHEN voto = 'Grave' THEN 1 END) as votos_grave
                     FROM votos_guardioes 
-                    GROUP BY id_denuncia
-                ) v ON d.id = v.id_denuncia
-                {where_clause}
-                ORDER BY d.data_criacao DESC 
-                LIMIT ${param_count + 1} OFFSET ${param_count + 2}
-            """
-            params.extend([per_page, offset])
-            
-            reports = db_manager.execute_query_sync(reports_query, *params) if db_manager else []
-            
-            # Total para paginação
-            count_query = f"""
-                SELECT COUNT(DISTINCT d.id) as total 
-                FROM denuncias d
-                LEFT JOIN usuarios u1 ON d.id_denunciante = u1.id_discord
-                LEFT JOIN usuarios u2 ON d.id_denunciado = u2.id_discord
-                {where_clause}
-            """
-            count_params = params[:-2]
-            total = db_manager.execute_one_sync(count_query, *count_params) if db_manager else {'total': 0}
-            total_reports = total['total']
-            total_pages = max(1, (total_reports + per_page - 1) // per_page)
-            
-            # Estatísticas dos filtros aplicados
+                    WHERE id_denuncia = d.id
+                ) v
+                """,
+                where_conditions, params,
+                ('d.data_criacao', 'data_criacao'), ('d.id', 'id'), per_page,
+                after=request.args.get('after'), before=request.args.get('before')
+            )
+            
+            # Estatísticas dos filtros aplicados (também servem de total), cacheadas
             stats_query = f"""
                 SELECT 
                     COUNT(DISTINCT d.id) as total_filtrado,
@@ -537,11 +450,10 @@ def setup_admin_complete(app):
                     COUNT(CASE WHEN d.status = 'Finalizada' THEN 1 END) as finalizadas,
                     COUNT(CASE WHEN d.e_premium = true THEN 1 END) as premium_count
                 FROM denuncias d
-                LEFT JOIN usuarios u1 ON d.id_denunciante = u1.id_discord
-                LEFT JOIN usuarios u2 ON d.id_denunciado = u2.id_discord
                 {where_clause}
             """
-            filter_stats = db_manager.execute_one_sync(stats_query, *count_params) if db_manager else {}
+            filter_stats = count_cache.fetch_one_sync(stats_query, *params) or {}
+            total_reports = filter_stats.get('total_filtrado', 0)
             
             filters = {
                 'status': status, 'periodo': periodo, 'hash': hash_search,
@@ -551,9 +463,9 @@ def setup_admin_complete(app):
             }
             
             return render_template('admin/reports_list_enhanced.html',
-                                 reports=reports,
-                                 page=page,
-                                 total_pages=total_pages,
+                                 reports=page.rows,
+                                 next_cursor=page.next_cursor,
+                                 prev_cursor=page.prev_cursor,
                                  total_reports=total_reports,
                                  per_page=per_page,
                                  filters=filters,
@@ -856,6 +768,8 @@ def setup_admin_complete(app):
                 """
                 db_manager.execute_command_sync(config_query, server_id)
             
+            guild_settings.publish_premium_sync(server_id, data_fim)
+            
             # Log da ação
             log_message = f"Servidor {server_id} {action} como premium até {data_fim.strftime('%d/%m/%Y %H:%M')}"
             if reason:
@@ -924,6 +838,7 @@ def setup_admin_complete(app):
                 WHERE id_servidor = $2
             """
             db_manager.execute_command_sync(update_query, new_end, server_id)
+            guild_settings.publish_premium_sync(server_id, new_end)
             
             # Log da ação
             log_message = f"Premium do servidor {server_id} estendido até {new_end.strftime('%d/%m/%Y %H:%M')}"
@@ -958,6 +873,7 @@ def setup_admin_complete(app):
                 DELETE FROM configuracoes_servidor WHERE id_servidor = $1
             """
             db_manager.execute_command_sync(config_delete_query, server_id)
+            guild_settings.publish_change_sync(server_id)
             
             # Log da ação
             log_message = f"Servidor {server_id} removido do premium"
@@ -980,17 +896,15 @@ def setup_admin_complete(app):
     def admin_api_stats():
         """API para estatísticas em tempo real"""
         try:
-            if not db_manager:
-                return jsonify({'error': 'Database not available'})
-            
-            # Estatísticas rápidas
-            stats = db_manager.execute_one_sync("""
-                SELECT 
-                    (SELECT COUNT(*) FROM usuarios) as total_users,
-                    (SELECT COUNT(*) FROM usuarios WHERE categoria = 'Guardião') as guardians,
-                    (SELECT COUNT(*) FROM denuncias WHERE status = 'Pendente') as pending_reports,
-                    (SELECT COUNT(*) FROM denuncias WHERE data_criacao >= NOW() - INTERVAL '24 hours') as reports_24h
-            """)
+            snapshot = dashboard_stats.get()
+            counts = snapshot['counts']
+            stats = {
+                'total_users': counts.get('total_usuarios'),
+                'guardians': counts.get('total_guardioes'),
+                'pending_reports': counts.get('denuncias_pendentes'),
+                'reports_24h': counts.get('novas_24h'),
+                'updated_at': snapshot['atualizado_em'].isoformat() if snapshot['atualizado_em'] else None
+            } if counts else {}
             
             return jsonify(stats or {})
             
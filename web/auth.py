@@ -11,6 +11,7 @@ from urllib.parse import urlencode
 import secrets
 from datetime import datetime, timedelta
 from database.connection import db_manager
+from utils.discord_rest import discord_rest, Route
 from config import DISCORD_CLIENT_ID, DISCORD_CLIENT_SECRET, FLASK_SECRET_KEY
 
 # Configuração de logging
@@ -222,12 +223,8 @@ def exchange_code_for_token(code: str) -> dict:
             'redirect_uri': url_for('callback', _external=True)
         }
         
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded'
-        }
-        
-        import requests
-        response = requests.post(DISCORD_TOKEN_URL, data=data, headers=headers)
+        # Corpo form-urlencoded, sem o token do bot
+        response = discord_rest.request_sync(Route('POST', '/oauth2/token'), data=data, auth=False)
         if response.status_code == 200:
             token_data = response.json()
             logger.info("Token de acesso obtido com sucesso")
@@ -245,12 +242,7 @@ def exchange_code_for_token(code: str) -> dict:
 def get_user_info(access_token: str) -> dict:
     """Obtém informações do usuário do Discord"""
     try:
-        headers = {
-            'Authorization': f'Bearer {access_token}'
-        }
-        
-        import requests
-        response = requests.get(f"{DISCORD_API_BASE}/users/@me", headers=headers)
+        response = discord_rest.request_sync(Route('GET', '/users/@me'), bearer_token=access_token)
         if response.status_code == 200:
             user_data = response.json()
             logger.info(f"Informações do usuário obtidas: {user_data['username']}")
@@ -268,12 +260,7 @@ def get_user_info(access_token: str) -> dict:
 def get_user_guilds(access_token: str) -> list:
     """Obtém lista de servidores do usuário"""
     try:
-        headers = {
-            'Authorization': f'Bearer {access_token}'
-        }
-        
-        import requests
-        response = requests.get(f"{DISCORD_API_BASE}/users/@me/guilds", headers=headers)
+        response = discord_rest.request_sync(Route('GET', '/users/@me/guilds'), bearer_token=access_token)
         if response.status_code == 200:
             guilds_data = response.json()
             logger.info(f"Lista de servidores obtida: {len(guilds_data)} servidores")
@@ -0,0 +1,174 @@
+"""
+Estatísticas do Dashboard Admin - Sistema Guardião BETA
+Snapshot em memória dos totais exibidos por /admin/dashboard, /admin/api/stats e /api/stats
+
+Os totais são recalculados por uma thread a cada DASHBOARD_REFRESH_SECONDS
+(ou na hora, pelo botão "Atualizar agora" do dashboard) e as rotas apenas
+leem o último snapshot, que traz o horário em que foi calculado. Os totais de
+denúncias vêm de denuncias_daily_rollup. Cada processo (bot ou worker do
+gunicorn) mantém o seu snapshot; a thread só começa na primeira leitura.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from database.connection import db_manager
+from config import DASHBOARD_REFRESH_SECONDS
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Todos os totais do dashboard em um único round trip
+SNAPSHOT_COUNTS_QUERY = """
+    SELECT u.*, r.*, v.*, p.*,
+           (SELECT COUNT(*) FROM denuncias WHERE data_criacao >= NOW() - INTERVAL '24 hours') AS novas_24h
+    FROM (
+        SELECT COUNT(*) AS total_usuarios,
+               COUNT(*) FILTER (WHERE categoria = 'Guardião') AS total_guardioes,
+               COUNT(*) FILTER (WHERE em_servico = true) AS guardioes_servico,
+               COUNT(*) FILTER (WHERE data_criacao_registro >= NOW() - INTERVAL '24 hours') AS novos_24h
+        FROM usuarios
+    ) u, (
+        SELECT COALESCE(SUM(quantidade), 0) AS total_denuncias,
+               COALESCE(SUM(quantidade) FILTER (WHERE status = 'Pendente'), 0) AS denuncias_pendentes,
+               COALESCE(SUM(quantidade) FILTER (WHERE status = 'Em Análise'), 0) AS denuncias_analise,
+               COALESCE(SUM(quantidade) FILTER (WHERE status = 'Finalizada'), 0) AS denuncias_finalizadas,
+               COUNT(DISTINCT id_servidor) FILTER (WHERE quantidade > 0) AS total_servidores
+        FROM denuncias_daily_rollup
+    ) r, (
+        SELECT COUNT(*) AS total_votos,
+               COUNT(*) FILTER (WHERE voto = 'OK!') AS votos_ok,
+               COUNT(*) FILTER (WHERE voto = 'Intimidou') AS votos_intimidou,
+               COUNT(*) FILTER (WHERE voto = 'Grave') AS votos_grave
+        FROM votos_guardioes
+    ) v, (
+        SELECT COUNT(*) AS total_premium,
+               COUNT(*) FILTER (WHERE data_fim > NOW()) AS premium_ativos
+        FROM servidores_premium
+    ) p
+"""
+
+RECENT_USERS_QUERY = """
+    SELECT id_discord, username, display_name, categoria, data_criacao_registro
+    FROM usuarios
+    ORDER BY data_criacao_registro DESC
+    LIMIT 5
+"""
+
+RECENT_REPORTS_QUERY = """
+    SELECT d.id, d.id_denunciado, d.motivo, d.status, d.data_criacao
+    FROM denuncias d
+    ORDER BY d.data_criacao DESC
+    LIMIT 5
+"""
+
+RECENT_ACTIVITY_QUERY = """
+    SELECT 'denuncia' as tipo, data_criacao as data, motivo as descricao
+    FROM denuncias
+    WHERE data_criacao >= NOW() - INTERVAL '24 hours'
+    UNION ALL
+    SELECT 'voto' as tipo, data_voto as data, CONCAT('Voto: ', voto) as descricao
+    FROM votos_guardioes
+    WHERE data_voto >= NOW() - INTERVAL '24 hours'
+    ORDER BY data DESC
+    LIMIT 10
+"""
+
+# Snapshot antes do primeiro cálculo bem-sucedido
+EMPTY_SNAPSHOT = {
+    'counts': {},
+    'recent_users': [],
+    'recent_denuncias': [],
+    'activity': [],
+    'atualizado_em': None
+}
+
+
+class DashboardStats:
+    """
+    Snapshot dos totais do dashboard com recálculo periódico em segundo plano
+
+    Em caso de erro no recálculo o snapshot anterior continua sendo servido.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._refresh_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _compute(self) -> Dict[str, Any]:
+        """Executa as queries do snapshot"""
+        started = time.monotonic()
+        counts = db_manager.execute_one_sync(SNAPSHOT_COUNTS_QUERY)
+        if counts is None:
+            raise RuntimeError("consulta dos totais não retornou resultado")
+        snapshot = {
+            'counts': counts,
+            'recent_users': db_manager.execute_query_sync(RECENT_USERS_QUERY) or [],
+            'recent_denuncias': db_manager.execute_query_sync(RECENT_REPORTS_QUERY) or [],
+            'activity': db_manager.execute_query_sync(RECENT_ACTIVITY_QUERY) or [],
+            'atualizado_em': datetime.now()
+        }
+        logger.debug(f"📊 Snapshot do dashboard recalculado em {time.monotonic() - started:.2f}s")
+        return snapshot
+
+    def _refresh_locked(self) -> bool:
+        """Recalcula o snapshot (chamador segura _refresh_lock)"""
+        try:
+            self._snapshot = self._compute()
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao recalcular estatísticas do dashboard: {e}")
+            return False
+
+    def refresh(self) -> bool:
+        """
+        Recalcula o snapshot (chamadas simultâneas são serializadas)
+
+        Returns:
+            True se o snapshot foi atualizado
+        """
+        with self._refresh_lock:
+            return self._refresh_locked()
+
+    def _run(self):
+        """Loop da thread de recálculo"""
+        while True:
+            time.sleep(self.refresh_seconds)
+            self.refresh()
+
+    def start(self):
+        """Inicia a thread de recálculo (uma por processo, mesmo com requisições simultâneas)"""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="dashboard-stats-refresh", daemon=True)
+                self._thread.start()
+
+    def get(self) -> Dict[str, Any]:
+        """
+        Último snapshot (calcula na hora apenas na primeira leitura do processo)
+
+        Returns:
+            Dicionário com counts, recent_users, recent_denuncias, activity e atualizado_em
+        """
+        if self._snapshot is None:
+            with self._refresh_lock:
+                # Outra requisição pode ter calculado enquanto esta esperava o lock
+                if self._snapshot is None:
+                    self._refresh_locked()
+        self.start()
+        return self._snapshot or EMPTY_SNAPSHOT
+
+    def refresh_now(self) -> bool:
+        """Ação "Atualizar agora" do admin: recalcula imediatamente"""
+        updated = self.refresh()
+        self.start()
+        return updated
+
+
+# Instância global das estatísticas do dashboard
+dashboard_stats = DashboardStats(DASHBOARD_REFRESH_SECONDS)
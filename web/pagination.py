@@ -0,0 +1,201 @@
+"""
+Paginação das Listas do Painel - Sistema Guardião BETA
+Paginação por cursor (keyset) e totais estimados/cacheados
+
+As listas são ordenadas por (coluna de data DESC, id DESC). O cursor é o par
+(data, id) da última (ou primeira) linha exibida, serializado em base64: a
+página seguinte usa `(data, id) < cursor` e o custo não cresce com a
+profundidade, ao contrário de OFFSET. Os totais vêm de pg_class.reltuples
+quando não há filtro e de um COUNT(*) cacheado por COUNT_CACHE_TTL_SECONDS
+quando há.
+"""
+
+import base64
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from database.connection import db_manager
+from config import COUNT_CACHE_TTL_SECONDS, COUNT_EXACT_BELOW
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Cursor opaco de uma linha"""
+    raw = json.dumps([sort_value.isoformat(), row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Valores do cursor ou None se ausente/inválido (volta para a primeira página)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except Exception:
+        logger.warning(f"⚠️ Cursor de paginação inválido: {cursor[:50]}")
+        return None
+
+
+class KeysetPage:
+    """Linhas de uma página e os cursores das páginas vizinhas"""
+
+    __slots__ = ('rows', 'next_cursor', 'prev_cursor')
+
+    def __init__(self, rows: List[Dict], next_cursor: Optional[str], prev_cursor: Optional[str]):
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def as_dict(self) -> Dict[str, Optional[str]]:
+        """Cursores no formato das APIs JSON"""
+        return {'next_cursor': self.next_cursor, 'prev_cursor': self.prev_cursor}
+
+
+def fetch_keyset_page(select_sql: str, where_conditions: List[str], params: List[Any],
+                      sort_column: Tuple[str, str], id_column: Tuple[str, str], per_page: int,
+                      after: Optional[str] = None, before: Optional[str] = None) -> KeysetPage:
+    """
+    Busca uma página ordenada por (data DESC, id DESC)
+
+    Args:
+        select_sql: SELECT ... FROM ... JOIN ... (sem WHERE/ORDER/LIMIT)
+        where_conditions: Filtros já numerados ($1..$n de params)
+        params: Parâmetros dos filtros
+        sort_column: (expressão SQL, chave na linha) da data, ex. ('d.data_criacao', 'data_criacao')
+        id_column: (expressão SQL, chave na linha) do desempate, ex. ('d.id', 'id')
+        per_page: Linhas por página
+        after: Cursor da página seguinte (linhas mais antigas)
+        before: Cursor da página anterior (linhas mais novas)
+
+    Returns:
+        KeysetPage com as linhas em ordem decrescente
+    """
+    conditions = list(where_conditions)
+    params = list(params)
+    sort_sql, sort_key = sort_column
+    id_sql, id_key = id_column
+
+    backwards = False
+    cursor = decode_cursor(after)
+    if cursor is None:
+        cursor = decode_cursor(before)
+        backwards = cursor is not None
+
+    if cursor:
+        operator = '>' if backwards else '<'
+        conditions.append(f"({sort_sql}, {id_sql}) {operator} (${len(params) + 1}, ${len(params) + 2})")
+        params.extend(cursor)
+
+    direction = 'ASC' if backwards else 'DESC'
+    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+    query = f"""
+        {select_sql}
+        {where_clause}
+        ORDER BY {sort_sql} {direction}, {id_sql} {direction}
+        LIMIT ${len(params) + 1}
+    """
+    rows = db_manager.execute_query_sync(query, *params, per_page + 1)
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    if not rows:
+        return KeysetPage([], None, None)
+
+    first, last = rows[0], rows[-1]
+    # Indo para trás, "mais linhas" significa que existe página anterior; para frente, seguinte
+    has_next = (cursor is not None) if backwards else has_more
+    has_prev = has_more if backwards else (cursor is not None)
+    return KeysetPage(
+        rows,
+        encode_cursor(last[sort_key], last[id_key]) if has_next else None,
+        encode_cursor(first[sort_key], first[id_key]) if has_prev else None
+    )
+
+
+class CountCache:
+    """
+    Totais das listas do painel
+
+    Sem filtros o total vem de pg_class.reltuples (estatística do planner,
+    atualizada pelo autovacuum) e só é contado de verdade em tabelas pequenas.
+    Com filtros o COUNT(*) é guardado por COUNT_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[tuple, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                return entry[0]
+            return None
+
+    def _put(self, key: tuple, value: Any):
+        with self._lock:
+            # Descarta as expiradas antes de crescer (poucas combinações de filtro por lista)
+            now = time.monotonic()
+            for stale in [k for k, (_, expires) in self._entries.items() if expires <= now]:
+                del self._entries[stale]
+            self._entries[key] = (value, now + self.ttl_seconds)
+
+    def fetch_one_sync(self, query: str, *params) -> Optional[Dict]:
+        """Resultado cacheado de uma query de agregação (uma linha)"""
+        key = (query, params)
+        cached = self._get(key)
+        if cached is None:
+            cached = db_manager.execute_one_sync(query, *params)
+            if cached is not None:
+                self._put(key, cached)
+        return cached
+
+    def estimate_table(self, table: str) -> Tuple[int, bool]:
+        """
+        Total de linhas de uma tabela sem filtro
+
+        Returns:
+            Tupla (total, é_estimativa)
+        """
+        row = self.fetch_one_sync(
+            "SELECT reltuples::bigint AS estimativa FROM pg_class WHERE oid = $1::regclass", table
+        )
+        estimate = row['estimativa'] if row else -1
+        if estimate >= COUNT_EXACT_BELOW:
+            return estimate, True
+        # Tabela pequena ou nunca analisada (reltuples = -1): a contagem exata é barata
+        exact = self.fetch_one_sync(f"SELECT COUNT(*) AS total FROM {table}")
+        return (exact['total'] if exact else 0), False
+
+    def count(self, table: str, count_query: str, where_conditions: List[str], params: List[Any]) -> Tuple[int, bool]:
+        """
+        Total de uma lista: estimativa sem filtros, COUNT(*) cacheado com filtros
+
+        Args:
+            table: Tabela principal (usada quando não há filtros)
+            count_query: SELECT COUNT(*) AS total FROM ... (sem WHERE)
+            where_conditions: Filtros numerados ($1..$n)
+            params: Parâmetros dos filtros
+
+        Returns:
+            Tupla (total, é_estimativa)
+        """
+        if not where_conditions:
+            return self.estimate_table(table)
+        row = self.fetch_one_sync(f"{count_query} WHERE {' AND '.join(where_conditions)}", *params)
+        return (row['total'] if row else 0), False
+
+
+# Instância global do cache de totais
+count_cache = CountCache(COUNT_CACHE_TTL_SECONDS)
@@ -7,7 +7,16 @@ import os
 import logging
 from datetime import datetime, timedelta
 from flask import render_template, request, redirect, url_for, flash, jsonify, session
-import discord
+from utils.discord_rest import discord_rest
+from utils.evidence_cache import evidence_cache
+from utils.guild_settings import guild_settings
+from utils.bot_guilds import bot_guilds
+from utils.user_profiles import user_profiles
+from utils.report_rollups import report_rollups
+from web.pagination import fetch_keyset_page, count_cache
+from web.dashboard_stats import dashboard_stats
+from utils.event_bus import event_bus, BROADCAST_SOLICITADO, USUARIO_BANIDO, LOG_SERVIDOR
+from utils.broadcasts import broadcast_runner, BROADCAST_TARGETS
 
 # Configuração de logging
 logger = logging.getLogger(__name__)
@@ -58,139 +67,18 @@ except Exception as e:
 def setup_routes(app):
     """Configura todas as rotas da aplicação"""
     
-    def get_bot_instance():
-        """Obtém a instância do bot de forma simples - COMO OUTRAS PARTES QUE FUNCIONAM"""
-        try:
-            # Importa o bot diretamente como outras partes que funcionam
-            from main import bot
-            return bot
-        except ImportError as e:
-            logger.error(f"❌ Erro ao importar bot: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"❌ Erro ao acessar bot: {e}")
-            return None
-    
-    
-    def send_dm_to_user(bot, user_id: int, embed, user_type: str = "usuário"):
-        """Envia DM para um usuário específico - SOLUÇÃO DEFINITIVA: SEM LOOP DO BOT"""
-        try:
-            logger.info(f"🔍 send_dm_to_user iniciado para {user_type} {user_id}")
-            
-            # SOLUÇÃO DEFINITIVA: Usa requests para enviar DM via API do Discord
-            # Não depende do loop do bot
-            import requests
-            import os
-            
-            # Pega o token do bot
-            bot_token = os.getenv('DISCORD_TOKEN')
-            if not bot_token:
-                logger.error("DISCORD_TOKEN não configurado")
-                return False
-            
-            # Cria DM channel via API
-            headers = {'Authorization': f'Bot {bot_token}', 'Content-Type': 'application/json'}
-            
-            # Cria DM channel
-            dm_data = {'recipient_id': str(user_id)}
-            dm_response = requests.post('https://discord.com/api/v10/users/@me/channels', 
-                                      headers=headers, json=dm_data)
-            
-            if dm_response.status_code != 200:
-                logger.error(f"Erro ao criar DM channel: {dm_response.status_code}")
-                return False
-            
-            dm_channel = dm_response.json()
-            channel_id = dm_channel['id']
-            
-            # Envia mensagem via API
-            message_data = {
-                'embeds': [{
-                    'title': embed.title,
-                    'description': embed.description,
-                    'color': embed.color.value if embed.color else 0x00ff00,
-                    'footer': {'text': embed.footer.text} if embed.footer else None
-                }]
-            }
-            
-            message_response = requests.post(f'https://discord.com/api/v10/channels/{channel_id}/messages',
-                                          headers=headers, json=message_data)
-            
-            if message_response.status_code == 200:
-                logger.info(f"✅ Mensagem enviada para {user_type} {user_id}")
-                return True
-            else:
-                logger.error(f"Erro ao enviar mensagem: {message_response.status_code}")
-                return False
-                
-        except discord.Forbidden:
-            logger.warning(f"Não foi possível enviar DM para {user_type} {user_id} - DMs bloqueados")
-            return False
-        except discord.HTTPException as e:
-            logger.error(f"Erro HTTP ao enviar DM para {user_type} {user_id}: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Erro ao enviar DM para {user_type} {user_id}: {e}")
-            return False
-    
     def send_log_to_channel(server_id: int, log_type: str, title: str, description: str, color: int = 0x00ff00, fields: list = None):
-        """Envia log para o canal configurado do servidor premium"""
-        try:
-            logger.info(f"📝 Enviando log para servidor {server_id}: {log_type}")
-            
-            # Busca configurações do servidor
-            config_query = """
-                SELECT canal_log FROM configuracoes_servidor 
-                WHERE id_servidor = $1 AND canal_log IS NOT NULL
-            """
-            config = db_manager.execute_one_sync(config_query, server_id)
-            
-            if not config or not config['canal_log']:
-                logger.info(f"📝 Servidor {server_id} não tem canal de log configurado")
-                return False
-            
-            canal_log_id = config['canal_log']
-            logger.info(f"📝 Canal de log configurado: {canal_log_id}")
-            
-            # Usa requests para enviar log via API do Discord
-            import requests
-            import os
-            
-            bot_token = os.getenv('DISCORD_TOKEN')
-            if not bot_token:
-                logger.error("DISCORD_TOKEN não configurado")
-                return False
-            
-            headers = {'Authorization': f'Bot {bot_token}', 'Content-Type': 'application/json'}
-            
-            # Cria embed do log
-            embed_data = {
-                'title': title,
-                'description': description,
-                'color': color,
-                'timestamp': datetime.utcnow().isoformat(),
-                'footer': {'text': f'Sistema Guardião BETA - {log_type}'}
-            }
-            
-            if fields:
-                embed_data['fields'] = fields
-            
-            # Envia mensagem para o canal de log
-            message_data = {'embeds': [embed_data]}
-            
-            response = requests.post(f'https://discord.com/api/v10/channels/{canal_log_id}/messages',
-                                   headers=headers, json=message_data)
-            
-            if response.status_code == 200:
-                logger.info(f"✅ Log enviado para canal {canal_log_id} do servidor {server_id}")
-                return True
-            else:
-                logger.error(f"❌ Erro ao enviar log: {response.status_code} - {response.text}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"❌ Erro ao enviar log para servidor {server_id}: {e}")
-            return False
+        """
+        Pede ao bot o envio de um log para o canal configurado do servidor premium
+        
+        O envio é feito pelo bot (evento LOG_SERVIDOR); a requisição não espera o Discord.
+        """
+        logger.info(f"📝 Solicitando log para servidor {server_id}: {log_type}")
+        return event_bus.publish_sync(
+            LOG_SERVIDOR, id_servidor=int(server_id), tipo_log=log_type,
+            titulo=title, descricao=description, cor=color, campos=fields
+        )
+    
     logger.info("🚀 Iniciando configuração de rotas...")
     
     @app.route('/')
@@ -321,11 +209,7 @@ def setup_routes(app):
             server_stats = get_server_stats(server_id)
             
             # Verifica se é servidor premium
-            premium_query = """
-                SELECT * FROM servidores_premium 
-                WHERE id_servidor = $1 AND data_fim > NOW()
-            """
-            premium_data = db_manager.execute_one_sync(premium_query, server_id)
+            premium_data = guild_settings.get_sync(server_id).premium_data
             is_premium = premium_data is not None
             
             # Busca configurações do servidor (se premium)
@@ -364,69 +248,27 @@ def setup_routes(app):
             user_data = session['user']
             admin_guilds = get_user_guilds_admin()
             
-            # Busca informações completas para cada servidor
+            # Premium, presença do bot e denúncias de todos os servidores em no máximo duas queries
+            guild_ids = [int(guild['id']) for guild in admin_guilds]
+            settings = guild_settings.get_many_sync(guild_ids)
+            overview = bot_guilds.overview_sync(guild_ids)
+            
             servers_info = []
             for guild in admin_guilds:
                 guild_id = int(guild['id'])
-                
-                # Verificar premium
-                premium_query = """
-                    SELECT *, 
-                           data_fim AT TIME ZONE 'UTC' AT TIME ZONE 'America/Sao_Paulo' as data_fim_br
-                    FROM servidores_premium 
-                    WHERE id_servidor = $1 AND data_fim > NOW()
-                """
-                premium_data = db_manager.execute_one_sync(premium_query, guild_id)
-                
-                # Verificar se bot está no servidor (tentar buscar canais)
-                bot_in_server = False
-                bot_token = os.getenv('DISCORD_TOKEN')
-                
-                if bot_token:
-                    try:
-                        import requests
-                        headers = {'Authorization': f'Bot {bot_token}'}
-                        response = requests.get(f'https://discord.com/api/v10/guilds/{guild_id}/channels', headers=headers, timeout=5)
-                        bot_in_server = response.status_code == 200
-                        
-                        if not bot_in_server:
-                            logger.warning(f"Bot não está no servidor {guild['name']} (ID: {guild_id}) - Status: {response.status_code}")
-                    except Exception as e:
-                        logger.error(f"Erro ao verificar bot no servidor {guild['name']}: {e}")
-                        bot_in_server = False
-                else:
-                    # TEMPORÁRIO: Se não tem token, assumir que bot está presente
-                    # Isso evita mostrar "Não Protegido" para todos os servidores
-                    logger.warning(f"DISCORD_TOKEN não configurado - assumindo bot presente no servidor {guild['name']}")
-                    bot_in_server = True
-                
-                # Buscar estatísticas de denúncias
-                denuncias_stats = {'pendentes': 0, 'analise': 0, 'total': 0}
-                try:
-                    stats_query = """
-                        SELECT 
-                            COUNT(*) as total,
-                            SUM(CASE WHEN status = 'Pendente' THEN 1 ELSE 0 END) as pendentes,
-                            SUM(CASE WHEN status = 'Em Análise' THEN 1 ELSE 0 END) as analise
-                        FROM denuncias 
-                        WHERE id_servidor = $1 AND status IN ('Pendente', 'Em Análise')
-                    """
-                    stats_result = db_manager.execute_one_sync(stats_query, guild_id)
-                    if stats_result:
-                        denuncias_stats = {
-                            'pendentes': stats_result['pendentes'] or 0,
-                            'analise': stats_result['analise'] or 0,
-                            'total': stats_result['total'] or 0
-                        }
-                except Exception as e:
-                    logger.error(f"Erro ao buscar stats de denúncias: {e}")
+                premium_data = settings[guild_id].premium_data if guild_id in settings else None
+                guild_overview = overview.get(guild_id) or {}
                 
                 servers_info.append({
                     'guild': guild,
                     'is_premium': premium_data is not None,
                     'premium_data': premium_data,
-                    'bot_in_server': bot_in_server,
-                    'denuncias_stats': denuncias_stats,
+                    'bot_in_server': bool(guild_overview.get('bot_presente')),
+                    'denuncias_stats': {
+                        'pendentes': guild_overview.get('pendentes', 0),
+                        'analise': guild_overview.get('analise', 0),
+                        'total': guild_overview.get('total', 0)
+                    },
                     'icon_url': get_guild_icon_url(guild['id'], guild.get('icon'))
                 })
             
@@ -459,14 +301,7 @@ def setup_routes(app):
                 return redirect(url_for('servers'))
             
             # Verificar se o servidor tem premium ativo
-            premium_query = """
-                SELECT *, 
-                       data_inicio AT TIME ZONE 'UTC' AT TIME ZONE 'America/Sao_Paulo' as data_inicio_br,
-                       data_fim AT TIME ZONE 'UTC' AT TIME ZONE 'America/Sao_Paulo' as data_fim_br
-                FROM servidores_premium 
-                WHERE id_servidor = $1 AND data_fim > NOW()
-            """
-            premium_data = db_manager.execute_one_sync(premium_query, server_id)
+            premium_data = guild_settings.get_sync(server_id).premium_data
             
             if not premium_data:
                 flash('Este servidor não possui premium ativo.', 'warning')
@@ -515,69 +350,21 @@ def setup_routes(app):
             admin_guilds = get_user_guilds_admin()
             
             # Filtrar apenas servidores onde o bot está presente e que não têm premium
-            available_servers = []
-            logger.info(f"🔍 Verificando {len(admin_guilds)} servidores para seleção premium...")
-            
-            # Obter token uma vez
-            bot_token = os.getenv('DISCORD_TOKEN')
-            if not bot_token:
-                logger.warning("⚠️ DISCORD_TOKEN não encontrado no .env - assumindo bot presente em todos os servidores")
+            guild_ids = [int(guild['id']) for guild in admin_guilds]
+            settings = guild_settings.get_many_sync(guild_ids)
+            overview = bot_guilds.overview_sync(guild_ids)
             
+            available_servers = []
             for guild in admin_guilds:
                 guild_id = int(guild['id'])
-                guild_name = guild.get('name', 'Servidor Desconhecido')
-                
-                logger.info(f"📊 Verificando servidor: {guild_name} (ID: {guild_id})")
-                
-                # Verificar se bot está no servidor
-                bot_in_server = False
-                if bot_token:
-                    try:
-                        import requests
-                        logger.info(f"  🔑 Token encontrado: {bot_token[:20]}...")
-                        headers = {'Authorization': f'Bot {bot_token}'}
-                        response = requests.get(f'https://discord.com/api/v10/guilds/{guild_id}/channels', headers=headers, timeout=5)
-                        bot_in_server = response.status_code == 200
-                        logger.info(f"  📡 Discord API response: {response.status_code}")
-                        if response.status_code != 200:
-                            logger.warning(f"  ⚠️ Discord API error: {response.text[:200]}")
-                        logger.info(f"  🤖 Bot no servidor: {'✅ Sim' if bot_in_server else '❌ Não'}")
-                    except Exception as e:
-                        logger.warning(f"  ⚠️ Erro ao verificar bot: {e}")
-                        bot_in_server = False
-                else:
-                    # Se não tem token, assumir que bot está presente
-                    logger.warning(f"  ⚠️ Sem token, assumindo bot presente")
-                    bot_in_server = True
-                
-                # Verificar se já tem premium ativo
-                has_premium = False
-                try:
-                    premium_query = """
-                        SELECT id_servidor FROM servidores_premium 
-                        WHERE id_servidor = $1 AND data_fim > NOW()
-                    """
-                    has_premium = db_manager.execute_one_sync(premium_query, guild_id) is not None
-                    logger.info(f"  💎 Premium ativo: {'❌ Sim (não elegível)' if has_premium else '✅ Não (elegível)'}")
-                except Exception as e:
-                    logger.error(f"  ❌ Erro ao verificar premium: {e}")
-                    has_premium = False  # Se erro, assume que não tem premium
-                
-                # Adicionar à lista se elegível
+                bot_in_server = bool((overview.get(guild_id) or {}).get('bot_presente'))
+                has_premium = guild_id in settings and settings[guild_id].is_premium
                 
                 if bot_in_server and not has_premium:
                     available_servers.append({
                         'guild': guild,
                         'icon_url': get_guild_icon_url(guild['id'], guild.get('icon'))
                     })
-                    logger.info(f"  ✅ Servidor adicionado à lista de elegíveis!")
-                else:
-                    reason = []
-                    if not bot_in_server:
-                        reason.append("bot não presente")
-                    if has_premium:
-                        reason.append("já tem premium")
-                    logger.info(f"  ❌ Servidor não elegível: {', '.join(reason)}")
             
             logger.info(f"📋 Total de servidores elegíveis: {len(available_servers)}")
             
@@ -615,10 +402,7 @@ def setup_routes(app):
                 return jsonify({'error': 'Acesso negado ao servidor'}), 403
             
             # Usar a API do Discord através do bot para obter canais
-            import requests
-            bot_token = os.getenv('DISCORD_TOKEN')
-            
-            if not bot_token:
+            if not discord_rest.has_token:
                 logger.error("DISCORD_TOKEN não configurado para buscar canais")
                 # Retornar canais fictícios para permitir teste
                 fake_channels = [
@@ -633,8 +417,7 @@ def setup_routes(app):
                     'warning': 'Token do bot não configurado - canais fictícios para teste'
                 })
                 
-            headers = {'Authorization': f'Bot {bot_token}'}
-            response = requests.get(f'https://discord.com/api/v10/guilds/{server_id}/channels', headers=headers)
+            response = discord_rest.run_sync(discord_rest.get_guild_channels(server_id))
             
             logger.info(f"Discord API response para servidor {server_id}: {response.status_code}")
             
@@ -688,13 +471,7 @@ def setup_routes(app):
                 return jsonify({'error': 'Acesso negado ao servidor'}), 403
             
             # Verificar se o servidor tem premium ativo
-            premium_check = """
-                SELECT id_servidor FROM servidores_premium 
-                WHERE id_servidor = $1 AND data_fim > NOW()
-            """
-            premium_exists = db_manager.execute_one_sync(premium_check, server_id)
-            
-            if not premium_exists:
+            if not guild_settings.get_sync(server_id).is_premium:
                 return jsonify({'error': 'Servidor não possui premium ativo'}), 403
             
             # Obter dados do formulário
@@ -734,6 +511,7 @@ def setup_routes(app):
             """
             
             db_manager.execute_query_sync(upsert_config, server_id, canal_log, duracao_intimidou, duracao_grave)
+            guild_settings.publish_change_sync(server_id)
             
             logger.info(f"Configurações premium salvas para servidor {server_id}")
             
@@ -780,11 +558,7 @@ def setup_routes(app):
                 return jsonify({'success': False, 'error': 'Acesso negado ao servidor'}), 403
             
             # Verificar se o servidor já tem premium
-            premium_check = """
-                SELECT id_servidor FROM servidores_premium 
-                WHERE id_servidor = $1 AND data_fim > NOW()
-            """
-            has_premium = db_manager.execute_one_sync(premium_check, int(server_id)) is not None
+            has_premium = guild_settings.get_sync(int(server_id)).is_premium
             
             if has_premium:
                 return jsonify({'success': False, 'error': 'Este servidor já possui premium ativo'}), 400
@@ -949,6 +723,8 @@ def setup_routes(app):
                     
                     db_manager.execute_query_sync(activate_premium_basic_query, int(server_id), data_fim)
                 
+                guild_settings.publish_premium_sync(int(server_id), data_fim)
+                
                 logger.info(f"✅ Premium ativado com sucesso via página de sucesso!")
                 logger.info(f"- Usuário: {user_id}")
                 logger.info(f"- Servidor: {server_id}")
@@ -1047,6 +823,8 @@ def setup_routes(app):
                             
                             db_manager.execute_query_sync(activate_premium_basic_query, int(server_id), data_fim)
                         
+                        guild_settings.publish_premium_sync(int(server_id), data_fim)
+                        
                         logger.info(f"✅ Premium ativado com sucesso!")
                         logger.info(f"- Usuário: {user_id}")
                         logger.info(f"- Servidor: {server_id}")
@@ -1106,58 +884,45 @@ def setup_routes(app):
                 return jsonify({'error': 'Sem permissão'}), 403
             
             # Parâmetros de filtro
-            page = request.args.get('page', 1, type=int)
-            per_page = request.args.get('per_page', 20, type=int)
+            per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
             status = request.args.get('status', None)
-            periodo = request.args.get('periodo', '90')  # dias - aumentado para mostrar mais denúncias
-            
-            # Calcula offset
-            offset = (page - 1) * per_page
             
-            # Query base
-            where_conditions = ["id_servidor = $1"]
+            # Filtro por período (fixo em 90 dias)
+            where_conditions = ["d.id_servidor = $1", "d.data_criacao >= NOW() - INTERVAL '90 days'"]
             params = [server_id]
-            param_count = 1
             
             # Filtro por status
             if status:
-                param_count += 1
-                where_conditions.append(f"status = ${param_count}")
                 params.append(status)
+                where_conditions.append(f"d.status = ${len(params)}")
             
-            # Filtro por período (fixo em 90 dias)
-            where_conditions.append("data_criacao >= NOW() - INTERVAL '90 days'")
-            
-            # Query principal
-            query = f"""
+            # Página por cursor (after = mais antigas, before = mais novas)
+            page = fetch_keyset_page(
+                """
                 SELECT d.*, 
                        u.username as denunciante_name,
                        u2.username as denunciado_name
                 FROM denuncias d
                 LEFT JOIN usuarios u ON d.id_denunciante = u.id_discord
                 LEFT JOIN usuarios u2 ON d.id_denunciado = u2.id_discord
-                WHERE {' AND '.join(where_conditions)}
-                ORDER BY d.data_criacao DESC
-                LIMIT ${param_count + 1} OFFSET ${param_count + 2}
-            """
-            params.extend([per_page, offset])
-            
-            denuncias = db_manager.execute_query_sync(query, *params)
+                """,
+                where_conditions, params,
+                ('d.data_criacao', 'data_criacao'), ('d.id', 'id'), per_page,
+                after=request.args.get('after'), before=request.args.get('before')
+            )
             
-            # Conta total para paginação
-            count_query = f"""
-                SELECT COUNT(*) FROM denuncias 
-                WHERE {' AND '.join(where_conditions)}
-            """
-            total = db_manager.execute_scalar_sync(count_query, *params[:-2])  # Remove limit e offset
+            # Total cacheado (não é recontado a cada página)
+            total, estimated = count_cache.count(
+                'denuncias', "SELECT COUNT(*) AS total FROM denuncias d", where_conditions, params
+            )
             
             return jsonify({
-                'denuncias': denuncias,
+                'denuncias': page.rows,
                 'pagination': {
-                    'page': page,
                     'per_page': per_page,
                     'total': total,
-                    'pages': (total + per_page - 1) // per_page
+                    'total_estimado': estimated,
+                    **page.as_dict()
                 }
             })
             
@@ -1225,32 +990,29 @@ def setup_routes(app):
             return redirect(url_for('dashboard'))
         
         try:
-            page = request.args.get('page', 1, type=int)
             per_page = 20
-            offset = (page - 1) * per_page
             
-            # Busca usuários com paginação
-            usuarios_query = """
+            # Busca usuários com paginação por cursor
+            page = fetch_keyset_page(
+                """
                 SELECT id_discord, username, display_name, nome_completo, categoria, 
                        pontos, experiencia, em_servico, data_criacao_registro
-                FROM usuarios 
-                ORDER BY data_criacao_registro DESC 
-                LIMIT $1 OFFSET $2
-            """
-            usuarios = db_manager.execute_query_sync(usuarios_query, per_page, offset)
-            
-            # Conta total de usuários
-            total_query = "SELECT COUNT(*) as total FROM usuarios"
-            total = db_manager.execute_one_sync(total_query)
-            total_usuarios = total['total'] if total else 0
+                FROM usuarios
+                """,
+                [], [],
+                ('data_criacao_registro', 'data_criacao_registro'), ('id_discord', 'id_discord'), per_page,
+                after=request.args.get('after'), before=request.args.get('before')
+            )
             
-            total_pages = (total_usuarios + per_page - 1) // per_page
+            # Total de usuários (estimativa do planner em tabelas grandes)
+            total_usuarios, total_estimado = count_cache.estimate_table('usuarios')
             
             return render_template('admin/usuarios.html',
-                                 usuarios=usuarios,
-                                 page=page,
-                                 total_pages=total_pages,
-                                 total_usuarios=total_usuarios)
+                                 usuarios=page.rows,
+                                 next_cursor=page.next_cursor,
+                                 prev_cursor=page.prev_cursor,
+                                 total_usuarios=total_usuarios,
+                                 total_estimado=total_estimado)
             
         except Exception as e:
             logger.error(f"Erro na lista de usuários: {e}")
@@ -1340,46 +1102,39 @@ def setup_routes(app):
     def admin_denuncias():
         """Lista de todas as denúncias"""
         try:
-            page = request.args.get('page', 1, type=int)
             status_filter = request.args.get('status', '')
             per_page = 20
-            offset = (page - 1) * per_page
             
             # Constrói query base
             where_conditions = []
             params = []
             
             if status_filter:
-                where_conditions.append("d.status = $" + str(len(params) + 1))
                 params.append(status_filter)
+                where_conditions.append(f"d.status = ${len(params)}")
             
-            where_clause = " WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-            
-            denuncias_query = f"""
+            page = fetch_keyset_page(
+                """
                 SELECT d.*, u.username as denunciado_username, u.display_name as denunciado_display_name
                 FROM denuncias d
                 LEFT JOIN usuarios u ON d.id_denunciado = u.id_discord
-                {where_clause}
-                ORDER BY d.data_criacao DESC
-                LIMIT ${len(params) + 1} OFFSET ${len(params) + 2}
-            """
-            params.extend([per_page, offset])
-            
-            denuncias = db_manager.execute_query_sync(denuncias_query, *params)
-            
-            # Conta total de denúncias
-            count_query = "SELECT COUNT(*) as total FROM denuncias d" + where_clause
-            count_params = params[:-2]  # Remove per_page e offset
-            total = db_manager.execute_one_sync(count_query, *count_params)
-            total_denuncias = total['total'] if total else 0
+                """,
+                where_conditions, params,
+                ('d.data_criacao', 'data_criacao'), ('d.id', 'id'), per_page,
+                after=request.args.get('after'), before=request.args.get('before')
+            )
             
-            total_pages = (total_denuncias + per_page - 1) // per_page
+            # Total (estimado sem filtro, cacheado com filtro)
+            total_denuncias, total_estimado = count_cache.count(
+                'denuncias', "SELECT COUNT(*) AS total FROM denuncias d", where_conditions, params
+            )
             
             return render_template('admin/denuncias.html',
-                                 denuncias=denuncias,
-                                 page=page,
-                                 total_pages=total_pages,
+                                 denuncias=page.rows,
+                                 next_cursor=page.next_cursor,
+                                 prev_cursor=page.prev_cursor,
                                  total_denuncias=total_denuncias,
+                                 total_estimado=total_estimado,
                                  status_filter=status_filter)
             
         except Exception as e:
@@ -1443,72 +1198,30 @@ def setup_routes(app):
         logger.info("🔧 Rota /admin/dashboard acessada!")
 
         try:
-            # Busca estatísticas gerais para o dashboard
-            stats = {}
-            recent_users = []
-            recent_denuncias = []
-
-            if db_manager and db_manager.pool:
-                # Estatísticas no formato esperado pelo template dashboard.html
-                stats = {
-                    'total_usuarios': 0,
-                    'total_guardioes': 0,
-                    'guardioes_servico': 0,
-                    'total_denuncias': 0,
-                    'denuncias_pendentes': 0,
-                    'denuncias_analise': 0,
-                    'denuncias_finalizadas': 0,
-                    'denuncias_resolvidas': 0,
-                    'total_votos': 0
-                }
-
-                # Buscar estatísticas reais
-                stats_query = """
-                    SELECT
-                        (SELECT COUNT(*) FROM usuarios) as total_usuarios,
-                        (SELECT COUNT(*) FROM usuarios WHERE categoria = 'Guardião') as total_guardioes,
-                        (SELECT COUNT(*) FROM usuarios WHERE em_servico = true) as guardioes_servico,
-                        (SELECT COUNT(*) FROM denuncias) as total_denuncias,
-                        (SELECT COUNT(*) FROM denuncias WHERE status = 'Pendente') as denuncias_pendentes,
-                        (SELECT COUNT(*) FROM denuncias WHERE status = 'Em Análise') as denuncias_analise,
-                        (SELECT COUNT(*) FROM denuncias WHERE status = 'Finalizada') as denuncias_finalizadas,
-                        (SELECT COUNT(*) FROM votos_guardioes) as total_votos
-                """
-                stats_result = db_manager.execute_query_sync(stats_query)
-                if stats_result:
-                    real_stats = stats_result[0]
-                    stats['total_usuarios'] = real_stats['total_usuarios'] or 0
-                    stats['total_guardioes'] = real_stats['total_guardioes'] or 0
-                    stats['guardioes_servico'] = real_stats['guardioes_servico'] or 0
-                    stats['total_denuncias'] = real_stats['total_denuncias'] or 0
-                    stats['denuncias_pendentes'] = real_stats['denuncias_pendentes'] or 0
-                    stats['denuncias_analise'] = real_stats['denuncias_analise'] or 0
-                    stats['denuncias_finalizadas'] = real_stats['denuncias_finalizadas'] or 0
-                    stats['denuncias_resolvidas'] = real_stats['denuncias_finalizadas'] or 0  # Mesmo que finalizadas
-                    stats['total_votos'] = real_stats['total_votos'] or 0
+            # Totais do snapshot em memória (web/dashboard_stats.py)
+            snapshot = dashboard_stats.get()
+            counts = snapshot['counts']
 
-                # Usuários recentes
-                recent_users_query = """
-                    SELECT id_discord, username, display_name, categoria, data_criacao_registro
-                    FROM usuarios
-                    ORDER BY data_criacao_registro DESC
-                    LIMIT 5
-                """
-                recent_users = db_manager.execute_query_sync(recent_users_query) or []
-
-                # Denúncias recentes
-                recent_denuncias_query = """
-                    SELECT d.id, d.id_denunciado, d.motivo, d.status, d.data_criacao
-                    FROM denuncias d
-                    ORDER BY d.data_criacao DESC
-                    LIMIT 5
-                """
-                recent_denuncias = db_manager.execute_query_sync(recent_denuncias_query) or []
+            # Estatísticas no formato esperado pelo template dashboard.html
+            stats = {
+                'total_usuarios': counts.get('total_usuarios') or 0,
+                'total_guardioes': counts.get('total_guardioes') or 0,
+                'guardioes_servico': counts.get('guardioes_servico') or 0,
+                'total_denuncias': counts.get('total_denuncias') or 0,
+                'denuncias_pendentes': counts.get('denuncias_pendentes') or 0,
+                'denuncias_analise': counts.get('denuncias_analise') or 0,
+                'denuncias_finalizadas': counts.get('denuncias_finalizadas') or 0,
+                'denuncias_resolvidas': counts.get('denuncias_finalizadas') or 0,  # Mesmo que finalizadas
+                'total_votos': counts.get('total_votos') or 0
+            }
+            recent_users = snapshot['recent_users']
+            recent_denuncias = snapshot['recent_denuncias']
 
             return render_template('admin/dashboard.html',
                                  stats=stats,
                                  recent_users=recent_users,
-                                 recent_denuncias=recent_denuncias)
+                                 recent_denuncias=recent_denuncias,
+                                 stats_updated_at=snapshot['atualizado_em'])
 
         except Exception as e:
             logger.error(f"Erro no dashboard admin: {e}")
@@ -1619,7 +1332,17 @@ def setup_routes(app):
         </body>
         </html>
         """
-    
+
+    @app.route('/admin/dashboard/refresh', methods=['POST'])
+    @admin_required
+    def admin_dashboard_refresh():
+        """Recalcula agora o snapshot de estatísticas do dashboard"""
+        if dashboard_stats.refresh_now():
+            flash("Estatísticas atualizadas.", "success")
+        else:
+            flash("Erro ao atualizar as estatísticas; exibindo o último snapshot.", "error")
+        return redirect(url_for('admin_dashboard'))
+
     logger.info("✅ Rota /admin registrada com sucesso no final!")
     
     # ==================== ROTAS DO SISTEMA ADMIN ====================
@@ -1690,8 +1413,26 @@ def setup_routes(app):
                 return {'success': False, 'error': 'Tabela não permitida'}
             
             # Exclui o registro
-            query = f"DELETE FROM {table_name} WHERE id = $1"
-            db_manager.execute_command_sync(query, record_id)
+            if table_name == 'mensagens_capturadas':
+                # A evidência da denúncia mudou: descarta o embed já renderizado
+                query = """
+                    DELETE FROM mensagens_capturadas m
+                    USING denuncias d
+                    WHERE m.id = $1 AND d.id = m.id_denuncia
+                    RETURNING d.hash_denuncia
+                """
+                hash_denuncia = db_manager.execute_scalar_sync(query, record_id)
+                if hash_denuncia:
+                    evidence_cache.publish_change_sync(hash_denuncia)
+            elif table_name in ('servidores_premium', 'configuracoes_servidor'):
+                # Configuração/premium do servidor mudou: invalida o cache em todos os processos
+                query = f"DELETE FROM {table_name} WHERE id = $1 RETURNING id_servidor"
+                id_servidor = db_manager.execute_scalar_sync(query, record_id)
+                if id_servidor:
+                    guild_settings.publish_change_sync(id_servidor)
+            else:
+                query = f"DELETE FROM {table_name} WHERE id = $1"
+                db_manager.execute_command_sync(query, record_id)
             
             return {'success': True}
             
@@ -1739,6 +1480,12 @@ def setup_routes(app):
                 admin_id = session['user']['id']
                 db_manager.execute_command_sync(log_query, user_id, reason, duration, admin_id)
                 
+                # O bot tira o usuário de serviço imediatamente
+                event_bus.publish_sync(
+                    USUARIO_BANIDO, id_usuario=int(user_id), motivo=reason,
+                    duracao=duration, aplicado_por=int(admin_id)
+                )
+                
                 # Envia log para o servidor (se configurado)
                 if server_id:
                     try:
@@ -1830,234 +1577,81 @@ def setup_routes(app):
     @app.route('/admin/system/message', methods=['POST'])
     @admin_required
     def admin_system_message():
-        """Envia mensagem para usuários - COMO OUTRAS PARTES QUE FUNCIONAM"""
-        logger.info("🚀 ROTA admin_system_message CHAMADA!")
-        import asyncio
-        
-        # Usa o bot diretamente como outras partes que funcionam
-        bot = get_bot_instance()
-        if not bot:
-            logger.warning("⚠️ Bot Discord não está disponível")
-            flash("Bot Discord não está disponível.", "error")
-            return redirect(url_for('admin_system'))
-        
-        async def send_message_async():
-            try:
-                logger.info("🔄 Função send_message_async iniciada!")
-                target_type = request.form.get('target_type')
-                target_user_id = request.form.get('target_user_id')
-                target_server_id = request.form.get('target_server_id')
-                message_title = request.form.get('message_title')
-                message_content = request.form.get('message_content')
-                
-                logger.info(f"📝 Dados recebidos: target_type={target_type}, title={message_title}")
-                logger.info(f"📝 Campos completos: target_type='{target_type}', message_title='{message_title}', message_content='{message_content}'")
-                logger.info(f"📝 Validação all(): {all([target_type, message_title, message_content])}")
-                
-                if not all([target_type, message_title, message_content]):
-                    logger.warning("⚠️ Campos obrigatórios não preenchidos!")
-                    flash("Campos obrigatórios não preenchidos.", "error")
+        """Envia mensagem para usuários (o bot faz o envio a partir do evento BROADCAST_SOLICITADO)"""
+        try:
+            target_type = request.form.get('target_type')
+            target_user_id = request.form.get('target_user_id')
+            target_server_id = request.form.get('target_server_id')
+            message_title = request.form.get('message_title')
+            message_content = request.form.get('message_content')
+            
+            if not all([target_type, message_title, message_content]):
+                flash("Campos obrigatórios não preenchidos.", "error")
+                return redirect(url_for('admin_system'))
+            
+            if target_type not in BROADCAST_TARGETS:
+                flash("Tipo de destinatário inválido.", "error")
+                return redirect(url_for('admin_system'))
+            
+            target_id = None
+            if target_type == 'user':
+                if not target_user_id or not target_user_id.isdigit():
+                    flash("ID do usuário é obrigatório para envio individual.", "error")
                     return redirect(url_for('admin_system'))
-                
-                # Bot já foi verificado na função get_bot_instance()
-                
-                # Logs de debug do bot
-                logger.info(f"🔍 Bot está pronto: {bot.is_ready()}")
-                logger.info(f"🔍 Bot user: {bot.user}")
-                logger.info(f"🔍 Bot guilds: {len(bot.guilds)}")
-                logger.info(f"🔍 Bot websocket: {bot.ws}")
-                
-                logger.info("✅ Bot está pronto e conectado")
-                logger.info(f"Loop rodando: N/A (não acessível em contexto síncrono)")
-                logger.info(f"Usuários no cache: {len(bot.users)}")
-                sent_count = 0
-                
-                # NOVO: Logs detalhados do bot na função async
-                logger.info(f"🔍 Bot está pronto: {bot.is_ready()}")
-                logger.info(f"🔍 Bot user: {bot.user}")
-                logger.info(f"🔍 Bot guilds: {len(bot.guilds) if bot.guilds else 0}")
-                logger.info(f"🔍 Bot websocket: {bot.ws is not None if hasattr(bot, 'ws') else 'N/A'}")
-                logger.info(f"🔍 Bot is_closed(): {bot.is_closed()}")
-                logger.info(f"🔍 Bot loop: {bot.loop is not None if hasattr(bot, 'loop') else 'N/A'}")
-                logger.info(f"🔍 Loop rodando: N/A (não acessível em contexto síncrono)")
-                logger.info(f"🔍 Usuários no cache: {len(bot.users)}")
-                
-                # NOVO: Verificação simples - se bot não está fechado, prossegue
-                if bot.is_closed():
-                    logger.error("❌ Bot está fechado na função async")
-                    flash("Bot não está disponível. Tente novamente em alguns segundos.", "error")
+                target_id = int(target_user_id)
+            elif target_type == 'server':
+                if not target_server_id or not target_server_id.isdigit():
+                    flash("ID do servidor é obrigatório para envio em servidor.", "error")
                     return redirect(url_for('admin_system'))
-                
-                # Cria embed da mensagem
-                embed = discord.Embed(
-                    title=f"📢 {message_title}",
-                    description=message_content,
-                    color=0x00ff00
-                )
-                embed.set_footer(text="Sistema Guardião BETA - Mensagem Administrativa")
-                
-                logger.info(f"🔍 Verificando target_type: {target_type}")
-                logger.info("🎯 Chegou nas condições de envio!")
-                
-                if target_type == 'user':
-                    logger.info("🎯 Entrando na seção de usuário específico...")
-                    if not target_user_id:
-                        flash("ID do usuário é obrigatório para envio individual.", "error")
-                        return redirect(url_for('admin_system'))
-                    
-                    success = send_dm_to_user(bot, int(target_user_id), embed, "usuário")
-                    if success:
-                        sent_count = 1
-                        logger.info(f"Mensagem enviada para usuário {target_user_id}")
-                    else:
-                        flash(f"Usuário {target_user_id} não encontrado ou DMs bloqueados.", "error")
-                        return redirect(url_for('admin_system'))
-                
-                elif target_type == 'guardians':
-                    logger.info("🎯 Entrando na seção de guardiões...")
-                    # Busca todos os guardiões
-                    guardians_query = """
-                        SELECT id_discord, categoria FROM usuarios 
-                        WHERE categoria IN ('Guardião', 'Moderador', 'Administrador')
-                    """
-                    guardians = db_manager.execute_query_sync(guardians_query)
-                    
-                    # Debug: verificar categorias existentes
-                    debug_query = "SELECT DISTINCT categoria FROM usuarios"
-                    categories = db_manager.execute_query_sync(debug_query)
-                    logger.info(f"Categorias encontradas no banco: {[cat['categoria'] for cat in categories]}")
-                    logger.info(f"Guardiões encontrados: {len(guardians)}")
-                    
-                    for guardian in guardians:
-                        try:
-                            logger.info(f"Tentando enviar mensagem para guardião {guardian['id_discord']} ({guardian['categoria']})")
-                            
-                            success = send_dm_to_user(bot, guardian['id_discord'], embed, "guardião")
-                            if success:
-                                sent_count += 1
-                                logger.info(f"Mensagem enviada para guardião {guardian['id_discord']} ({guardian['categoria']})")
-                            else:
-                                logger.warning(f"Falha ao enviar mensagem para guardião {guardian['id_discord']}")
-                        except Exception as e:
-                            logger.error(f"Erro ao enviar mensagem para guardião {guardian['id_discord']}: {e}")
-                            continue
-                    
-                    logger.info(f"Mensagem enviada para {sent_count} guardiões")
-                
-                elif target_type == 'moderators':
-                    logger.info("🎯 Entrando na seção de moderadores...")
-                    # Busca todos os moderadores
-                    moderators_query = """
-                        SELECT id_discord, categoria FROM usuarios 
-                        WHERE categoria IN ('Moderador', 'Administrador')
-                    """
-                    moderators = db_manager.execute_query_sync(moderators_query)
-                    
-                    logger.info(f"Moderadores encontrados: {len(moderators)}")
-                    logger.info(f"Moderadores: {moderators}")
-                    
-                    for moderator in moderators:
-                        try:
-                            logger.info(f"Tentando enviar mensagem para moderador {moderator['id_discord']} ({moderator['categoria']})")
-                            
-                            success = send_dm_to_user(bot, moderator['id_discord'], embed, "moderador")
-                            if success:
-                                sent_count += 1
-                                logger.info(f"Mensagem enviada para moderador {moderator['id_discord']} ({moderator['categoria']})")
-                            else:
-                                logger.warning(f"Falha ao enviar mensagem para moderador {moderator['id_discord']}")
-                        except Exception as e:
-                            logger.error(f"Erro ao enviar mensagem para moderador {moderator['id_discord']}: {e}")
-                            continue
-                    
-                    logger.info(f"Mensagem enviada para {sent_count} moderadores")
-                
-                elif target_type == 'administrators':
-                    logger.info("🎯 Entrando na seção de administradores...")
-                    # Busca todos os administradores
-                    admins_query = """
-                        SELECT id_discord, categoria FROM usuarios 
-                        WHERE categoria = 'Administrador'
-                    """
-                    admins = db_manager.execute_query_sync(admins_query)
-                    
-                    logger.info(f"Administradores encontrados: {len(admins)}")
-                    
-                    for admin in admins:
-                        try:
-                            logger.info(f"Tentando enviar mensagem para admin {admin['id_discord']} ({admin['categoria']})")
-                            
-                            success = send_dm_to_user(bot, admin['id_discord'], embed, "administrador")
-                            if success:
-                                sent_count += 1
-                                logger.info(f"Mensagem enviada para admin {admin['id_discord']} ({admin['categoria']})")
-                            else:
-                                logger.warning(f"Falha ao enviar mensagem para admin {admin['id_discord']}")
-                        except Exception as e:
-                            logger.error(f"Erro ao enviar mensagem para admin {admin['id_discord']}: {e}")
-                            continue
-                    
-                    logger.info(f"Mensagem enviada para {sent_count} administradores")
-                
-                elif target_type == 'server':
-                    logger.info("🎯 Entrando na seção de servidor...")
-                    if not target_server_id:
-                        flash("ID do servidor é obrigatório para envio em servidor.", "error")
-                        return redirect(url_for('admin_system'))
-                    
-                    try:
-                        guild = bot.get_guild(int(target_server_id))
-                        if guild:
-                            # Envia para canal geral ou cria canal de anúncios
-                            channel = guild.system_channel or guild.text_channels[0] if guild.text_channels else None
-                            if channel:
-                                await channel.send(embed=embed)
-                                sent_count = 1
-                                logger.info(f"Mensagem enviada para servidor {target_server_id}")
-                            else:
-                                flash("Nenhum canal disponível no servidor.", "error")
-                                return redirect(url_for('admin_system'))
-                        else:
-                            flash(f"Servidor {target_server_id} não encontrado.", "error")
-                            return redirect(url_for('admin_system'))
-                    except Exception as e:
-                        logger.error(f"Erro ao enviar mensagem para servidor {target_server_id}: {e}")
-                        flash(f"Erro ao enviar mensagem para servidor: {e}", "error")
-                        return redirect(url_for('admin_system'))
-                
-                else:
-                    logger.warning(f"⚠️ Target type não reconhecido: {target_type}")
-                
-                logger.info(f"📊 Total de mensagens enviadas: {sent_count}")
-                if sent_count > 0:
-                    flash(f"Mensagem enviada com sucesso para {sent_count} destinatário(s).", "success")
-                    logger.info(f"✅ Flash de sucesso: {sent_count} destinatários")
-                else:
-                    flash("Nenhuma mensagem foi enviada.", "warning")
-                    logger.info("⚠️ Flash de aviso: nenhuma mensagem enviada")
-                
-                logger.info("🔄 Redirecionando para admin_system...")
-                return redirect(url_for('admin_system'))
-                
-            except Exception as e:
-                logger.error(f"Erro ao enviar mensagem: {e}")
-                flash("Erro ao enviar mensagem.", "error")
+                target_id = int(target_server_id)
+            
+            broadcast_id, total = broadcast_runner.create_sync(
+                target_type, target_id, message_title, message_content, int(session['user']['id'])
+            )
+            if broadcast_id is None:
+                flash("Não foi possível enfileirar a mensagem.", "error")
                 return redirect(url_for('admin_system'))
-        
-        # Executa a função async
-        try:
-            logger.info("🔄 Iniciando execução da função async...")
-            result = asyncio.run(send_message_async())
-            logger.info("✅ Função async executada com sucesso!")
-            return result
+            
+            # Sem o evento o envio ainda sai na próxima varredura do bot
+            event_bus.publish_sync(BROADCAST_SOLICITADO, id_broadcast=broadcast_id)
+            logger.info(f"📢 Broadcast {broadcast_id} para {target_type} ({total} destinatários) "
+                        f"solicitado por {session['user']['id']}")
+            
+            if total:
+                flash(f"Envio #{broadcast_id} criado para {total} destinatário(s). "
+                      f"Acompanhe o progresso em Envios.", "success")
+            else:
+                flash(f"Envio #{broadcast_id} criado, mas nenhum destinatário foi encontrado.", "warning")
+            return redirect(url_for('admin_system'))
+            
         except Exception as e:
-            logger.error(f"❌ Erro ao executar função async: {e}")
-            logger.error(f"❌ Tipo do erro: {type(e)}")
-            import traceback
-            logger.error(f"❌ Traceback: {traceback.format_exc()}")
+            logger.error(f"Erro ao enviar mensagem: {e}")
             flash("Erro ao enviar mensagem.", "error")
             return redirect(url_for('admin_system'))
     
+    @app.route('/admin/system/broadcasts')
+    @admin_required
+    def admin_system_broadcasts():
+        """Lista os envios mais recentes com o progresso"""
+        try:
+            return jsonify({'broadcasts': broadcast_runner.recent_sync()})
+        except Exception as e:
+            logger.error(f"Erro ao listar envios: {e}")
+            return jsonify({'error': 'Erro ao listar envios'}), 500
+    
+    @app.route('/admin/system/broadcasts/<int:broadcast_id>')
+    @admin_required
+    def admin_system_broadcast_status(broadcast_id):
+        """Progresso de um envio"""
+        try:
+            status = broadcast_runner.status_sync(broadcast_id)
+            if not status:
+                return jsonify({'error': 'Envio não encontrado'}), 404
+            return jsonify(status)
+        except Exception as e:
+            logger.error(f"Erro ao buscar envio {broadcast_id}: {e}")
+            return jsonify({'error': 'Erro ao buscar envio'}), 500
+    
     @app.route('/admin/system/ban-user', methods=['POST'])
     @admin_required
     def admin_system_ban_user():
@@ -2080,6 +1674,11 @@ def setup_routes(app):
             """
             db_manager.execute_command_sync(ban_query, user_id, reason, duration)
             
+            event_bus.publish_sync(
+                USUARIO_BANIDO, id_usuario=int(user_id), motivo=reason,
+                duracao=duration, aplicado_por=int(session['user']['id'])
+            )
+            
             flash(f"Usuário {user_id} banido do sistema.", "success")
             return redirect(url_for('admin_system'))
             
@@ -2152,99 +1751,25 @@ def setup_routes(app):
     logger.info("✅ Configuração de rotas concluída com sucesso!")
 
 
-# Cache simples para dados de usuários do Discord (evita muitas requisições)
-_discord_user_cache = {}
-_cache_timeout = 300  # 5 minutos
-
 def get_discord_user_info(user_id: int) -> dict:
-    """Busca informações do usuário no Discord via API com cache"""
-    try:
-        import requests
-        import time
-        
-        # Verificar cache
-        cache_key = str(user_id)
-        current_time = time.time()
-        
-        if cache_key in _discord_user_cache:
-            cached_data, cached_time = _discord_user_cache[cache_key]
-            if current_time - cached_time < _cache_timeout:
-                return cached_data
-        
-        bot_token = os.getenv('DISCORD_TOKEN')
-        
-        if not bot_token:
-            logger.warning("DISCORD_TOKEN não configurado para buscar usuários")
-            result = {'discord_username': None, 'discord_avatar': None, 'discord_discriminator': None, 'discord_display_name': None}
-            _discord_user_cache[cache_key] = (result, current_time)
-            return result
-        
-        headers = {'Authorization': f'Bot {bot_token}'}
-        response = requests.get(f'https://discord.com/api/v10/users/{user_id}', headers=headers)
-        
-        if response.status_code == 200:
-            user_data = response.json()
-            result = {
-                'discord_username': user_data.get('username'),
-                'discord_avatar': user_data.get('avatar'),
-                'discord_discriminator': user_data.get('discriminator'),
-                'discord_display_name': user_data.get('global_name') or user_data.get('username')
-            }
-            # Armazenar no cache
-            _discord_user_cache[cache_key] = (result, current_time)
-            logger.info(f"Dados do usuário {user_id} obtidos do Discord: {result['discord_username']}")
-            return result
-        else:
-            logger.warning(f"Erro ao buscar usuário {user_id}: {response.status_code}")
-            result = {'discord_username': None, 'discord_avatar': None, 'discord_discriminator': None, 'discord_display_name': None}
-            _discord_user_cache[cache_key] = (result, current_time)
-            return result
-            
-    except Exception as e:
-        logger.error(f"Erro ao buscar informações do usuário {user_id}: {e}")
-        result = {'discord_username': None, 'discord_avatar': None, 'discord_discriminator': None, 'discord_display_name': None}
-        _discord_user_cache[cache_key] = (result, current_time)
-        return result
+    """Busca informações do usuário no Discord (cache LRU de user_profiles)"""
+    return user_profiles.get_sync(user_id)
 
 def get_server_stats(server_id: int) -> dict:
     """Busca estatísticas de um servidor"""
     try:
-        # Estatísticas gerais
-        general_query = """
-            SELECT 
-                COUNT(*) as total_denuncias,
-                COUNT(CASE WHEN status = 'Finalizada' THEN 1 END) as denuncias_finalizadas,
-                COUNT(CASE WHEN status = 'Pendente' THEN 1 END) as denuncias_pendentes,
-                COUNT(CASE WHEN status = 'Em Análise' THEN 1 END) as denuncias_analise,
-                COUNT(CASE WHEN e_premium = true THEN 1 END) as denuncias_premium
-            FROM denuncias 
-            WHERE id_servidor = $1
-        """
-        general_stats = db_manager.execute_query_sync(general_query, server_id)
-        
-        # Resultados das denúncias
-        results_query = """
-            SELECT 
-                COUNT(CASE WHEN resultado_final = 'OK!' THEN 1 END) as improcedentes,
-                COUNT(CASE WHEN resultado_final = 'Intimidou' THEN 1 END) as intimidoes,
-                COUNT(CASE WHEN resultado_final = 'Grave' THEN 1 END) as graves
-            FROM denuncias 
-            WHERE id_servidor = $1 AND status = 'Finalizada'
-        """
-        results_stats = db_manager.execute_query_sync(results_query, server_id)
+        # Totais e série diária vêm de denuncias_daily_rollup (custo independe do histórico)
+        totals = report_rollups.server_totals_sync(server_id)
+        general_keys = ('total_denuncias', 'denuncias_finalizadas', 'denuncias_pendentes',
+                        'denuncias_analise', 'denuncias_premium')
+        results_keys = ('improcedentes', 'intimidoes', 'graves')
+        general_stats = {key: totals[key] for key in general_keys if key in totals}
+        results_stats = {key: totals[key] for key in results_keys if key in totals}
         
         # Denúncias por período (últimos 7 dias)
-        period_query = """
-            SELECT DATE(data_criacao) as data, COUNT(*) as quantidade
-            FROM denuncias 
-            WHERE id_servidor = $1 
-            AND data_criacao >= NOW() - INTERVAL '7 days'
-            GROUP BY DATE(data_criacao)
-            ORDER BY data
-        """
-        period_stats = db_manager.execute_query_sync(period_query, server_id)
+        period_stats = report_rollups.server_period_sync(server_id, 7)
         
-        # Usuários mais denunciados (com informações do usuário)
+        # Usuários mais denunciados nos últimos 30 dias (janela limitada, idx_denuncias_servidor_keyset)
         top_denunciados_query = """
             SELECT 
                 d.id_denunciado,
@@ -2267,18 +1792,13 @@ def get_server_stats(server_id: int) -> dict:
         """
         top_denunciados_raw = db_manager.execute_query_sync(top_denunciados_query, server_id)
         
-        # Enriquecer com dados do Discord
-        top_denunciados = []
-        if top_denunciados_raw:
-            for user in top_denunciados_raw:
-                discord_user = get_discord_user_info(user['id_denunciado'])
-                user_data = dict(user)
-                user_data.update(discord_user)
-                top_denunciados.append(user_data)
+        # Enriquecer com dados do Discord (um lote para os 10)
+        profiles = user_profiles.get_many_sync(user['id_denunciado'] for user in top_denunciados_raw)
+        top_denunciados = [{**user, **profiles[user['id_denunciado']]} for user in top_denunciados_raw]
         
         return {
-            'general': general_stats[0] if general_stats else {},
-            'results': results_stats[0] if results_stats else {},
+            'general': general_stats,
+            'results': results_stats,
             'period': period_stats,
             'top_denunciados': top_denunciados
         }
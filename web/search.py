@@ -0,0 +1,111 @@
+"""
+Busca de Denúncias do Painel - Sistema Guardião BETA
+Monta os filtros avançados de admin_reports_list sobre índices de busca
+
+Cada filtro escolhe a forma que o índice consegue atender (ver
+database/migrate_search_indexes.sql):
+- ID numérico do Discord: igualdade exata (btree)
+- Hash em hexadecimal: prefixo `LIKE 'abc%'` (varchar_pattern_ops)
+- Nomes e trechos de texto: `ILIKE '%...%'` sobre índices GIN pg_trgm
+- Motivo: full-text em português (tsvector) ou trecho (pg_trgm)
+
+Trechos com menos de 3 caracteres não têm trigramas e continuam lendo a
+tabela inteira.
+"""
+
+import re
+from typing import Any, List
+
+# Configuração de texto do índice full-text de denuncias.motivo
+SEARCH_TS_CONFIG = 'portuguese'
+
+HEX_PATTERN = re.compile(r'^[0-9a-fA-F]+$')
+
+
+def escape_like(text: str) -> str:
+    """Escapa curingas do LIKE digitados pelo usuário"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class ReportSearchQuery:
+    """
+    Acumula as condições WHERE (alias `d` = denuncias) e seus parâmetros
+
+    Usage:
+        search = ReportSearchQuery()
+        search.hash(request.args.get('hash', ''))
+        fetch_keyset_page(..., search.conditions, search.params, ...)
+    """
+
+    def __init__(self):
+        self.conditions: List[str] = []
+        self.params: List[Any] = []
+
+    def _param(self, value: Any) -> str:
+        """Adiciona um parâmetro e retorna o placeholder ($n)"""
+        self.params.append(value)
+        return f"${len(self.params)}"
+
+    def _users_matching(self, text: str) -> str:
+        """Subquery dos ids de usuários cujo nome contém o texto (índices trigram)"""
+        pattern = self._param(f"%{escape_like(text)}%")
+        return f"SELECT id_discord FROM usuarios WHERE username ILIKE {pattern} OR display_name ILIKE {pattern}"
+
+    def equals(self, column: str, value: Any):
+        """Igualdade simples (status, resultado, premium, servidor)"""
+        self.conditions.append(f"{column} = {self._param(value)}")
+
+    def raw(self, condition: str):
+        """Condição sem parâmetros (períodos fixos)"""
+        self.conditions.append(condition)
+
+    def hash(self, text: str):
+        """Hash da denúncia: prefixo quando hexadecimal, trecho caso contrário"""
+        text = text.strip()
+        if not text:
+            return
+        if HEX_PATTERN.match(text):
+            self.conditions.append(f"d.hash_denuncia LIKE {self._param(escape_like(text.lower()) + '%')}")
+        else:
+            self.conditions.append(f"d.hash_denuncia ILIKE {self._param('%' + escape_like(text) + '%')}")
+
+    def user(self, column: str, text: str):
+        """
+        Denunciado/denunciante: ID exato quando numérico, nome caso contrário
+
+        Args:
+            column: d.id_denunciado ou d.id_denunciante
+            text: ID do Discord ou trecho do username/display_name
+        """
+        text = text.strip()
+        if not text:
+            return
+        if text.isdigit():
+            self.conditions.append(f"{column} = {self._param(int(text))}")
+        else:
+            self.conditions.append(f"{column} IN ({self._users_matching(text)})")
+
+    def guardian(self, text: str):
+        """Denúncias em que o guardião (ID ou trecho do nome) votou"""
+        text = text.strip()
+        if not text:
+            return
+        if text.isdigit():
+            guardian_filter = f"vg.id_guardiao = {self._param(int(text))}"
+        else:
+            guardian_filter = f"vg.id_guardiao IN ({self._users_matching(text)})"
+        self.conditions.append(
+            f"EXISTS (SELECT 1 FROM votos_guardioes vg WHERE vg.id_denuncia = d.id AND {guardian_filter})"
+        )
+
+    def motivo(self, text: str):
+        """Motivo: palavras (full-text, com radicais) ou trecho literal (trigram)"""
+        text = text.strip()
+        if not text:
+            return
+        words = self._param(text)
+        pattern = self._param(f"%{escape_like(text)}%")
+        self.conditions.append(
+            f"(to_tsvector('{SEARCH_TS_CONFIG}', d.motivo) @@ plainto_tsquery('{SEARCH_TS_CONFIG}', {words})"
+            f" OR d.motivo ILIKE {pattern})"
+        )
@@ -0,0 +1,163 @@
+"""
+Servidor Web - Sistema Guardião BETA
+Montagem da aplicação Flask e modo de produção (gunicorn) do --web-only
+
+No modo completo (python main.py) o Flask roda numa thread do processo do
+bot. Com `python main.py --web-only` o painel roda em um gunicorn com
+WEB_WORKERS processos de WEB_THREADS threads; cada worker monta a própria
+aplicação e abre o próprio pool da ponte síncrona depois do fork. Reload
+gracioso: `kill -HUP` no processo mestre (ver WEB_PID_FILE).
+"""
+
+import logging
+from flask import Flask
+from database.connection import db_manager
+from utils.guild_settings import guild_settings
+from utils.evidence_cache import evidence_cache
+from utils.event_bus import event_bus
+from web.auth import setup_auth
+from web.routes import setup_routes
+from web.admin_complete import setup_admin_complete
+from web.dashboard_stats import dashboard_stats
+from config import (
+    WEB_PORT, FLASK_SECRET_KEY, WEB_WORKERS, WEB_THREADS,
+    WEB_TIMEOUT_SECONDS, WEB_GRACEFUL_TIMEOUT_SECONDS, WEB_PID_FILE
+)
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+
+def configure_app(app: Flask):
+    """
+    Registra autenticação, rotas e APIs gerais na aplicação
+
+    Args:
+        app: Aplicação Flask (a do processo do bot ou a de um worker)
+    """
+    # Configura autenticação
+    setup_auth(app)
+
+    # Configura rotas
+    logger.info("🔧 Configurando rotas principais...")
+    try:
+        setup_routes(app)
+        logger.info("✅ Rotas principais configuradas")
+    except Exception as e:
+        logger.error(f"❌ Erro ao configurar rotas principais: {e}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+
+    # Configura painel admin completo (sistema principal)
+    logger.info("🔧 Configurando painel admin completo...")
+    setup_admin_complete(app)
+    logger.info("✅ Painel admin completo configurado")
+
+    # NOTA: As rotas admin principais estão definidas em routes.py
+    # Os outros sistemas (admin_routes.py, admin_routes_fixed.py) são backups
+
+    # Adiciona rota para estatísticas gerais (snapshot em memória, web/dashboard_stats.py)
+    @app.route('/api/stats')
+    def general_stats():
+        try:
+            snapshot = dashboard_stats.get()
+            counts = snapshot['counts']
+            if not counts:
+                return {'error': 'Internal server error'}, 500
+            return {
+                'total_usuarios': counts['total_usuarios'],
+                'total_guardioes': counts['total_guardioes'],
+                'total_denuncias': counts['total_denuncias'],
+                'total_servidores': counts['total_servidores'],
+                'atualizado_em': snapshot['atualizado_em'].isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar estatísticas: {e}")
+            return {'error': 'Internal server error'}, 500
+
+    # Lista todas as rotas registradas
+    with app.app_context():
+        all_routes = [str(rule) for rule in app.url_map.iter_rules()]
+        admin_routes = [route for route in all_routes if '/admin' in route]
+        logger.info(f"📋 Total de rotas registradas: {len(all_routes)}")
+        logger.info(f"📋 Rotas admin registradas: {len(admin_routes)}")
+        for route in admin_routes:
+            logger.info(f"  - {route}")
+
+
+def create_app() -> Flask:
+    """Cria uma aplicação Flask completa (um worker do modo --web-only)"""
+    app = Flask(__name__, template_folder='templates', static_folder='static')
+    app.config['SECRET_KEY'] = FLASK_SECRET_KEY or 'guardiao-beta-secret-key'
+    configure_app(app)
+    return app
+
+
+def _init_worker() -> Flask:
+    """Monta a aplicação de um worker e começa a escutar o barramento de eventos"""
+    app = create_app()
+    guild_settings.subscribe()
+    evidence_cache.subscribe()
+    event_bus.start_sync()
+    logger.info("✅ Worker web pronto")
+    return app
+
+
+def _worker_exit(server, worker):
+    """Fecha o pool da ponte síncrona do worker que está saindo"""
+    db_manager.close_sync_bridge()
+
+
+def run_development_server(app: Flask):
+    """Servidor de desenvolvimento do Werkzeug (thread do bot ou fallback sem gunicorn)"""
+    logger.info(f"Iniciando servidor web na porta {WEB_PORT}")
+    app.run(host='0.0.0.0', port=int(WEB_PORT), debug=False, threaded=True)
+
+
+def run_production_server():
+    """
+    Executa o painel no gunicorn (bloqueia até o servidor parar)
+
+    Sem gunicorn instalado (ou no Windows) cai no servidor de desenvolvimento.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        logger.warning("⚠️ gunicorn não disponível - usando o servidor de desenvolvimento")
+        app = _init_worker()
+        run_development_server(app)
+        return
+
+    workers = WEB_WORKERS
+    if workers > 1 and not FLASK_SECRET_KEY:
+        # Sem chave fixa cada worker gera a sua e as sessões não valem entre eles
+        logger.warning("⚠️ FLASK_SECRET_KEY não configurada - usando apenas 1 worker")
+        workers = 1
+
+    class GuardiaoWebServer(BaseApplication):
+        """Gunicorn embutido; a aplicação é carregada em cada worker após o fork"""
+
+        def load_config(self):
+            options = {
+                'bind': f"0.0.0.0:{WEB_PORT}",
+                'workers': workers,
+                'threads': WEB_THREADS,
+                'worker_class': 'gthread',
+                'timeout': WEB_TIMEOUT_SECONDS,
+                'graceful_timeout': WEB_GRACEFUL_TIMEOUT_SECONDS,
+                'preload_app': False,
+                'pidfile': WEB_PID_FILE,
+                'worker_exit': _worker_exit,
+                'accesslog': '-',
+            }
+            for key, value in options.items():
+                if value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            return _init_worker()
+
+    logger.info(f"🌐 Servidor web de produção na porta {WEB_PORT} "
+                f"({workers} workers x {WEB_THREADS} threads)")
+    GuardiaoWebServer().run()